@@ -0,0 +1,4 @@
+import sys
+from eng_module.cli import main
+
+sys.exit (main ())
@@ -0,0 +1,203 @@
+import asyncio
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator
+from eng_module.beams import build_beam, get_model_results
+from eng_module.parsing import iter_beam_records
+
+# marks the end of the items in a queue
+_DONE = None
+
+
+class LocalFileSource:
+    '''
+    Reads files from the local filesystem, in a worker thread so that a slow open or read doesn't block the event loop
+    '''
+
+    async def read_text (self, the_filename:str) -> str:
+        return await asyncio.to_thread (self._read_text, the_filename)
+
+    @staticmethod
+    def _read_text (the_filename:str) -> str:
+        with open (the_filename, "r", newline='') as text_file:
+            return text_file.read ()
+
+
+class LatencyFileSource:
+    '''
+    Wraps another file source (by default a LocalFileSource) and waits 'latency' seconds before every read,
+    standing in for a slow network filesystem in tests and benchmarks. 'reads' counts the reads so far,
+    and 'peak_reads' the most that were ever under way at once.
+    '''
+
+    def __init__ (self, latency:float=0.05, source:'LocalFileSource | LatencyFileSource | None'=None):
+        self.latency = latency
+        self.source = source if source is not None else LocalFileSource ()
+        self.reads = 0
+        self.peak_reads = 0
+        self._active_reads = 0
+
+    async def read_text (self, the_filename:str) -> str:
+        self._active_reads += 1
+        self.peak_reads = max (self.peak_reads, self._active_reads)
+        try:
+            await asyncio.sleep (self.latency)
+            return await self.source.read_text (the_filename)
+        finally:
+            self._active_reads -= 1
+            self.reads += 1
+
+
+def solve_beams (items_LIST:list [tuple [str, dict]]) -> list [dict]:
+    '''
+    Builds and analyzes each (filename, beam_DICT) in 'items_LIST' and returns its result, in the format of
+    batch.analyze_beam_file. This is the unit of work sent to each worker process.
+    '''
+    ret_LIST = []
+    for the_filename, beam_DICT in items_LIST:
+        ret_DICT = {'File': the_filename, 'Name': beam_DICT ['Name'], 'Error': None}
+        try:
+            the_model = build_beam (beam_DICT)
+            the_model.analyze ()
+            ret_DICT.update (get_model_results (the_model))
+        except Exception as err:
+            ret_DICT ['Error'] = f"{type (err).__name__}: {err}"
+        ret_LIST.append (ret_DICT)
+    return ret_LIST
+
+
+def _error_result (the_filename:str, err:Exception) -> dict:
+    return {'File': the_filename, 'Name': None, 'Error': f"{type (err).__name__}: {err}"}
+
+
+async def run_pipeline (
+    filenames_LIST:list [str],
+    source:LocalFileSource | LatencyFileSource | None=None,
+    max_reads:int=8,
+    max_workers:int | None=None,
+    chunk_size:int=1,
+    queue_size:int=16,
+    executor:Executor | None=None
+) -> AsyncIterator [dict]:
+    '''
+    Reads, parses and analyzes every beam file in 'filenames_LIST' and yields each result (see batch.analyze_beam_file),
+    in completion order. The three stages run at the same time, so that waiting on the files is hidden behind the analysis:
+        read    - up to 'max_reads' files are read at once from 'source' (a LocalFileSource by default)
+        parse   - each file is parsed (see parsing.iter_beam_records) in the event loop; a file may hold several beams
+        analyze - chunks of up to 'chunk_size' beams are solved in 'executor' (by default a pool of 'max_workers' processes;
+                  1 solves in a thread of this process), with at most 2 chunks per worker under way at once
+                  ('max_workers' is also used to size that limit when an 'executor' is passed in)
+    The stages are joined by queues of 'queue_size' items, so a slow stage holds the ones before it back,
+    and only a bounded number of files are ever held in memory, however many there are.
+    A file that can't be read or parsed gives a result with its 'Error' set; the rest carry on.
+    '''
+    source = source if source is not None else LocalFileSource ()
+    if max_reads < 1 or chunk_size < 1 or queue_size < 1:
+        raise ValueError (f"max_reads, chunk_size and queue_size must be at least 1, got {max_reads}, {chunk_size} and {queue_size}")
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor (1) if max_workers == 1 else ProcessPoolExecutor (max_workers=max_workers)
+    max_chunks = 2 * (max_workers or os.cpu_count () or 1)
+
+    filenames_QUEUE = asyncio.Queue (queue_size)
+    texts_QUEUE = asyncio.Queue (queue_size)
+    beams_QUEUE = asyncio.Queue (queue_size)
+    results_QUEUE = asyncio.Queue (queue_size)
+
+    async def feed () -> None:
+        for the_filename in filenames_LIST:
+            await filenames_QUEUE.put (the_filename)
+        for _ in range (max_reads):
+            await filenames_QUEUE.put (_DONE)
+
+    async def read () -> None:
+        while (the_filename := await filenames_QUEUE.get ()) is not _DONE:
+            try:
+                await texts_QUEUE.put ((the_filename, await source.read_text (the_filename), None))
+            except Exception as err:
+                await texts_QUEUE.put ((the_filename, None, err))
+        await texts_QUEUE.put (_DONE)
+
+    async def parse () -> None:
+        n_readers = max_reads
+        while n_readers:
+            item = await texts_QUEUE.get ()
+            if item is _DONE:
+                n_readers -= 1
+                continue
+            the_filename, text, err = item
+            try:
+                if err is not None:
+                    raise err
+                for beam_DICT in iter_beam_records (io.StringIO (text)):
+                    await beams_QUEUE.put ((the_filename, beam_DICT))
+            except Exception as err:
+                await results_QUEUE.put ([_error_result (the_filename, err)])
+        await beams_QUEUE.put (_DONE)
+
+    async def analyze () -> None:
+        loop = asyncio.get_running_loop ()
+        slots = asyncio.Semaphore (max_chunks)
+        pending_SET = set ()
+
+        async def solve_chunk (chunk_LIST:list [tuple [str, dict]]) -> None:
+            try:
+                try:
+                    results_LIST = await loop.run_in_executor (executor, solve_beams, chunk_LIST)
+                except Exception as err: # the worker itself died, e.g. BrokenProcessPool
+                    results_LIST = [_error_result (the_filename, err) for the_filename, _ in chunk_LIST]
+                await results_QUEUE.put (results_LIST)
+            finally:
+                slots.release () # only once the results are queued, so that finished chunks can't pile up
+
+        finished = False
+        while not finished:
+            item = await beams_QUEUE.get ()
+            if item is _DONE:
+                break
+            chunk_LIST = [item]
+            while len (chunk_LIST) < chunk_size and not beams_QUEUE.empty ():
+                item = beams_QUEUE.get_nowait ()
+                if item is _DONE:
+                    finished = True
+                    break
+                chunk_LIST.append (item)
+            await slots.acquire ()
+            task = asyncio.create_task (solve_chunk (chunk_LIST))
+            pending_SET.add (task)
+            task.add_done_callback (pending_SET.discard)
+        if pending_SET:
+            await asyncio.gather (*pending_SET)
+
+    async def run_stages () -> None:
+        try:
+            await asyncio.gather (feed (), *(read () for _ in range (max_reads)), parse (), analyze ())
+        except asyncio.CancelledError: # the consumer has gone, so there's no one to tell
+            raise
+        except Exception:
+            await results_QUEUE.put (_DONE)
+            raise
+        await results_QUEUE.put (_DONE)
+
+    stages_TASK = asyncio.create_task (run_stages ())
+    try:
+        while (results_LIST := await results_QUEUE.get ()) is not _DONE:
+            for result_DICT in results_LIST:
+                yield result_DICT
+        await stages_TASK # raises anything that went wrong in the stages themselves
+    finally:
+        if not stages_TASK.done ():
+            stages_TASK.cancel ()
+            await asyncio.gather (stages_TASK, return_exceptions=True)
+        if own_executor:
+            executor.shutdown (wait=True, cancel_futures=True)
+
+
+def analyze_files (filenames_LIST:list [str], **kwargs) -> list [dict]:
+    '''
+    Runs run_pipeline (with 'kwargs') to completion from synchronous code and returns every result, in completion order
+    '''
+    async def collect () -> list [dict]:
+        return [result_DICT async for result_DICT in run_pipeline (filenames_LIST, **kwargs)]
+    return asyncio.run (collect ())
@@ -0,0 +1,113 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+from eng_module.beams import build_beam, get_model_results
+from eng_module.parsing import parse_beam_file
+from eng_module.cache import BeamFileCache
+from eng_module.validation import validate_files
+from eng_module import profiling
+
+# the BeamFileCache each process has opened, by cache_dir, kept between chunks so that its entry count is only taken once
+_worker_caches = {}
+
+
+def analyze_beam_file (the_filename:str, cache:BeamFileCache | None=None) -> dict:
+    '''
+    Reads, builds and analyzes the beam in 'the_filename' and returns a summary of its results.
+    If a 'cache' is given, the parsed beam is taken from (or saved to) it instead of always parsing the text.
+    Any error is caught and recorded in the 'Error' item so that one bad file doesn't stop a batch.
+    Returns: ret_DICT - ie
+    {
+        'File': 'beams/roof_1.txt',
+        'Name': 'Roof beam',
+        'Error': None, # or a description of what went wrong
+        'Reactions': {...}, 'Max Moment': ..., ... # see beams.get_model_results
+    }
+    '''
+    ret_DICT = {'File': the_filename, 'Name': None, 'Error': None}
+    try:
+        if cache is None:
+            the_beam_data_DICT = parse_beam_file (the_filename)
+        else:
+            the_beam_data_DICT = cache.read_beam_dicts (the_filename) [0]
+        ret_DICT ['Name'] = the_beam_data_DICT ['Name']
+        the_model = build_beam (the_beam_data_DICT)
+        with profiling.timer (profiling.SOLVE):
+            the_model.analyze ()
+        ret_DICT.update (get_model_results (the_model))
+    except Exception as err:
+        ret_DICT ['Error'] = f"{type (err).__name__}: {err}"
+    return ret_DICT
+
+
+def analyze_beam_files (filenames_LIST:list[str], cache_dir:str | None=None) -> list[dict]:
+    '''
+    Runs 'analyze_beam_file' on each file in 'filenames_LIST', using a BeamFileCache in 'cache_dir' if one is given.
+    This is the unit of work sent to each worker process, so a chunk of small beams costs a single round trip.
+    '''
+    cache = None
+    if cache_dir is not None:
+        if cache_dir not in _worker_caches:
+            _worker_caches [cache_dir] = BeamFileCache (cache_dir)
+        cache = _worker_caches [cache_dir]
+    return [analyze_beam_file (the_filename, cache) for the_filename in filenames_LIST]
+
+
+def find_beam_files (path_or_pattern:str, extension:str='.txt') -> list[str]:
+    '''
+    Returns a sorted list of the beam files found at 'path_or_pattern'.
+    'path_or_pattern' may be a directory (every file ending in 'extension' is returned)
+    or a glob pattern such as 'project/**/beam_*.txt'.
+    '''
+    if os.path.isdir (path_or_pattern):
+        path_or_pattern = os.path.join (path_or_pattern, f"*{extension}")
+    return sorted (glob.glob (path_or_pattern, recursive=True))
+
+
+def run_batch (
+    path_or_pattern:str | list[str],
+    max_workers:int | None=None,
+    chunk_size:int=1,
+    cache_dir:str | None=None,
+    validate:bool=False
+) -> Iterator[dict]:
+    '''
+    Analyzes every beam file in 'path_or_pattern' across a pool of worker processes and yields each
+    result (see 'analyze_beam_file') as soon as its chunk is finished, i.e. in completion order.
+    Params:
+    'path_or_pattern' - a directory, a glob pattern or an explicit list of filenames
+    'max_workers' - the number of worker processes; None uses every CPU, 1 runs in this process
+    'chunk_size' - the number of files sent to a worker at a time
+    'cache_dir' - if given, parsed beams are cached here (see cache.BeamFileCache) so later runs skip the text parsing
+    'validate' - check every file first (see validation.validate_files); the files with problems are yielded straight away,
+        with all their problems in 'Error', and aren't analyzed
+    '''
+    if isinstance (path_or_pattern, str):
+        filenames_LIST = find_beam_files (path_or_pattern)
+    else:
+        filenames_LIST = list (path_or_pattern)
+
+    if chunk_size < 1:
+        raise ValueError (f"chunk_size must be at least 1, got {chunk_size}")
+    if validate:
+        problems_DICT = validate_files (filenames_LIST)
+        for the_filename, problems_LIST in problems_DICT.items ():
+            if problems_LIST:
+                yield {'File': the_filename, 'Name': None, 'Error': '; '.join (str (problem) for problem in problems_LIST)}
+        filenames_LIST = [the_filename for the_filename in filenames_LIST if not problems_DICT [the_filename]]
+    chunks_LIST = [filenames_LIST [i:i + chunk_size] for i in range (0, len (filenames_LIST), chunk_size)]
+
+    if max_workers == 1:
+        for chunk_LIST in chunks_LIST:
+            yield from analyze_beam_files (chunk_LIST, cache_dir)
+        return
+
+    with ProcessPoolExecutor (max_workers=max_workers) as pool:
+        futures_DICT = {pool.submit (analyze_beam_files, chunk_LIST, cache_dir): chunk_LIST for chunk_LIST in chunks_LIST}
+        for future in as_completed (futures_DICT):
+            try:
+                yield from future.result ()
+            except Exception as err: # the worker itself died, e.g. BrokenProcessPool
+                for the_filename in futures_DICT [future]:
+                    yield {'File': the_filename, 'Name': None, 'Error': f"{type (err).__name__}: {err}"}
@@ -1,10 +1,64 @@
 import csv
+import logging
 import math
-#import PyNite.FEModel3D
-from PyNite import FEModel3D
+import sys
 #import eng_module.utils as utils
-from eng_module.utils import str_to_int, str_to_float, read_csv_file
+from typing import IO, Iterator, TYPE_CHECKING
+from eng_module.utils import str_to_int, str_to_float, read_csv_file, RECORD_DELIMITER
+from eng_module.parsing import NAMED_ATTRIBUTES, parse_beam_file, iter_beam_records
+from eng_module import profiling
+from eng_module.records import Beam, Support, PointLoad, DistLoad, load_from_dict, to_beam_dict
 
+# NumPy, PyNite and the planar backend are only imported by the functions that need them, so that the parsers and
+# the closed-form functions here stay quick to import (see benchmarks/bench_import.py)
+if TYPE_CHECKING:
+    import numpy as np
+    from PyNite import FEModel3D
+    from eng_module.planar import PlanarBeam
+
+logger = logging.getLogger (__name__)
+
+
+
+def add_loads (the_model:'FEModel3D', loads_LIST:list [dict], load_cases:bool=False, member_name:str='M0') -> None:
+    '''
+    Adds the loads in 'loads_LIST' (as returned by parse_loads) to the member 'member_name' of 'the_model', a beam along the X axis.
+    If 'load_cases' is True, each load goes into the PyNite load case named by its 'Case' item;
+    otherwise they all go into PyNite's default case, 'Case 1'.
+    '''
+    for load_DICT in loads_LIST:
+        if load_cases:
+            case = load_DICT ['Case']
+        else:
+            case = 'Case 1'
+
+        if load_DICT ['Type'] == 'Dist':
+            w1 = load_DICT ['Start Magnitude']
+            w2 = load_DICT ['End Magnitude']
+            x1 = load_DICT ['Start Location']
+            x2 = load_DICT ['End Location']
+            # PyNite gets the magnitudes wrong when it splits a varying load over more than one sub-member,
+            # so such a load is added piece by piece between the nodes instead
+            x_LIST = [x1, x2]
+            if w1 != w2:
+                x0 = the_model.Members [member_name].i_node.X
+                x_LIST [1:1] = sorted (node.X - x0 for node in the_model.Nodes.values () if x1 < node.X - x0 < x2)
+            for start, end in zip (x_LIST [:-1], x_LIST [1:]):
+                the_model.add_member_dist_load (
+                    member_name,
+                    Direction=load_DICT ['Direction'],
+                    w1=w1 + (w2 - w1) * (start - x1) / (x2 - x1),
+                    w2=w1 + (w2 - w1) * (end - x1) / (x2 - x1),
+                    x1=start,
+                    x2=end,
+                    case=case)
+        elif load_DICT ['Type'] == 'Point':
+            the_model.add_member_pt_load (
+                member_name,
+                Direction=load_DICT ['Direction'], 
+                P=load_DICT ['Magnitude'], 
+                x=load_DICT ['Location'],
+                case=case)
 
 
 def beam_reactions_ss_cant (
@@ -22,11 +76,18 @@ def beam_reactions_ss_cant (
     equiv_point_load = w * length
     R1 = equiv_point_load * centroid_of_udl / b
     R2 = equiv_point_load - R1
-    print (R1, R2)
+    logger.debug ('beam_reactions_ss_cant: R1=%s, R2=%s', R1, R2)
     return -R1, -R2
 
 # used to also take A:float=1.0, J:float=1.0, nu:float=1.0, rho:float=1.0
-def build_beam (this_beam_data_DICT:dict) -> FEModel3D:
+@profiling.timed (profiling.BUILD)
+def build_beam (
+    this_beam_data_DICT:dict | Beam,
+    load_cases:bool=False,
+    nodes_at_loads:bool=False,
+    n_segments:int=1,
+    backend:str='pynite'
+) -> 'FEModel3D | PlanarBeam':
     """
     Returns a beam finite element model for the data in 'this_beam_data_DICT' which is assumed to contain:
     {
@@ -41,16 +102,20 @@ def build_beam (this_beam_data_DICT:dict) -> FEModel3D:
         'Supports': <a dict of support locations, from left to right>,
         'Loads': <a list of loads acting on the beam; each load is its own list>        
     }
+    If 'load_cases' is True, each load is added to the model under its own 'Case' (and no load combinations are defined);
+    otherwise all the loads go into PyNite's default case, which is what the default 'Combo 1' analyzes.
+    A records.Beam may be passed instead of the dict.
+    The model has one member, 'M0', over the full length of the beam, with nodes at both ends and at every support
+    (see get_mesh_locations for the extra nodes added by 'nodes_at_loads' and 'n_segments').
+    With 'backend' set to 'planar', a planar.PlanarBeam with the same nodes is returned instead of the PyNite model:
+    only 'Fy' loads, but much faster for beams with many spans.
     """
+    this_beam_data_DICT = to_beam_dict (this_beam_data_DICT)
 
     L = this_beam_data_DICT ['L']
     E = this_beam_data_DICT ['E']
 
-    if 'I' in this_beam_data_DICT: I = this_beam_data_DICT ['I']
-    elif 'Ix' in this_beam_data_DICT: I = this_beam_data_DICT ['Ix']
-    elif 'Iy' in this_beam_data_DICT: I = this_beam_data_DICT ['Iy']
-    elif 'Iz' in this_beam_data_DICT: I = this_beam_data_DICT ['Iz']
-    else: I = 1.0
+    I = get_moment_of_inertia (this_beam_data_DICT)
 
     A = this_beam_data_DICT ['A']
     J = this_beam_data_DICT ['J']
@@ -59,21 +124,28 @@ def build_beam (this_beam_data_DICT:dict) -> FEModel3D:
     G = calc_shear_modulus (nu, E)
 
 
-    #nodes_DICT = {} # get_node_locations (L, supports_LIST:list[float]) -> dict [str:float]:
-    nodes_DICT = {'N0': 0.0} #define the first node
     supports_DICT = this_beam_data_DICT ['Supports']
     supports_DICT = dict (sorted (supports_DICT.items())) # not sure if this is necessary, but I want to be sure for later assumptions!
     loads_LIST = this_beam_data_DICT ['Loads']
 
-    print (nodes_DICT)
-    print (supports_DICT)
-    print (loads_LIST)
-    # return None
+    logger.debug ('build_beam %s: supports %s, loads %s', this_beam_data_DICT.get ('Name'), supports_DICT, loads_LIST)
+    if backend == 'planar':
+        from eng_module.planar import PlanarBeam
+        the_model = PlanarBeam (get_mesh_locations (L, supports_DICT, loads_LIST if nodes_at_loads else [], n_segments), E, I, supports_DICT)
+        the_model.add_loads (loads_LIST, load_cases)
+        return the_model
+    elif backend != 'pynite':
+        raise ValueError (f"Unknown backend '{backend}'; expected 'pynite' or 'planar'")
+
+    from PyNite import FEModel3D
     the_model = FEModel3D ()
     the_model.add_material ('default', E, G, nu, rho)
 
-    count_of_nodes:int = 1
-    the_model.add_node ("N0", 0.0, 0, 0) # create the first node
+    node_locations_LIST = get_mesh_locations (L, supports_DICT, loads_LIST if nodes_at_loads else [], n_segments)
+    node_names_DICT = {}
+    for i, node_location in enumerate (node_locations_LIST):
+        node_names_DICT [node_location] = f"N{i}"
+        the_model.add_node (f"N{i}", node_location, 0, 0)
 
     for support_location, support_type in supports_DICT.items ():
         if support_type == 'P': #pin
@@ -105,46 +177,13 @@ def build_beam (this_beam_data_DICT:dict) -> FEModel3D:
             this_RY = False
             this_RZ = False
 
-        if support_location == 0: # at first node
-            the_model.def_support ("N0", this_DX, this_DY, this_DZ, this_RX, this_RY, this_RZ)
-            # don't increment count_of_nodes; we've already counted this one!
-        elif support_location == L: # at last node
-            count_of_nodes += 1
-            the_model.add_node (f"N{count_of_nodes}", L, 0, 0)
-            the_model.def_support (f"N{count_of_nodes}", this_DX, this_DY, this_DZ, this_RX, this_RY, this_RZ)
-        else: # at an intermediate location
-            count_of_nodes += 1
-            print ("about to call!")
-            print (f"{count_of_nodes=}")
-            print (f"{this_DX=}")
-            print (f"{this_DY=}")
-            print (f"{this_DZ=}")
-            print (f"{this_RX=}")
-            print (f"{this_RY=}")
-            print (f"{this_RZ=}")
-            the_model.add_node (f"N{count_of_nodes}", support_location, 0, 0)
-            the_model.def_support (f"N{count_of_nodes}", this_DX, this_DY, this_DZ, this_RX, this_RY, this_RZ)
-
-    #print (the_model.Nodes)
-
-    the_model.add_member ('M0', 'N0', f"N{count_of_nodes}", 'default', Iy=1.0, Iz=I, J=J, A=A)
+        the_model.def_support (node_names_DICT [support_location], this_DX, this_DY, this_DZ, this_RX, this_RY, this_RZ)
+
+    the_model.add_member ('M0', 'N0', f"N{len (node_locations_LIST) - 1}", 'default', Iy=1.0, Iz=I, J=J, A=A)
+    profiling.count ('nodes', len (node_locations_LIST))
+
+    add_loads (the_model, loads_LIST, load_cases)
 
-    for load_DICT in loads_LIST:
-        if load_DICT ['Type'] == 'Dist':
-            the_model.add_member_dist_load (
-                'M0',
-                Direction=load_DICT ['Direction'], 
-                w1=load_DICT ['Start Magnitude'], 
-                w2=load_DICT ['End Magnitude'], 
-                x1=load_DICT ['Start Location'], 
-                x2=load_DICT ['End Location'])
-        elif load_DICT ['Type'] == 'Point':
-            the_model.add_member_pt_load (
-                'M0',
-                Direction=load_DICT ['Direction'], 
-                P=load_DICT ['Magnitude'], 
-                x=load_DICT ['Location'])
-   
     return the_model
 
 
@@ -187,6 +226,77 @@ def euler_buckling_mode (
     return P_cr
 
 
+def get_mesh_locations (
+    L:float,
+    supports_DICT:dict [float, str],
+    loads_LIST:list [dict] | None=None,
+    n_segments:int=1
+) -> list [float]:
+    '''
+    Returns the sorted node locations for a beam model: both ends, every support, every point load location and
+    distributed load end in 'loads_LIST', and the points that split the beam into 'n_segments' equal segments.
+    Load and segment points closer than L * 1e-9 to another node are dropped, so supports keep their exact locations.
+    '''
+    tolerance = L * 1e-9
+    extra_LIST = [L * i / n_segments for i in range (1, n_segments)]
+    for load_DICT in loads_LIST or []:
+        if load_DICT ['Type'] == 'Point':
+            extra_LIST.append (load_DICT ['Location'])
+        else:
+            extra_LIST.extend ((load_DICT ['Start Location'], load_DICT ['End Location']))
+
+    ret_LIST = sorted ({0.0, L, *supports_DICT})
+    for location in sorted (extra_LIST):
+        if 0.0 < location < L and min (abs (location - node_location) for node_location in ret_LIST) > tolerance:
+            ret_LIST.append (location)
+    return sorted (ret_LIST)
+
+
+@profiling.timed (profiling.EXTRACT)
+def get_model_results (the_model:'FEModel3D | PlanarBeam', combo_name:str='Combo 1') -> dict:
+    '''
+    Returns a summary of the analysis results of a solved beam model for the load combination 'combo_name'.
+    Returns: ret_DICT - ie
+    {
+        'Reactions': {0.0: 57000.0, 3800.0: 57000.0}, # vertical reaction at each support location
+        'Max Moment': ..., 'Min Moment': ...,
+        'Max Shear': ..., 'Min Shear': ...,
+        'Max Deflection': ..., 'Min Deflection': ...
+    }
+    '''
+    if is_planar_model (the_model):
+        return the_model.get_results (combo_name)
+
+    reactions_DICT = {}
+    for node in the_model.Nodes.values ():
+        if node.support_DY:
+            reactions_DICT [node.X] = node.RxnFY [combo_name]
+    reactions_DICT = dict (sorted (reactions_DICT.items()))
+
+    members_LIST = list (the_model.Members.values ())
+    ret_DICT = {
+        'Reactions': reactions_DICT,
+        'Max Moment': max (member.max_moment ('Mz', combo_name) for member in members_LIST),
+        'Min Moment': min (member.min_moment ('Mz', combo_name) for member in members_LIST),
+        'Max Shear': max (member.max_shear ('Fy', combo_name) for member in members_LIST),
+        'Min Shear': min (member.min_shear ('Fy', combo_name) for member in members_LIST),
+        'Max Deflection': max (member.max_deflection ('dy', combo_name) for member in members_LIST),
+        'Min Deflection': min (member.min_deflection ('dy', combo_name) for member in members_LIST),
+    }
+    return ret_DICT
+
+
+def get_moment_of_inertia (beam_DICT:dict) -> float:
+    '''
+    Returns the moment of inertia that build_beam uses for the beam in 'beam_DICT': 'I', 'Iz', 'Ix' or 'Iy', whichever comes first
+    '''
+    if 'I' in beam_DICT: return beam_DICT ['I']
+    elif 'Iz' in beam_DICT: return beam_DICT ['Iz'] # strong axis for 'Fy' loads; check before 'Iy', which parse_beam_attributes always fills in
+    elif 'Ix' in beam_DICT: return beam_DICT ['Ix']
+    elif 'Iy' in beam_DICT: return beam_DICT ['Iy']
+    else: return 1.0
+
+
 def get_node_locations (beam_length:float, supports_LIST:list[float]) -> dict [str:float]:
     '''
     Takes the beam's length and a list of all support locations,
@@ -217,7 +327,8 @@ def get_spans (total_beam_length:float, dist_to_cantilever:float) -> tuple [floa
     return (b, a)
 
 
-def get_structured_beam_data (input_LIST:list [list [str]]) -> dict:
+@profiling.timed (profiling.PARSE)
+def get_structured_beam_data (input_LIST:list [list [str]], as_record:bool=False) -> dict | Beam:
     '''
     This converts the file data passed (as a list) into a dictionary and returns that dictionary.
     outer_LIST - the file data already parsed into nested lists
@@ -239,6 +350,8 @@ def get_structured_beam_data (input_LIST:list [list [str]]) -> dict:
     supports_dict = parse_supports # list[str]
     loads_dict = parse_loads # list[list[str|float]]
     ret_dict = att + supports + loads
+
+    If 'as_record' is True, a records.Beam is returned instead of the dict.
     '''
 
     
@@ -258,9 +371,7 @@ def get_structured_beam_data (input_LIST:list [list [str]]) -> dict:
         
     for i, val in enumerate (attributes_LIST):
         attributes_LIST [i] = str_to_float (val)
-    print (attributes_LIST)
-    print (supports_LIST)
-    print (loads_LIST)
+    logger.debug ('get_structured_beam_data %s: attributes %s, supports %s, loads %s', input_LIST [0][0], attributes_LIST, supports_LIST, loads_LIST)
     
 
     output_DICT ['Name'] = input_LIST [0][0]
@@ -271,12 +382,45 @@ def get_structured_beam_data (input_LIST:list [list [str]]) -> dict:
     output_DICT ['Supports'] = supports_dict
     output_DICT ['Loads'] = loads_dict
 
+    if as_record:
+        return Beam.from_dict (output_DICT)
     return output_DICT
 
 
-def load_beam_model (the_filename:str) -> FEModel3D:
-    the_beam_data_LIST = read_beam_file (the_filename)
-    the_beam_data_DICT = get_structured_beam_data (the_beam_data_LIST)
+def is_planar_model (the_model:object) -> bool:
+    '''
+    Returns True if 'the_model' is a planar.PlanarBeam (see build_beam), without importing the planar backend:
+    if it hasn't been imported yet, there can't be one
+    '''
+    planar = sys.modules.get ('eng_module.planar')
+    return planar is not None and isinstance (the_model, planar.PlanarBeam)
+
+
+def iter_beam_file (source:str | IO [str], delimiter:str=RECORD_DELIMITER, as_records:bool=False) -> Iterator [dict | Beam]:
+    '''
+    Lazily reads a file holding any number of beams and yields each beam's data dict (see get_structured_beam_data)
+    as soon as it has been read, so the first beam can be analyzed before the rest of the file is read.
+    Params:
+    'source' - a filename, '-' for stdin, or an open text file
+    'delimiter' - a line containing only this text separates one beam from the next, ie:
+        Roof beam
+        4800,24500,1200000000
+        0:P,4800:R
+        DIST:Fy,-30,-30,0,4800,case:Dead
+        ---
+        Floor beam
+        ...
+    'as_records' - yield records.Beam objects instead of dicts
+    '''
+    for beam_DICT in iter_beam_records (source, delimiter):
+        if as_records:
+            yield Beam.from_dict (beam_DICT)
+        else:
+            yield beam_DICT
+
+
+def load_beam_model (the_filename:str) -> 'FEModel3D':
+    the_beam_data_DICT = parse_beam_file (the_filename)
     the_model = build_beam(the_beam_data_DICT)
     return the_model
 
@@ -289,7 +433,9 @@ def parse_beam_attributes (attributes_LIST:list[float]) -> dict:
         i.e.:
         [4800, 24500, 1200000000] minimum list length
         [20e3, 200e3, 6480e6, 390e6, 43900, 11900e3, 0.3] maximum list length
-
+    E may be the name of a material, and Iz the name of a section (see sections.resolve_attribute):
+        [4800, '350W', 'W310x39']
+    Raises a ValueError for a name that isn't in the catalogue.
     '''
     ret_DICT = {
         'L' : str_to_float (attributes_LIST [0]),
@@ -302,39 +448,28 @@ def parse_beam_attributes (attributes_LIST:list[float]) -> dict:
         'rho' : 1
     }
 
-    try:
-        ret_DICT.update ({"Iy" : attributes_LIST [3]})
-    except:
-        pass
-
-    try:
-        ret_DICT.update ({"A" : attributes_LIST [4]})
-    except:
-        pass
-
-    try:
-        ret_DICT.update ({"J" : attributes_LIST [5]})
-    except:
-        pass
+    if any (isinstance (ret_DICT [attribute], str) for attribute in NAMED_ATTRIBUTES):
+        from eng_module.sections import resolve_attribute
+    for attribute in NAMED_ATTRIBUTES:
+        if isinstance (ret_DICT [attribute], str):
+            try:
+                ret_DICT.update (resolve_attribute (attribute, ret_DICT [attribute]))
+            except KeyError as err:
+                raise ValueError (err.args [0]) from None
 
-    try:
-        ret_DICT.update ({"nu" : attributes_LIST [6]})
-    except:
-        pass
-
-    try:
-        ret_DICT.update ({"rho" : attributes_LIST [7]})
-    except:
-        pass
+    for i, attribute in enumerate (('Iy', 'A', 'J', 'nu', 'rho'), 3): # the optional attributes, 1 unless given
+        if i < len (attributes_LIST):
+            ret_DICT [attribute] = attributes_LIST [i]
 
     return ret_DICT
 
 
-def parse_loads (all_loads_LIST:list[list[str|float]]) -> list [dict]:
+def parse_loads (all_loads_LIST:list[list[str|float]], as_records:bool=False) -> list [dict] | list [PointLoad | DistLoad]:
     '''
     Turns a messy nested list of strings and floats into a dictionary of load data.
     Params: all_loads_LIST - ie [['POINT:Fy', -10000.0, 4800.0, 'case:Live']]
     Returns: ret_LIST - ie [{"Type": "Point", "Direction": "Fy", "Magnitude": -10000.0, "Location": 4800.0, "Case": "Live"}, ...]
+    If 'as_records' is True, the list holds records.PointLoad and records.DistLoad objects instead of dicts.
     '''
     ret_LIST = []
     for each_load_LIST in all_loads_LIST: # ie ['POINT:Fy', -10000.0, 4800.0, 'case:Live']
@@ -360,19 +495,22 @@ def parse_loads (all_loads_LIST:list[list[str|float]]) -> list [dict]:
             this_load_DICT ['Start Location'] = str_to_float (each_load_LIST [3])
             this_load_DICT ['End Location'] = str_to_float (each_load_LIST [4])     
         else:
-            print ("UNEXPECTED DATA!")
+            logger.warning ('parse_loads: expected 4 or 6 items for a load, got %s', each_load_LIST)
 
         this_load_DICT ['Case'] = each_load_LIST [num_data_items - 1].split (':') [1]
             
 
+    if as_records:
+        return [load_from_dict (load_DICT) for load_DICT in ret_LIST]
     return ret_LIST
 
 
-def parse_supports (supports_LIST:list[str]) -> dict [float, str]:
+def parse_supports (supports_LIST:list[str], as_records:bool=False) -> dict [float, str] | list [Support]:
     '''
     Turns a list of strings into a dictionary of support data.
     Params: supports_LIST - ie ['1000:P', '3800:R', '4800:F', '8000:R']
     Returns: ret_DICT - ie {1000: 'P', 3800: 'R', 4800: 'F', 8000: 'R'}
+    If 'as_records' is True, a list of records.Support objects is returned instead.
     '''
     ret_DICT = {}
     for support in supports_LIST:
@@ -380,6 +518,8 @@ def parse_supports (supports_LIST:list[str]) -> dict [float, str]:
         support_location = str_to_float (temp_LIST [0])
         support_type = temp_LIST [1]
         ret_DICT [support_location] = support_type
+    if as_records:
+        return [Support (support_location, support_type) for support_location, support_type in ret_DICT.items ()]
     return ret_DICT
 
 
@@ -397,3 +537,99 @@ def read_beam_file (the_filename:str) -> list[list[str]]:
         ... # more loads
     '''
     return read_csv_file (the_filename)
+
+
+@profiling.timed (profiling.EXTRACT)
+def sample_model_results (the_model:'FEModel3D | PlanarBeam', n_stations:int=101, combo_name:str | list [str]='Combo 1') -> dict:
+    '''
+    Returns the moment ('Mz'), shear ('Fy') and deflection ('dy') of a solved beam model at 'n_stations' evenly spaced
+    stations from the start to the end of its members, for the load combination 'combo_name', as numpy arrays.
+    Rather than asking PyNite for one station at a time, the diagrams are rebuilt all at once from the loads,
+    the support reactions and the displacement and rotation of the first node (see singularity.sample_diagrams),
+    so the model must be a straight beam along the X axis with a single section, as from build_beam
+    (either backend; see planar.PlanarBeam.sample).
+    If 'combo_name' is a list of names, each diagram is an array of shape (number of combos, n_stations).
+    At a station with a step in shear or moment (a support, point load or couple) the value just to the right is given,
+    except at the last station, so the diagrams don't close to 0 there.
+    Returns: ret_DICT - ie {'x': array ([0.0, 48.0, ...]), 'Moment': array ([...]), 'Shear': array ([...]), 'Deflection': array ([...])}
+    '''
+    import numpy as np
+    combo_names_LIST = [combo_name] if isinstance (combo_name, str) else list (combo_name)
+    if is_planar_model (the_model):
+        x = np.linspace (the_model.X [0], the_model.X [-1], n_stations)
+        diagrams_DICT = the_model.sample (x, combo_names_LIST)
+        last_DICT = the_model.sample (x [-1:], combo_names_LIST, left_limit=True)
+    else:
+        x, diagrams_DICT, last_DICT = _sample_pynite_model (the_model, n_stations, combo_names_LIST)
+    for key in ('Shear', 'Moment'):
+        diagrams_DICT [key][:, -1] = last_DICT [key][:, 0]
+
+    if isinstance (combo_name, str):
+        diagrams_DICT = {key: value [0] for key, value in diagrams_DICT.items ()}
+    ret_DICT = {
+        'x': x.copy (),
+        'Moment': diagrams_DICT ['Moment'],
+        'Shear': diagrams_DICT ['Shear'],
+        'Deflection': diagrams_DICT ['Deflection'],
+    }
+    return ret_DICT
+
+
+def _sample_pynite_model (the_model:'FEModel3D', n_stations:int, combo_names_LIST:list [str]) -> 'tuple [np.ndarray, dict, dict]':
+    '''
+    Returns the stations, the diagrams at them, and the diagrams just left of the last station, for sample_model_results
+    '''
+    import numpy as np
+    from eng_module.singularity import sample_diagrams
+    members_LIST = sorted (the_model.Members.values (), key=lambda member: member.i_node.X)
+    first_node = members_LIST [0].i_node
+    start = first_node.X
+    end = members_LIST [-1].j_node.X
+    EI = members_LIST [0].E * members_LIST [0].Iz
+
+    # every load as a singularity term: forces (coefficient, location, power, case) in the shear diagram and
+    # counterclockwise couples (moment, location, case)
+    force_terms_LIST = []
+    couple_terms_LIST = []
+    for member in members_LIST:
+        x0 = member.i_node.X
+        for direction, P, x, case in member.PtLoads:
+            if direction in ('Fy', 'FY'):
+                force_terms_LIST.append ((P, x0 + x, 0, case))
+            elif direction in ('Mz', 'MZ'):
+                couple_terms_LIST.append ((P, x0 + x, case))
+        for direction, w1, w2, x1, x2, case in member.DistLoads:
+            if direction in ('Fy', 'FY'):
+                slope = (w2 - w1) / (x2 - x1)
+                force_terms_LIST.extend (((w1, x0 + x1, 1, case), (-w2, x0 + x2, 1, case)))
+                if slope != 0:
+                    force_terms_LIST.extend (((slope / 2, x0 + x1, 2, case), (-slope / 2, x0 + x2, 2, case)))
+    for node in the_model.Nodes.values ():
+        for direction, P, case in node.NodeLoads:
+            if direction == 'FY':
+                force_terms_LIST.append ((P, node.X, 0, case))
+            elif direction == 'MZ':
+                couple_terms_LIST.append ((P, node.X, case))
+
+    # ...factored for each combination, with the reactions as more point forces and couples
+    n_combos = len (combo_names_LIST)
+    n_forces = len (force_terms_LIST) + len (the_model.Nodes)
+    n_couples = len (couple_terms_LIST) + len (the_model.Nodes)
+    force_coefs = np.zeros ((n_combos, n_forces))
+    force_locations = np.zeros ((n_combos, n_forces))
+    force_powers = np.zeros ((n_combos, n_forces), dtype=int)
+    couple_coefs = np.zeros ((n_combos, n_couples))
+    couple_locations = np.zeros ((n_combos, n_couples))
+    for i, this_combo_name in enumerate (combo_names_LIST):
+        factors_DICT = the_model.LoadCombos [this_combo_name].factors
+        force_coefs [i] = [coef * factors_DICT.get (case, 0.0) for coef, _, _, case in force_terms_LIST] + [node.RxnFY [this_combo_name] for node in the_model.Nodes.values ()]
+        force_locations [i] = [location for _, location, _, _ in force_terms_LIST] + [node.X for node in the_model.Nodes.values ()]
+        force_powers [i] = [power for _, _, power, _ in force_terms_LIST] + [0] * len (the_model.Nodes)
+        couple_coefs [i] = [moment * factors_DICT.get (case, 0.0) for moment, _, case in couple_terms_LIST] + [node.RxnMZ [this_combo_name] for node in the_model.Nodes.values ()]
+        couple_locations [i] = [location for _, location, _ in couple_terms_LIST] + [node.X for node in the_model.Nodes.values ()]
+
+    x = np.broadcast_to (np.linspace (start, end, n_stations), (n_combos, n_stations))
+    y0 = np.array ([first_node.DY [this_combo_name] for this_combo_name in combo_names_LIST])
+    rotation0 = np.array ([first_node.RZ [this_combo_name] for this_combo_name in combo_names_LIST])
+    terms_TUPLE = (force_coefs, force_locations, force_powers, couple_coefs, couple_locations, y0, rotation0, EI)
+    return x [0], sample_diagrams (x, start, *terms_TUPLE), sample_diagrams (x [:, -1:], start, *terms_TUPLE, left_limit=True)
@@ -0,0 +1,65 @@
+'''
+Measures the import time of the lightweight core modules with 'python -X importtime', in fresh interpreters,
+and checks that they don't pull in the heavy dependencies (NumPy, SciPy, PyNite), which are only imported
+when a model is built (see beams.build_beam):
+
+    python -m eng_module.benchmarks.bench_import --repeat 5
+
+'eng_module.beams + PyNite' is what importing eng_module.beams used to cost when it imported PyNite itself.
+'''
+import argparse
+import subprocess
+import sys
+
+# name: the statement run in a fresh interpreter
+TARGETS = {
+    'eng_module.parsing': "import eng_module.parsing",
+    'eng_module.load_factors': "import eng_module.load_factors",
+    'eng_module.beams': "import eng_module.beams",
+    'eng_module.beams + PyNite': "import eng_module.beams, PyNite",
+    'eng_module.combos': "import eng_module.combos",
+    'eng_module.columns': "import eng_module.columns",
+}
+HEAVY_MODULES = ('numpy', 'scipy', 'PyNite')
+
+
+def measure_import (statement:str) -> tuple [float, list [str]]:
+    '''
+    Runs 'statement' in a fresh interpreter with -X importtime and returns the total import time in ms
+    (the sum of the top-level imports' cumulative times) and the HEAVY_MODULES that were imported
+    '''
+    check = f"import sys; print (','.join (m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run (
+        [sys.executable, '-X', 'importtime', '-c', f"{statement}; {check}"],
+        capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in completed.stderr.splitlines ():
+        if not line.startswith ('import time:'):
+            continue
+        _, cumulative, name = line [len ('import time:'):].split ('|')
+        if not cumulative.strip ().isdigit (): # the header
+            continue
+        if not name [1:].startswith (' '): # a top-level import, not one nested in another
+            total_us += int (cumulative)
+    heavy_LIST = [name for name in completed.stdout.strip ().split (',') if name]
+    return total_us / 1000, heavy_LIST
+
+
+def main () -> None:
+    parser = argparse.ArgumentParser (description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument ('--targets', nargs='+', choices=list (TARGETS), default=list (TARGETS))
+    parser.add_argument ('--repeat', type=int, default=5)
+    args = parser.parse_args ()
+
+    subprocess.run ([sys.executable, '-c', "; ".join (TARGETS.values ())], check=True) # warm the bytecode and OS file caches
+    startup_ms = min (measure_import ("pass") [0] for _ in range (args.repeat)) # the imports every interpreter makes
+    print (f"interpreter startup imports: {startup_ms:.1f} ms (subtracted below)")
+    print (f"{'target':<28} {'best ms':>9} {'heavy modules imported'}")
+    for name in args.targets:
+        results_LIST = [measure_import (TARGETS [name]) for _ in range (args.repeat)]
+        best_ms = min (ms for ms, _ in results_LIST) - startup_ms
+        print (f"{name:<28} {best_ms:>9.1f} {', '.join (results_LIST [0][1]) or '-'}")
+
+
+if __name__ == '__main__':
+    main ()
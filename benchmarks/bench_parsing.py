@@ -0,0 +1,48 @@
+'''
+Compares the throughput of the original parsing path (utils.read_csv_file style rows, every token through str_to_float,
+then get_structured_beam_data) with the schema-driven parser in parsing.py, on a large generated multi-beam file.
+
+    python -m eng_module.benchmarks.bench_parsing --beams 20000 --loads 6
+'''
+import argparse
+import os
+import tempfile
+import time
+from eng_module.beams import get_structured_beam_data
+from eng_module.parsing import iter_beam_records
+from eng_module.utils import iter_csv_records
+from eng_module.benchmarks.synthetic import write_multi_beam_file
+
+
+def time_legacy (the_filename:str) -> float:
+    start = time.perf_counter ()
+    for beam_LIST in iter_csv_records (the_filename):
+        get_structured_beam_data (beam_LIST)
+    return time.perf_counter () - start
+
+
+def time_schema (the_filename:str) -> float:
+    start = time.perf_counter ()
+    for _ in iter_beam_records (the_filename):
+        pass
+    return time.perf_counter () - start
+
+
+def main () -> None:
+    parser = argparse.ArgumentParser (description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument ('--beams', type=int, default=20000)
+    parser.add_argument ('--spans', type=int, default=2)
+    parser.add_argument ('--loads', type=int, default=6)
+    parser.add_argument ('--repeat', type=int, default=3)
+    args = parser.parse_args ()
+
+    with tempfile.TemporaryDirectory () as temp_dir:
+        the_filename = write_multi_beam_file (os.path.join (temp_dir, "beams.txt"), args.beams, args.spans, args.loads)
+        size_MB = os.path.getsize (the_filename) / 1e6
+        for label, timer in (('legacy', time_legacy), ('schema', time_schema)):
+            best = min (timer (the_filename) for _ in range (args.repeat))
+            print (f"{label:>8}: {best:8.3f} s  {args.beams / best:10.0f} beams/s  {size_MB / best:7.1f} MB/s")
+
+
+if __name__ == '__main__':
+    main ()
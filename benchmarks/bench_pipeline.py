@@ -0,0 +1,175 @@
+'''
+Times each stage of the parse -> build -> solve pipeline on generated beam files, shaped like test_data/beam_*.txt
+(see synthetic.make_beam_text), and reports the throughput and peak memory of each stage:
+
+    read      - beams.read_beam_file
+    structure - beams.get_structured_beam_data
+    build     - beams.build_beam
+    analyze   - FEModel3D.analyze
+
+    python -m eng_module.benchmarks.bench_pipeline --save baseline.json
+    python -m eng_module.benchmarks.bench_pipeline --compare baseline.json --threshold 0.2
+
+With '--compare', any stage more than 'threshold' slower than in the baseline is flagged, and the exit status is 1.
+'''
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from eng_module.beams import build_beam, get_structured_beam_data, read_beam_file
+from eng_module.benchmarks.synthetic import write_beam_files
+
+# name: (number of files, spans per beam, loads per beam)
+SCENARIOS = {
+    'single span': (200, 1, 2),
+    'many loads': (100, 1, 40),
+    'continuous': (100, 5, 10),
+    'long continuous': (20, 30, 60),
+}
+STAGES = ('read', 'structure', 'build', 'analyze')
+
+
+def run_stages (filenames_LIST:list [str]) -> dict [str, float]:
+    '''
+    Runs every stage over all of 'filenames_LIST', one stage at a time, and returns the seconds each took
+    '''
+    ret_DICT = {}
+    start = time.perf_counter ()
+    rows_LIST = [read_beam_file (the_filename) for the_filename in filenames_LIST]
+    ret_DICT ['read'] = time.perf_counter () - start
+
+    rows_LIST = copy.deepcopy (rows_LIST) # get_structured_beam_data changes its argument
+    start = time.perf_counter ()
+    beam_DICTS_LIST = [get_structured_beam_data (beam_LIST) for beam_LIST in rows_LIST]
+    ret_DICT ['structure'] = time.perf_counter () - start
+
+    start = time.perf_counter ()
+    models_LIST = [build_beam (beam_DICT) for beam_DICT in beam_DICTS_LIST]
+    ret_DICT ['build'] = time.perf_counter () - start
+
+    start = time.perf_counter ()
+    for the_model in models_LIST:
+        the_model.analyze (check_stability=False)
+    ret_DICT ['analyze'] = time.perf_counter () - start
+    return ret_DICT
+
+
+def measure_peak_memory (filenames_LIST:list [str]) -> dict [str, float]:
+    '''
+    Returns the peak memory (in MB, as traced by tracemalloc) allocated during each stage.
+    Done separately from the timing, since tracing slows everything down.
+    '''
+    ret_DICT = {}
+    tracemalloc.start ()
+    try:
+        def traced (stage:str, function):
+            tracemalloc.reset_peak ()
+            before = tracemalloc.get_traced_memory () [0]
+            result = function ()
+            ret_DICT [stage] = (tracemalloc.get_traced_memory () [1] - before) / 1e6
+            return result
+
+        rows_LIST = traced ('read', lambda: [read_beam_file (the_filename) for the_filename in filenames_LIST])
+        beam_DICTS_LIST = traced ('structure', lambda: [get_structured_beam_data (beam_LIST) for beam_LIST in rows_LIST])
+        models_LIST = traced ('build', lambda: [build_beam (beam_DICT) for beam_DICT in beam_DICTS_LIST])
+        traced ('analyze', lambda: [the_model.analyze (check_stability=False) for the_model in models_LIST])
+    finally:
+        tracemalloc.stop ()
+    return ret_DICT
+
+
+def run_scenario (directory:str, n_files:int, n_spans:int, n_loads:int, repeat:int=3, memory:bool=True) -> dict:
+    '''
+    Writes the scenario's files into 'directory' and returns its results:
+    {'files': ..., 'MB': ..., 'stages': {'read': {'seconds': ..., 'beams per second': ..., 'MB per second': ..., 'peak MB': ...}, ...}}
+    The time of each stage is the best of 'repeat' runs.
+    '''
+    filenames_LIST = write_beam_files (directory, n_files, n_spans, n_loads)
+    size_MB = sum (os.path.getsize (the_filename) for the_filename in filenames_LIST) / 1e6
+    seconds_DICT = dict.fromkeys (STAGES, float ('inf'))
+    for _ in range (repeat):
+        for stage, seconds in run_stages (filenames_LIST).items ():
+            seconds_DICT [stage] = min (seconds_DICT [stage], seconds)
+    memory_DICT = measure_peak_memory (filenames_LIST) if memory else {}
+
+    stages_DICT = {}
+    for stage in STAGES:
+        stages_DICT [stage] = {
+            'seconds': seconds_DICT [stage],
+            'beams per second': n_files / seconds_DICT [stage],
+            'MB per second': size_MB / seconds_DICT [stage],
+            'peak MB': memory_DICT.get (stage),
+        }
+    return {'files': n_files, 'spans': n_spans, 'loads': n_loads, 'MB': size_MB, 'stages': stages_DICT}
+
+
+def compare_results (results_DICT:dict, baseline_DICT:dict, threshold:float=0.2) -> list [str]:
+    '''
+    Returns a message for each scenario stage that took more than (1 + 'threshold') times as long as in 'baseline_DICT'
+    (both as saved by this benchmark). Scenarios or stages missing from either are skipped.
+    '''
+    ret_LIST = []
+    for scenario, scenario_DICT in results_DICT ['scenarios'].items ():
+        baseline_scenario_DICT = baseline_DICT ['scenarios'].get (scenario)
+        if baseline_scenario_DICT is None:
+            continue
+        for stage, stage_DICT in scenario_DICT ['stages'].items ():
+            baseline_stage_DICT = baseline_scenario_DICT ['stages'].get (stage)
+            if baseline_stage_DICT is None:
+                continue
+            ratio = stage_DICT ['seconds'] / baseline_stage_DICT ['seconds']
+            if ratio > 1 + threshold:
+                ret_LIST.append (f"{scenario} / {stage}: {stage_DICT ['seconds']:.4f} s vs {baseline_stage_DICT ['seconds']:.4f} s ({ratio:.2f}x)")
+    return ret_LIST
+
+
+def main () -> None:
+    parser = argparse.ArgumentParser (description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument ('--scenarios', nargs='+', choices=list (SCENARIOS), default=list (SCENARIOS))
+    parser.add_argument ('--scale', type=float, default=1.0, help="multiplies the number of files in every scenario")
+    parser.add_argument ('--repeat', type=int, default=3)
+    parser.add_argument ('--no-memory', action='store_true', help="skip the (slow) peak memory pass")
+    parser.add_argument ('--save', help="write the results to this JSON file")
+    parser.add_argument ('--compare', help="a JSON file saved earlier with --save, to check for regressions against")
+    parser.add_argument ('--threshold', type=float, default=0.2, help="the slowdown (as a fraction) counted as a regression")
+    args = parser.parse_args ()
+
+    results_DICT = {
+        'created': datetime.datetime.now ().isoformat (timespec='seconds'),
+        'python': platform.python_version (),
+        'numpy': np.__version__,
+        'machine': platform.platform (),
+        'scenarios': {},
+    }
+    print (f"{'scenario':<16} {'stage':<10} {'seconds':>9} {'beams/s':>10} {'MB/s':>8} {'peak MB':>8}")
+    for scenario in args.scenarios:
+        n_files, n_spans, n_loads = SCENARIOS [scenario]
+        with tempfile.TemporaryDirectory () as temp_dir:
+            scenario_DICT = run_scenario (temp_dir, max (1, round (n_files * args.scale)), n_spans, n_loads, args.repeat, not args.no_memory)
+        results_DICT ['scenarios'][scenario] = scenario_DICT
+        for stage, stage_DICT in scenario_DICT ['stages'].items ():
+            peak = '' if stage_DICT ['peak MB'] is None else f"{stage_DICT ['peak MB']:.2f}"
+            print (f"{scenario:<16} {stage:<10} {stage_DICT ['seconds']:>9.4f} {stage_DICT ['beams per second']:>10.0f} {stage_DICT ['MB per second']:>8.2f} {peak:>8}")
+
+    if args.save:
+        with open (args.save, "w") as json_file:
+            json.dump (results_DICT, json_file, indent=2)
+    if args.compare:
+        with open (args.compare) as json_file:
+            regressions_LIST = compare_results (results_DICT, json.load (json_file), args.threshold)
+        for message in regressions_LIST:
+            print (f"REGRESSION {message}")
+        if regressions_LIST:
+            sys.exit (1)
+        print (f"No regressions against {args.compare}")
+
+
+if __name__ == '__main__':
+    main ()
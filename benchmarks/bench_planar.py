@@ -0,0 +1,53 @@
+'''
+Compares building and solving continuous beams with the PyNite backend of beams.build_beam and with the planar backend
+(planar.PlanarBeam), for a range of span counts, and checks that their reactions agree.
+
+    python -m eng_module.benchmarks.bench_planar --spans 2 5 10 20 50 100 200
+'''
+import argparse
+import io
+import random
+import time
+from eng_module.beams import build_beam
+from eng_module.parsing import iter_beam_records
+from eng_module.benchmarks.synthetic import make_beam_text
+
+
+def time_backend (beam_DICT:dict, backend:str, repeat:int) -> tuple [float, list [float]]:
+    '''
+    Returns the best time to build and analyze 'beam_DICT' with 'backend', and the vertical reactions at the supports
+    '''
+    best = float ('inf')
+    for _ in range (repeat):
+        start = time.perf_counter ()
+        the_model = build_beam (beam_DICT, backend=backend)
+        the_model.analyze (check_stability=False)
+        best = min (best, time.perf_counter () - start)
+    if backend == 'planar':
+        reactions_LIST = the_model.RxnFY ['Combo 1'][the_model.support_DY].tolist ()
+    else:
+        reactions_LIST = [node.RxnFY ['Combo 1'] for node in sorted (the_model.Nodes.values (), key=lambda node: node.X) if node.support_DY]
+    return best, reactions_LIST
+
+
+def main () -> None:
+    parser = argparse.ArgumentParser (description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument ('--spans', type=int, nargs='+', default=[2, 5, 10, 20, 50, 100, 200])
+    parser.add_argument ('--loads', type=int, default=None, help="loads per beam (default: 2 per span)")
+    parser.add_argument ('--repeat', type=int, default=3)
+    args = parser.parse_args ()
+
+    rng = random.Random (0)
+    print (f"{'spans':>6} {'pynite s':>10} {'planar s':>10} {'speedup':>8} {'max reaction diff':>18}")
+    for n_spans in args.spans:
+        n_loads = args.loads if args.loads is not None else 2 * n_spans
+        beam_DICT = next (iter_beam_records (io.StringIO (make_beam_text (rng, f"{n_spans} spans", n_spans, n_loads))))
+        pynite_time, pynite_LIST = time_backend (beam_DICT, 'pynite', args.repeat)
+        planar_time, planar_LIST = time_backend (beam_DICT, 'planar', args.repeat)
+        scale = max (abs (R) for R in pynite_LIST)
+        difference = max (abs (a - b) for a, b in zip (pynite_LIST, planar_LIST)) / scale
+        print (f"{n_spans:>6} {pynite_time:>10.4f} {planar_time:>10.4f} {pynite_time / planar_time:>8.1f} {difference:>18.2e}")
+
+
+if __name__ == '__main__':
+    main ()
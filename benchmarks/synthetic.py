@@ -0,0 +1,74 @@
+import random
+
+
+def make_beam_text (
+    rng:random.Random,
+    name:str,
+    n_spans:int=1,
+    n_loads:int=2,
+    cases:tuple [str, ...]=('Dead', 'Live')
+) -> str:
+    '''
+    Returns the text of one random beam in the beam file format (see beams.read_beam_file),
+    with 'n_spans' equal spans and 'n_loads' point and distributed loads.
+    '''
+    span = rng.choice ([3000, 3600, 4200, 4800, 6000])
+    L = span * n_spans
+    E = rng.choice ([200000, 24500, 9500])
+    Iz = rng.uniform (50e6, 900e6)
+    lines_LIST = [
+        name,
+        f"{L},{E},{Iz:.6g},{Iz / 10:.6g},{rng.uniform (2000, 20000):.6g},{Iz / 100:.6g},0.3",
+        ",".join (["0:P"] + [f"{span * i}:R" for i in range (1, n_spans + 1)]),
+    ]
+    for i in range (n_loads):
+        case = cases [i % len (cases)]
+        if i % 2:
+            x1 = rng.uniform (0, L / 2)
+            x2 = rng.uniform (L / 2, L)
+            w = -rng.uniform (1, 50)
+            lines_LIST.append (f"DIST:Fy,{w:.6g},{w:.6g},{x1:.6g},{x2:.6g},case:{case}")
+        else:
+            lines_LIST.append (f"POINT:Fy,{-rng.uniform (1000, 50000):.6g},{rng.uniform (0, L):.6g},case:{case}")
+    return "\n".join (lines_LIST) + "\n"
+
+
+def write_beam_files (
+    directory:str,
+    n_files:int,
+    n_spans:int=1,
+    n_loads:int=2,
+    seed:int=0
+) -> list [str]:
+    '''
+    Writes 'n_files' single-beam files into 'directory' and returns their filenames
+    '''
+    rng = random.Random (seed)
+    filenames_LIST = []
+    for i in range (n_files):
+        the_filename = f"{directory}/beam_{i:06d}.txt"
+        with open (the_filename, "w") as the_file:
+            the_file.write (make_beam_text (rng, f"Beam {i}", n_spans, n_loads))
+        filenames_LIST.append (the_filename)
+    return filenames_LIST
+
+
+def write_multi_beam_file (
+    the_filename:str,
+    n_beams:int,
+    n_spans:int=1,
+    n_loads:int=2,
+    seed:int=0,
+    delimiter:str='---'
+) -> str:
+    '''
+    Writes 'n_beams' beams into a single file, separated by 'delimiter' lines (see utils.iter_csv_records),
+    and returns the filename
+    '''
+    rng = random.Random (seed)
+    with open (the_filename, "w") as the_file:
+        for i in range (n_beams):
+            if i:
+                the_file.write (f"{delimiter}\n")
+            the_file.write (make_beam_text (rng, f"Beam {i}", n_spans, n_loads))
+    return the_filename
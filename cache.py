@@ -0,0 +1,130 @@
+import hashlib
+import os
+import zipfile
+import numpy as np
+from eng_module.beams import iter_beam_file
+from eng_module.records import BeamSet
+
+CACHE_VERSION = 1 # bump this whenever the parsed format changes, so that old entries are thrown away
+
+
+def hash_file (the_filename:str) -> str:
+    '''
+    Returns the SHA-1 hex digest of the contents of 'the_filename'
+    '''
+    the_hash = hashlib.sha1 ()
+    with open (the_filename, "rb") as the_file:
+        for block in iter (lambda: the_file.read (1 << 20), b''):
+            the_hash.update (block)
+    return the_hash.hexdigest ()
+
+
+class BeamFileCache:
+    '''
+    An on-disk cache of parsed beam files. Each source file's beams are stored as the columns of a records.BeamSet
+    in an uncompressed .npz file in 'cache_dir', so a warm read never touches the text parser.
+    An entry is used as is when the source file's size and modification time are unchanged; otherwise the
+    source is hashed, and the entry is only re-parsed if the contents really have changed.
+    Once there are more than 'max_entries' entries, the least recently used ones are deleted.
+    The 'hits', 'misses' and 'evictions' counters record what has happened since the cache was opened.
+    '''
+
+    def __init__ (self, cache_dir:str, max_entries:int=10_000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._n_entries = None # counted when first needed
+        os.makedirs (cache_dir, exist_ok=True)
+
+    def entry_path (self, the_filename:str) -> str:
+        '''
+        Returns the path of the cache entry for the source file 'the_filename'
+        '''
+        key = hashlib.sha1 (os.path.abspath (the_filename).encode ()).hexdigest ()
+        return os.path.join (self.cache_dir, f"{key}.npz")
+
+    def read_beams (self, the_filename:str) -> BeamSet:
+        '''
+        Returns every beam in 'the_filename' (see beams.iter_beam_file) as a BeamSet, from the cache if it is up to date
+        '''
+        entry_path = self.entry_path (the_filename)
+        source_stat = os.stat (the_filename)
+        content_hash = None
+        try:
+            with np.load (entry_path) as entry_NPZ:
+                arrays_DICT = {name: entry_NPZ [name] for name in entry_NPZ.files}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            arrays_DICT = None
+
+        if arrays_DICT is not None and arrays_DICT.get ('version') == CACHE_VERSION:
+            if arrays_DICT ['size'] == source_stat.st_size and arrays_DICT ['mtime_ns'] == source_stat.st_mtime_ns:
+                return self._hit (entry_path, arrays_DICT)
+            content_hash = hash_file (the_filename)
+            if str (arrays_DICT ['content_hash']) == content_hash: # touched but not changed
+                self._write (entry_path, arrays_DICT, source_stat, content_hash)
+                return self._hit (entry_path, arrays_DICT)
+
+        self.misses += 1
+        beam_set = BeamSet (iter_beam_file (the_filename, as_records=True))
+        if content_hash is None:
+            content_hash = hash_file (the_filename)
+        is_new = arrays_DICT is None
+        self._write (entry_path, beam_set.to_arrays (), source_stat, content_hash)
+        if is_new:
+            self._add_entry ()
+        return beam_set
+
+    def read_beam_dicts (self, the_filename:str) -> list [dict]:
+        '''
+        Returns every beam in 'the_filename' as a dict in the format of beams.get_structured_beam_data
+        '''
+        return self.read_beams (the_filename).to_dicts ()
+
+    def clear (self) -> None:
+        '''
+        Deletes every entry in the cache
+        '''
+        for entry in os.scandir (self.cache_dir):
+            if entry.name.endswith ('.npz'):
+                os.remove (entry.path)
+        self._n_entries = 0
+
+    def _hit (self, entry_path:str, arrays_DICT:dict) -> BeamSet:
+        self.hits += 1
+        os.utime (entry_path) # the entry's mtime is its last use, for LRU eviction
+        return BeamSet.from_arrays (arrays_DICT)
+
+    def _write (self, entry_path:str, arrays_DICT:dict, source_stat:os.stat_result, content_hash:str) -> None:
+        arrays_DICT = arrays_DICT | {
+            'version': np.array (CACHE_VERSION),
+            'size': np.array (source_stat.st_size),
+            'mtime_ns': np.array (source_stat.st_mtime_ns),
+            'content_hash': np.array (content_hash),
+        }
+        temp_path = f"{entry_path}.{os.getpid ()}.tmp"
+        with open (temp_path, "wb") as the_file:
+            np.savez (the_file, **arrays_DICT)
+        os.replace (temp_path, entry_path) # atomic, so a concurrent reader never sees half an entry
+
+    def _add_entry (self) -> None:
+        if self._n_entries is None:
+            self._n_entries = sum (1 for entry in os.scandir (self.cache_dir) if entry.name.endswith ('.npz'))
+        else:
+            self._n_entries += 1
+        if self._n_entries > self.max_entries:
+            self._evict ()
+
+    def _evict (self) -> None:
+        # evict down to 90% of the limit, so the directory isn't scanned again on every new entry
+        entries_LIST = [entry for entry in os.scandir (self.cache_dir) if entry.name.endswith ('.npz')]
+        entries_LIST.sort (key=lambda entry: entry.stat ().st_mtime_ns)
+        n_to_remove = len (entries_LIST) - max (int (self.max_entries * 0.9), 1)
+        for entry in entries_LIST [:max (n_to_remove, 0)]:
+            try:
+                os.remove (entry.path)
+                self.evictions += 1
+            except FileNotFoundError: # already evicted by another process
+                pass
+        self._n_entries = len (entries_LIST) - max (n_to_remove, 0)
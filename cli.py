@@ -0,0 +1,206 @@
+'''
+The eng_module command line:
+
+    python -m eng_module run beams/ --shard 0/4 --jobs 8 --output shard_0.jsonl
+    python -m eng_module merge shard_*.jsonl --output results.csv
+    python -m eng_module validate beams/
+
+'run' analyzes every beam file found (see batch.find_beam_files) that falls in its shard, and appends each result
+to the '--output' file as a line of JSON as soon as it is done. That file is also the checkpoint: run the same command
+again after it was killed and the files already done are skipped. Each file's shard depends only on its path
+(a SHA-1 hash of it, modulo the number of shards), so nodes given the same file list split it without talking to each other.
+'merge' combines the shard outputs into one csv table, one row per file, sorted by file.
+'validate' lists every problem in the beam files (see validation.validate_files) without analyzing anything;
+'run --validate' does the same first and records the files with problems as failed, without analyzing them.
+'''
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+from typing import Iterable
+from eng_module.batch import find_beam_files, run_batch
+from eng_module.validation import validate_files
+
+RESULT_COLUMNS = ('File', 'Name', 'Error', 'Max Moment', 'Min Moment', 'Max Shear', 'Min Shear', 'Max Deflection', 'Min Deflection', 'Reactions')
+
+logger = logging.getLogger (__name__)
+
+
+def parse_shard (text:str) -> tuple [int, int]:
+    '''
+    Returns (i, N) from 'i/N', the i'th (0-based) of N shards
+    '''
+    try:
+        i, n_shards = (int (part) for part in text.split ('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError (f"expected a shard as 'i/N', ie 0/4, got '{text}'") from None
+    if not 0 <= i < n_shards:
+        raise argparse.ArgumentTypeError (f"expected 0 <= i < N in the shard 'i/N', got '{text}'")
+    return i, n_shards
+
+
+def get_shard (the_filename:str, n_shards:int) -> int:
+    '''
+    Returns the shard (0 to 'n_shards' - 1) that 'the_filename' belongs to: the same on every machine and in every run.
+    A cryptographic hash, as checksums like CRC-32 spread similar names (ie beam_1.txt, beam_2.txt...) unevenly.
+    '''
+    digest = hashlib.sha1 (os.path.normpath (the_filename).encode ()).digest ()
+    return int.from_bytes (digest [:8], 'big') % n_shards
+
+
+def select_shard (filenames_LIST:list [str], i:int, n_shards:int) -> list [str]:
+    '''
+    Returns the files in 'filenames_LIST' that belong to shard 'i' of 'n_shards', in their original order
+    '''
+    return [the_filename for the_filename in filenames_LIST if get_shard (the_filename, n_shards) == i]
+
+
+def to_json_line (result_DICT:dict) -> str:
+    '''
+    Returns a result (see batch.analyze_beam_file) as one line of JSON, with the reactions as [location, reaction] pairs
+    so their float keys survive the round trip
+    '''
+    row_DICT = dict (result_DICT)
+    if 'Reactions' in row_DICT:
+        row_DICT ['Reactions'] = list (row_DICT ['Reactions'].items ())
+    return json.dumps (row_DICT) + '\n'
+
+
+def from_json_line (line:str) -> dict:
+    '''
+    The reverse of to_json_line
+    '''
+    ret_DICT = json.loads (line)
+    if 'Reactions' in ret_DICT:
+        ret_DICT ['Reactions'] = {location: reaction for location, reaction in ret_DICT ['Reactions']}
+    return ret_DICT
+
+
+def load_checkpoint (path:str) -> dict [str, dict]:
+    '''
+    Returns the results already in the output file 'path', by file (an empty dict if there is no such file).
+    A last line cut short, from a run that was killed while writing it, is removed from the file.
+    '''
+    ret_DICT = {}
+    if not os.path.exists (path):
+        return ret_DICT
+    with open (path, "r+b") as checkpoint_file:
+        good_size = 0
+        for line in checkpoint_file:
+            if not line.endswith (b'\n'):
+                break
+            try:
+                result_DICT = from_json_line (line.decode ())
+            except (ValueError, UnicodeDecodeError):
+                break
+            ret_DICT [result_DICT ['File']] = result_DICT
+            good_size += len (line)
+        if checkpoint_file.seek (0, os.SEEK_END) != good_size:
+            logger.warning ('%s: dropping an incomplete last line', path)
+            checkpoint_file.truncate (good_size)
+    return ret_DICT
+
+
+def run_files (
+    filenames_LIST:list [str],
+    output:str,
+    shard:tuple [int, int]=(0, 1),
+    jobs:int | None=1,
+    chunk_size:int=1,
+    cache_dir:str | None=None,
+    validate:bool=False
+) -> dict:
+    '''
+    Analyzes the files in 'filenames_LIST' that fall in 'shard' (see batch.run_batch, with 'jobs' worker processes),
+    skipping those already in the 'output' checkpoint, and appends each new result to 'output' as it finishes.
+    With 'validate', files with problems fail without being analyzed (see batch.run_batch).
+    Returns: ret_DICT - ie {'Shard': 1, 'Files': 250, 'Skipped': 120, 'Done': 130, 'Failed': 2}
+    '''
+    i, n_shards = shard
+    shard_LIST = select_shard (filenames_LIST, i, n_shards)
+    done_DICT = load_checkpoint (output)
+    todo_LIST = [the_filename for the_filename in shard_LIST if the_filename not in done_DICT]
+    logger.info ('shard %d/%d: %d files, %d already done', i, n_shards, len (shard_LIST), len (shard_LIST) - len (todo_LIST))
+
+    ret_DICT = {'Shard': i, 'Files': len (shard_LIST), 'Skipped': len (shard_LIST) - len (todo_LIST), 'Done': 0, 'Failed': 0}
+    if not todo_LIST:
+        return ret_DICT
+    with open (output, "a") as output_file:
+        for result_DICT in run_batch (todo_LIST, max_workers=jobs, chunk_size=chunk_size, cache_dir=cache_dir, validate=validate):
+            output_file.write (to_json_line (result_DICT))
+            output_file.flush () # each line is on disk before the next, so a killed run loses at most one file
+            ret_DICT ['Done'] += 1
+            if result_DICT ['Error']:
+                ret_DICT ['Failed'] += 1
+                logger.warning ('%s: %s', result_DICT ['File'], result_DICT ['Error'])
+    return ret_DICT
+
+
+def merge_results (paths:Iterable [str], output:str) -> int:
+    '''
+    Combines the results in the output files 'paths' (see run_files) into the csv table 'output',
+    one row per file (the last result wins if a file is in more than one), sorted by file.
+    The reactions are written as 'location:reaction' pairs separated by spaces. Returns the number of rows.
+    '''
+    results_DICT = {}
+    for path in paths:
+        results_DICT.update (load_checkpoint (path))
+    with open (output, "w", newline='') as csv_file:
+        csv_writer = csv.writer (csv_file)
+        csv_writer.writerow (RESULT_COLUMNS)
+        for the_filename in sorted (results_DICT):
+            result_DICT = results_DICT [the_filename]
+            row_LIST = [result_DICT.get (column) for column in RESULT_COLUMNS [:-1]]
+            row_LIST.append (' '.join (f"{location}:{reaction}" for location, reaction in result_DICT.get ('Reactions', {}).items ()))
+            csv_writer.writerow (['' if value is None else value for value in row_LIST])
+    return len (results_DICT)
+
+
+def main (argv:list [str] | None=None) -> int:
+    parser = argparse.ArgumentParser (prog='eng_module', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument ('-v', '--verbose', action='store_true', help="log each file's progress")
+    subparsers = parser.add_subparsers (dest='command', required=True)
+
+    run_parser = subparsers.add_parser ('run', help="analyze beam files")
+    run_parser.add_argument ('paths', nargs='+', help="beam files, directories or glob patterns")
+    run_parser.add_argument ('--output', required=True, help="the JSON lines file the results are appended to; also the checkpoint")
+    run_parser.add_argument ('--shard', type=parse_shard, default=(0, 1), help="only the i'th (0-based) of N shards, as i/N")
+    run_parser.add_argument ('--jobs', type=int, default=1, help="worker processes (0 for one per CPU)")
+    run_parser.add_argument ('--chunk-size', type=int, default=1, help="files sent to a worker at a time")
+    run_parser.add_argument ('--cache-dir', help="cache the parsed beams here (see cache.BeamFileCache)")
+    run_parser.add_argument ('--validate', action='store_true', help="check the files first; those with problems fail without being analyzed")
+
+    merge_parser = subparsers.add_parser ('merge', help="merge the outputs of 'run' into one csv table")
+    merge_parser.add_argument ('paths', nargs='+', help="the JSON lines files written by 'run'")
+    merge_parser.add_argument ('--output', required=True, help="the csv file to write")
+
+    validate_parser = subparsers.add_parser ('validate', help="list every problem in beam files, without analyzing them")
+    validate_parser.add_argument ('paths', nargs='+', help="beam files, directories or glob patterns")
+
+    args = parser.parse_args (argv)
+    logging.basicConfig (level=logging.INFO if args.verbose else logging.WARNING, format='%(levelname)s %(message)s')
+
+    if args.command in ('run', 'validate'):
+        filenames_LIST = []
+        for path in args.paths:
+            filenames_LIST.extend (find_beam_files (path) if os.path.isdir (path) or not os.path.exists (path) else [path])
+        filenames_LIST = list (dict.fromkeys (filenames_LIST))
+    if args.command == 'run':
+        summary_DICT = run_files (filenames_LIST, args.output, args.shard, args.jobs or None, args.chunk_size, args.cache_dir, args.validate)
+        print (', '.join (f"{key}: {value}" for key, value in summary_DICT.items ()))
+    elif args.command == 'validate':
+        problems_DICT = validate_files (filenames_LIST)
+        n_problems = 0
+        for problems_LIST in problems_DICT.values ():
+            for problem in problems_LIST:
+                print (problem)
+            n_problems += len (problems_LIST)
+        n_files = sum (1 for problems_LIST in problems_DICT.values () if problems_LIST)
+        print (f"{n_problems} problems in {n_files} of {len (problems_DICT)} files")
+        return 1 if n_problems else 0
+    else:
+        n_rows = merge_results (args.paths, args.output)
+        print (f"{n_rows} results written to {args.output}")
+    return 0
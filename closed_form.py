@@ -0,0 +1,207 @@
+import numpy as np
+from eng_module.beams import build_beam, get_model_results, get_moment_of_inertia
+from eng_module.records import Beam, to_beam_dict
+from eng_module.singularity import get_load_terms, integrate_terms
+from eng_module import profiling
+
+# Support layouts that can be solved by statics alone:
+SIMPLE = 0 # two pin/roller supports anywhere along the beam, i.e. a simple span with or without overhangs (backspan + cantilever)
+CANTILEVER_LEFT = 1 # a single fixed support at the start of the beam
+CANTILEVER_RIGHT = 2 # a single fixed support at the end of the beam
+
+# beams are evaluated in blocks so the (beams x stations x load terms) arrays stay a reasonable size
+BLOCK_SIZE = 2048
+
+
+def classify_beam (beam_DICT:dict) -> int | None:
+    '''
+    Returns the layout code (SIMPLE, CANTILEVER_LEFT or CANTILEVER_RIGHT) of the beam in 'beam_DICT'
+    (as returned by beams.get_structured_beam_data) if it can be solved in closed form,
+    or None if it needs the finite element model (e.g. continuous spans, propped cantilevers, non 'Fy' loads).
+    '''
+    for load_DICT in beam_DICT ['Loads']:
+        if load_DICT ['Direction'] not in ('Fy', 'FY') or load_DICT ['Type'] not in ('Point', 'Dist'):
+            return None
+
+    L = beam_DICT ['L']
+    supports_LIST = sorted (beam_DICT ['Supports'].items ())
+    support_types_LIST = [support_type for _, support_type in supports_LIST]
+    if len (supports_LIST) == 2 and 'P' in support_types_LIST and set (support_types_LIST) <= {'P', 'R'}:
+        return SIMPLE
+    if support_types_LIST == ['F']:
+        if supports_LIST [0][0] == 0:
+            return CANTILEVER_LEFT
+        if supports_LIST [0][0] == L:
+            return CANTILEVER_RIGHT
+    return None
+
+
+@profiling.timed (profiling.SOLVE)
+def solve_simple_beams (
+    L:np.ndarray,
+    E:np.ndarray,
+    I:np.ndarray,
+    layouts:np.ndarray,
+    support_1:np.ndarray,
+    support_2:np.ndarray,
+    coefs:np.ndarray,
+    locations:np.ndarray,
+    powers:np.ndarray,
+    n_stations:int=201
+) -> dict:
+    '''
+    Solves a batch of statically determinate beams in closed form (Macaulay's method) and returns a dict of arrays, one value per beam:
+    {
+        'R1', 'R2': the vertical reactions at 'support_1' and 'support_2' (upward is positive; 'R2' is 0 for cantilevers),
+        'M1': the reaction moment of a fixed support (0 for SIMPLE beams),
+        'Max Moment', 'Min Moment', 'Max Shear', 'Min Shear', 'Max Deflection', 'Min Deflection'
+    }
+    Moment, shear and deflection use the same sign conventions as PyNite ('Mz', 'Fy' and 'dy' for a beam along the X axis).
+    Params:
+    'L', 'E', 'I', 'layouts', 'support_1', 'support_2' - arrays of shape (n_beams,); for cantilevers 'support_1' is the fixed support
+    'coefs', 'locations', 'powers' - the load terms from 'get_load_terms', padded with zero coefficients to shape (n_beams, n_terms)
+    'n_stations' - the number of evenly spaced stations at which the extreme values are sampled;
+        the load and support locations are always sampled as well
+    '''
+    L = np.asarray (L, dtype=float)
+    E = np.asarray (E, dtype=float)
+    I = np.asarray (I, dtype=float)
+    layouts = np.asarray (layouts)
+    support_1 = np.asarray (support_1, dtype=float)
+    support_2 = np.asarray (support_2, dtype=float)
+    coefs = np.asarray (coefs, dtype=float).reshape (len (L), -1)
+    locations = np.asarray (locations, dtype=float).reshape (len (L), -1)
+    powers = np.asarray (powers, dtype=int).reshape (len (L), -1)
+
+    # Statics: total load and the moment of the loads about the end of the beam
+    at_end = L [:, None]
+    total_load = integrate_terms (at_end, coefs, locations, powers, 0) [:, 0]
+    moment_at_end = integrate_terms (at_end, coefs, locations, powers, 1) [:, 0] # sum (F * (L - a))
+    moment_about_start = total_load * L - moment_at_end # sum (F * a)
+    moment_about_support_1 = moment_about_start - total_load * support_1 # sum (F * (a - s1))
+
+    is_simple = layouts == SIMPLE
+    is_cant_left = layouts == CANTILEVER_LEFT
+    is_cant_right = layouts == CANTILEVER_RIGHT
+    span = np.where (is_simple, support_2 - support_1, 1.0)
+    R2 = np.where (is_simple, -moment_about_support_1 / span, 0.0)
+    R1 = -total_load - R2
+    M0 = np.where (is_cant_left, moment_about_start, 0.0) # sagging moment at the fixed start of a left cantilever
+    M1 = np.where (is_cant_left, -M0, 0.0) + np.where (is_cant_right, moment_at_end, 0.0)
+
+    # The reactions are just more point loads as far as the singularity functions are concerned
+    coefs = np.concatenate ([coefs, R1 [:, None], R2 [:, None]], axis=1)
+    locations = np.concatenate ([locations, support_1 [:, None], support_2 [:, None]], axis=1)
+    powers = np.concatenate ([powers, np.zeros ((len (L), 2), dtype=int)], axis=1)
+
+    # Boundary conditions: EI*y = phi2 + C1*x + C2
+    bc_x = np.stack ([support_1, support_2, L], axis=1)
+    bc_phi1 = integrate_terms (bc_x, coefs, locations, powers, 2) + M0 [:, None] * bc_x
+    bc_phi2 = integrate_terms (bc_x, coefs, locations, powers, 3) + M0 [:, None] * bc_x**2 / 2
+    C1_simple = -(bc_phi2 [:, 1] - bc_phi2 [:, 0]) / span
+    C1 = np.where (is_simple, C1_simple, np.where (is_cant_right, -bc_phi1 [:, 2], 0.0))
+    C2 = np.where (
+        is_simple, -bc_phi2 [:, 0] - C1 * support_1,
+        np.where (is_cant_right, -bc_phi2 [:, 2] - C1 * L, 0.0))
+
+    # Sample the diagrams
+    x = np.concatenate ([
+        L [:, None] * np.linspace (0.0, 1.0, n_stations) [None, :],
+        np.clip (locations, 0.0, L [:, None])], axis=1)
+    shear = integrate_terms (x, coefs, locations, powers, 0)
+    shear_left = integrate_terms (x, coefs, locations, powers, 0, left_limit=True)
+    moment = integrate_terms (x, coefs, locations, powers, 1) + M0 [:, None]
+    phi2 = integrate_terms (x, coefs, locations, powers, 3) + M0 [:, None] * x**2 / 2
+    deflection = (phi2 + C1 [:, None] * x + C2 [:, None]) / (E * I) [:, None]
+
+    ret_DICT = {
+        'R1': R1,
+        'R2': R2,
+        'M1': M1,
+        'Max Moment': (-moment).max (axis=1),
+        'Min Moment': (-moment).min (axis=1),
+        'Max Shear': np.maximum (shear.max (axis=1), shear_left.max (axis=1)),
+        'Min Shear': np.minimum (shear.min (axis=1), shear_left.min (axis=1)),
+        'Max Deflection': deflection.max (axis=1),
+        'Min Deflection': deflection.min (axis=1),
+    }
+    return ret_DICT
+
+
+def pack_beams (beam_DICTS_LIST:list [dict], layouts_LIST:list [int]) -> dict:
+    '''
+    Packs a list of beam dicts (as returned by beams.get_structured_beam_data) and their layout codes
+    into the arrays expected by 'solve_simple_beams'.
+    '''
+    n_beams = len (beam_DICTS_LIST)
+    terms_LIST = [get_load_terms (beam_DICT ['Loads']) for beam_DICT in beam_DICTS_LIST]
+    n_terms = max ([len (beam_terms_LIST) for beam_terms_LIST in terms_LIST] + [1])
+
+    ret_DICT = {
+        'L': np.zeros (n_beams),
+        'E': np.zeros (n_beams),
+        'I': np.zeros (n_beams),
+        'layouts': np.array (layouts_LIST, dtype=int),
+        'support_1': np.zeros (n_beams),
+        'support_2': np.zeros (n_beams),
+        'coefs': np.zeros ((n_beams, n_terms)),
+        'locations': np.zeros ((n_beams, n_terms)),
+        'powers': np.zeros ((n_beams, n_terms), dtype=int),
+    }
+    for i, beam_DICT in enumerate (beam_DICTS_LIST):
+        ret_DICT ['L'][i] = beam_DICT ['L']
+        ret_DICT ['E'][i] = beam_DICT ['E']
+        ret_DICT ['I'][i] = get_moment_of_inertia (beam_DICT)
+        support_locations_LIST = sorted (beam_DICT ['Supports'])
+        ret_DICT ['support_1'][i] = support_locations_LIST [0]
+        ret_DICT ['support_2'][i] = support_locations_LIST [-1]
+        for j, (coef, location, power) in enumerate (terms_LIST [i]):
+            ret_DICT ['coefs'][i, j] = coef
+            ret_DICT ['locations'][i, j] = location
+            ret_DICT ['powers'][i, j] = power
+    return ret_DICT
+
+
+def analyze_beams (beam_DICTS_LIST:list [dict | Beam], n_stations:int=201) -> list [dict]:
+    '''
+    Analyzes a list of beam dicts (as returned by beams.get_structured_beam_data) and returns a list of result dicts,
+    in the same order, with the same items as beams.get_model_results plus 'Method' ('Closed form' or 'FE').
+    Beams that 'classify_beam' recognises are solved together in closed form; every other beam gets a finite element model.
+    records.Beam objects may be passed instead of dicts.
+    '''
+    beam_DICTS_LIST = [to_beam_dict (beam) for beam in beam_DICTS_LIST]
+    ret_LIST = [None] * len (beam_DICTS_LIST)
+
+    simple_indices_LIST = []
+    simple_layouts_LIST = []
+    for i, beam_DICT in enumerate (beam_DICTS_LIST):
+        layout = classify_beam (beam_DICT)
+        if layout is None:
+            the_model = build_beam (beam_DICT)
+            with profiling.timer (profiling.SOLVE):
+                the_model.analyze ()
+            ret_LIST [i] = get_model_results (the_model) | {'Method': 'FE'}
+        else:
+            simple_indices_LIST.append (i)
+            simple_layouts_LIST.append (layout)
+
+    for start in range (0, len (simple_indices_LIST), BLOCK_SIZE):
+        block_indices_LIST = simple_indices_LIST [start:start + BLOCK_SIZE]
+        block_layouts_LIST = simple_layouts_LIST [start:start + BLOCK_SIZE]
+        packed_DICT = pack_beams ([beam_DICTS_LIST [i] for i in block_indices_LIST], block_layouts_LIST)
+        solved_DICT = solve_simple_beams (**packed_DICT, n_stations=n_stations)
+        for j, i in enumerate (block_indices_LIST):
+            reactions_DICT = {packed_DICT ['support_1'][j].item (): solved_DICT ['R1'][j].item ()}
+            if block_layouts_LIST [j] == SIMPLE:
+                reactions_DICT [packed_DICT ['support_2'][j].item ()] = solved_DICT ['R2'][j].item ()
+            ret_LIST [i] = {
+                'Reactions': reactions_DICT,
+                'Max Moment': solved_DICT ['Max Moment'][j].item (),
+                'Min Moment': solved_DICT ['Min Moment'][j].item (),
+                'Max Shear': solved_DICT ['Max Shear'][j].item (),
+                'Min Shear': solved_DICT ['Min Shear'][j].item (),
+                'Max Deflection': solved_DICT ['Max Deflection'][j].item (),
+                'Min Deflection': solved_DICT ['Min Deflection'][j].item (),
+                'Method': 'Closed form',
+            }
+    return ret_LIST
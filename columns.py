@@ -0,0 +1,213 @@
+import math
+import sys
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator
+import numpy as np
+from eng_module import sections
+from eng_module.load_factors import NBCC_2020_COMBOS, get_factor_matrix
+from eng_module.parsing import BeamFileError, to_floats
+from eng_module.utils import RECORD_DELIMITER, iter_record_rows
+
+# The column file schema, like the beam files (see parsing.py), with records separated by RECORD_DELIMITER lines:
+#   line 1: name
+#   line 2: Length,k,E,I,[A,Fy]                - all numeric, except that E may name a material (giving E and Fy)
+#                                                and I a section (giving A, and the smaller of its Iz and Iy);
+#                                                A is required, given or from a section, and Fy, given or from a steel material,
+#                                                as only steel columns are checked
+#   line 3+: AXIAL,magnitude,case:load_case    - compression is positive
+COLUMN_ATTRIBUTES = ('L', 'k', 'E', 'I', 'A', 'Fy')
+REQUIRED_ATTRIBUTES = 4
+PHI = 0.9 # the resistance factor for steel (CSA S16)
+N = 1.34 # the compressive resistance exponent for hot rolled sections (CSA S16 13.3.1)
+
+
+@dataclass (slots=True)
+class AxialLoad:
+    magnitude: float # compression is positive
+    case: str
+
+
+@dataclass (slots=True)
+class Column:
+    name: str
+    L: float
+    E: float
+    I: float
+    A: float
+    k: float = 1.0
+    Fy: float = math.nan
+    loads: list [AxialLoad] = field (default_factory=list)
+
+
+def parse_column_rows (
+    rows_LIST:list [list [str]],
+    filename:str | None=None,
+    line_numbers_LIST:list [int] | None=None
+) -> Column:
+    '''
+    Parses the rows of one column (see the schema above) into a Column.
+    Raises a parsing.BeamFileError giving the file, line and column of the first problem found.
+    '''
+    if line_numbers_LIST is None:
+        line_numbers_LIST = list (range (1, len (rows_LIST) + 1))
+    if len (rows_LIST) < 2:
+        raise BeamFileError (f"a column needs a name and attribute line, got {len (rows_LIST)} lines", filename, line_numbers_LIST [0] if line_numbers_LIST else None)
+
+    row_LIST, line = rows_LIST [1], line_numbers_LIST [1]
+    if not REQUIRED_ATTRIBUTES <= len (row_LIST) <= len (COLUMN_ATTRIBUTES):
+        raise BeamFileError (f"expected {REQUIRED_ATTRIBUTES} to {len (COLUMN_ATTRIBUTES)} attributes, got {len (row_LIST)}", filename, line)
+    named_DICT = {}
+    given_DICT = {}
+    for i, (attribute, token) in enumerate (zip (COLUMN_ATTRIBUTES, row_LIST)):
+        try:
+            given_DICT [attribute] = float (token)
+        except ValueError:
+            try:
+                if attribute == 'E':
+                    material_DICT = sections.get_material (token)
+                    if material_DICT ['Fy'] is None:
+                        raise BeamFileError (f"the material '{material_DICT ['Name']}' has no Fy: only steel columns can be checked (CSA S16)", filename, line, i + 1)
+                    named_DICT.update (E=material_DICT ['E'], Fy=material_DICT ['Fy'])
+                elif attribute == 'I':
+                    section_DICT = sections.get_section (token)
+                    named_DICT.update (I=min (section_DICT ['Iz'], section_DICT ['Iy']), A=section_DICT ['A'])
+                else:
+                    raise BeamFileError (f"expected a number, got '{token.strip ()}'", filename, line, i + 1)
+            except KeyError as err:
+                raise BeamFileError (err.args [0], filename, line, i + 1) from None
+    named_DICT.update (given_DICT)
+    if 'A' not in named_DICT:
+        raise BeamFileError ("the column needs an A, given or from a section named in place of I", filename, line)
+    if 'Fy' not in named_DICT:
+        raise BeamFileError ("the column needs an Fy, given or from a steel material, for its capacity (CSA S16)", filename, line)
+
+    loads_LIST = []
+    for row_LIST, line in zip (rows_LIST [2:], line_numbers_LIST [2:]):
+        if row_LIST [0].strip ().upper () != 'AXIAL' or len (row_LIST) != 3:
+            raise BeamFileError (f"expected 'AXIAL,magnitude,case:load_case', got '{','.join (row_LIST).strip ()}'", filename, line)
+        _, separator, case = row_LIST [2].partition (':')
+        if not separator:
+            raise BeamFileError (f"expected 'case:load_case', got '{row_LIST [2].strip ()}'", filename, line, 3)
+        loads_LIST.append (AxialLoad (to_floats (row_LIST [1:2], 2, filename, line) [0], case.strip ()))
+    return Column (rows_LIST [0][0], loads=loads_LIST, **named_DICT)
+
+
+def iter_column_records (source:str | IO [str], delimiter:str=RECORD_DELIMITER) -> Iterator [Column]:
+    '''
+    Lazily parses a column file (see the schema above) and yields one Column at a time,
+    with line numbers in any error counted from the start of the whole file.
+    Params:
+    'source' - a filename, '-' for stdin, or an open text file
+    '''
+    if source == '-':
+        yield from _iter_column_records (sys.stdin, '<stdin>', delimiter)
+    elif isinstance (source, str):
+        with open (source, "r", newline='') as csv_file:
+            yield from _iter_column_records (csv_file, source, delimiter)
+    else:
+        yield from _iter_column_records (source, getattr (source, 'name', None), delimiter)
+
+
+def _iter_column_records (csv_file:IO [str], filename:str | None, delimiter:str) -> Iterator [Column]:
+    for rows_LIST, line_numbers_LIST in iter_record_rows (csv_file, delimiter):
+        yield parse_column_rows (rows_LIST, filename, line_numbers_LIST)
+
+
+def to_arrays (columns:Iterable [Column]) -> dict [str, np.ndarray]:
+    '''
+    Returns the attributes of 'columns' as a dict of NumPy arrays (see COLUMN_ATTRIBUTES), one entry per column,
+    ready for the functions below
+    '''
+    columns_LIST = list (columns)
+    ret_DICT = {'names': np.array ([column.name for column in columns_LIST], dtype=object)}
+    for attribute in COLUMN_ATTRIBUTES:
+        ret_DICT [attribute] = np.array ([getattr (column, attribute) for column in columns_LIST], dtype=float)
+    return ret_DICT
+
+
+def euler_buckling_loads (l:np.ndarray, E:np.ndarray, I:np.ndarray, k:np.ndarray) -> np.ndarray:
+    '''
+    Returns the Euler critical load of each column, pi**2 * E * I / (k * l)**2, like beams.euler_buckling_mode
+    but for arrays (or any mix of arrays and scalars that broadcast together)
+    '''
+    return np.pi**2 * np.asarray (E, dtype=float) * I / (np.asarray (k, dtype=float) * l)**2
+
+
+def compressive_resistances (
+    l:np.ndarray,
+    E:np.ndarray,
+    I:np.ndarray,
+    k:np.ndarray,
+    A:np.ndarray,
+    Fy:np.ndarray,
+    phi:float=PHI,
+    n:float=N
+) -> np.ndarray:
+    '''
+    Returns the factored compressive resistance of each column to CSA S16 13.3.1:
+        Cr = phi * A * Fy * (1 + lambda**(2 * n))**(-1 / n), where lambda = sqrt (A * Fy / Pcr) and Pcr is the Euler load
+    The arguments are arrays (or scalars) that broadcast together. A NaN 'Fy' gives a NaN resistance.
+    '''
+    squash_load_ARR = np.asarray (A, dtype=float) * Fy
+    slenderness_ARR = np.sqrt (squash_load_ARR / euler_buckling_loads (l, E, I, k))
+    return phi * squash_load_ARR * (1 + slenderness_ARR**(2 * n))**(-1 / n)
+
+
+def get_factored_loads (columns:Iterable [Column], combos_DICT:dict=NBCC_2020_COMBOS) -> tuple [np.ndarray, list [str]]:
+    '''
+    Returns the largest factored compression on each column over the load combinations in 'combos_DICT',
+    and the name of the combination that gives it. A column with no loads gets 0, and None for its combination.
+    '''
+    columns_LIST = list (columns)
+    case_names_LIST = list (dict.fromkeys (load.case for column in columns_LIST for load in column.loads))
+    case_index_DICT = {case_name: j for j, case_name in enumerate (case_names_LIST)}
+    loads_ARR = np.zeros ((len (columns_LIST), len (case_names_LIST)))
+    for i, column in enumerate (columns_LIST):
+        for load in column.loads:
+            loads_ARR [i, case_index_DICT [load.case]] += load.magnitude
+
+    # (columns x cases) @ (cases x combos)
+    factored_ARR = loads_ARR @ get_factor_matrix (case_names_LIST, combos_DICT).T
+    combo_names_LIST = list (combos_DICT)
+    governing_ARR = factored_ARR.argmax (axis=1)
+    ret_ARR = factored_ARR [np.arange (len (columns_LIST)), governing_ARR]
+    governing_LIST = [combo_names_LIST [j] if column.loads else None for j, column in zip (governing_ARR, columns_LIST)]
+    return ret_ARR, governing_LIST
+
+
+def check_columns (
+    columns:Iterable [Column],
+    combos_DICT:dict=NBCC_2020_COMBOS,
+    phi:float=PHI,
+    n:float=N
+) -> list [dict]:
+    '''
+    Checks every column in one vectorized pass and returns a report, most critical (highest utilization) first:
+    Returns: ret_LIST - ie
+    [{'Name': 'C12', 'Pf': 1.8e6, 'Governing': 'LC2a', 'Pcr': 6.1e6, 'Cr': 1.7e6, 'Utilization': 1.06}, ...]
+    where 'Pf' is the largest factored compression (see get_factored_loads) and 'Utilization' is Pf / Cr.
+    Raises a ValueError if any column has no Fy (so no Cr), rather than leaving it unchecked.
+    '''
+    columns_LIST = list (columns)
+    no_fy_LIST = [column.name for column in columns_LIST if math.isnan (column.Fy)]
+    if no_fy_LIST:
+        raise ValueError (f"These columns have no Fy, so they can't be checked: {no_fy_LIST}")
+    arrays_DICT = to_arrays (columns_LIST)
+    factored_ARR, governing_LIST = get_factored_loads (columns_LIST, combos_DICT)
+    euler_ARR = euler_buckling_loads (arrays_DICT ['L'], arrays_DICT ['E'], arrays_DICT ['I'], arrays_DICT ['k'])
+    resistance_ARR = compressive_resistances (
+        arrays_DICT ['L'], arrays_DICT ['E'], arrays_DICT ['I'], arrays_DICT ['k'], arrays_DICT ['A'], arrays_DICT ['Fy'], phi, n)
+    utilization_ARR = factored_ARR / resistance_ARR
+
+    order_ARR = np.argsort (np.where (np.isnan (utilization_ARR), np.inf, -utilization_ARR), kind='stable')
+    ret_LIST = []
+    for i in order_ARR.tolist ():
+        ret_LIST.append ({
+            'Name': columns_LIST [i].name,
+            'Pf': factored_ARR [i].item (),
+            'Governing': governing_LIST [i],
+            'Pcr': euler_ARR [i].item (),
+            'Cr': resistance_ARR [i].item (),
+            'Utilization': utilization_ARR [i].item (),
+        })
+    return ret_LIST
@@ -0,0 +1,81 @@
+import numpy as np
+from eng_module.beams import build_beam, sample_model_results
+from eng_module.records import Beam, to_beam_dict
+from eng_module.load_factors import NBCC_2020_COMBOS, get_factor_matrix
+
+RESULT_NAMES = ('Moment', 'Shear', 'Deflection')
+
+
+def analyze_load_combinations (
+    beam_DICT:dict | Beam,
+    combos_DICT:dict=NBCC_2020_COMBOS,
+    n_stations:int=101
+) -> dict:
+    '''
+    Analyzes the beam in 'beam_DICT' (as returned by beams.get_structured_beam_data) for every load combination in 'combos_DICT'.
+    Each load case is solved once, with a single factorization of the stiffness matrix, and the combinations
+    are found by superposition of the case results.
+    Returns: ret_DICT - ie
+    {
+        'Name': 'Roof beam',
+        'Cases': ['Dead', 'Live'],
+        'Combos': {'LC1': {'Reactions': {0.0: ..., 4800.0: ...}, 'Max Moment': ..., 'Min Moment': ..., ...}, ...},
+        'Envelope': {'Max Reactions': {0.0: ..., ...}, 'Min Reactions': {...}, 'Max Moment': ..., 'Min Moment': ..., ...},
+        'Governing': {'Max Reactions': {0.0: 'LC2a', ...}, 'Min Reactions': {...}, 'Max Moment': 'LC4c', ...}
+    }
+    Moment, shear and deflection are sampled at 'n_stations' evenly spaced stations (see beams.sample_model_results).
+    A records.Beam may be passed instead of the dict.
+    '''
+    from eng_module.solver import factor_stiffness, solve_load_combos # PyNite and SciPy, only once something is solved
+    beam_DICT = to_beam_dict (beam_DICT)
+    case_names_LIST = list (dict.fromkeys (load_DICT ['Case'] for load_DICT in beam_DICT ['Loads']))
+    factors_ARR = get_factor_matrix (case_names_LIST, combos_DICT)
+    combo_names_LIST = list (combos_DICT)
+
+    the_model = build_beam (beam_DICT, load_cases=True)
+    for case_name in case_names_LIST:
+        the_model.add_load_combo (case_name, {case_name: 1.0})
+    solve_load_combos (the_model, factor_stiffness (the_model))
+
+    support_nodes_LIST = sorted ((node for node in the_model.Nodes.values () if node.support_DY), key=lambda node: node.X)
+    support_locations_LIST = [node.X for node in support_nodes_LIST]
+    case_results_DICT = {
+        'Reactions': np.array ([[node.RxnFY [case_name] for node in support_nodes_LIST] for case_name in case_names_LIST])
+    }
+    samples_DICT = sample_model_results (the_model, n_stations, case_names_LIST)
+    for result_name in RESULT_NAMES:
+        case_results_DICT [result_name] = samples_DICT [result_name]
+
+    # superposition: (combos x cases) @ (cases x supports or stations)
+    combo_results_DICT = {key: factors_ARR @ value for key, value in case_results_DICT.items ()}
+
+    combos_ret_DICT = {}
+    for i, combo_name in enumerate (combo_names_LIST):
+        this_combo_DICT = {'Reactions': dict (zip (support_locations_LIST, combo_results_DICT ['Reactions'][i].tolist ()))}
+        for result_name in RESULT_NAMES:
+            this_combo_DICT [f"Max {result_name}"] = combo_results_DICT [result_name][i].max ().item ()
+            this_combo_DICT [f"Min {result_name}"] = combo_results_DICT [result_name][i].min ().item ()
+        combos_ret_DICT [combo_name] = this_combo_DICT
+
+    envelope_DICT = {}
+    governing_DICT = {}
+    max_reactions_ARR = combo_results_DICT ['Reactions'].argmax (axis=0)
+    min_reactions_ARR = combo_results_DICT ['Reactions'].argmin (axis=0)
+    envelope_DICT ['Max Reactions'] = {loc: combo_results_DICT ['Reactions'][i, j].item () for j, (loc, i) in enumerate (zip (support_locations_LIST, max_reactions_ARR))}
+    envelope_DICT ['Min Reactions'] = {loc: combo_results_DICT ['Reactions'][i, j].item () for j, (loc, i) in enumerate (zip (support_locations_LIST, min_reactions_ARR))}
+    governing_DICT ['Max Reactions'] = {loc: combo_names_LIST [i] for loc, i in zip (support_locations_LIST, max_reactions_ARR)}
+    governing_DICT ['Min Reactions'] = {loc: combo_names_LIST [i] for loc, i in zip (support_locations_LIST, min_reactions_ARR)}
+    for result_name in RESULT_NAMES:
+        for key, pick in ((f"Max {result_name}", max), (f"Min {result_name}", min)):
+            governing_combo = pick (combo_names_LIST, key=lambda combo_name: combos_ret_DICT [combo_name][key])
+            envelope_DICT [key] = combos_ret_DICT [governing_combo][key]
+            governing_DICT [key] = governing_combo
+
+    ret_DICT = {
+        'Name': beam_DICT.get ('Name'),
+        'Cases': case_names_LIST,
+        'Combos': combos_ret_DICT,
+        'Envelope': envelope_DICT,
+        'Governing': governing_DICT,
+    }
+    return ret_DICT
@@ -0,0 +1,192 @@
+import math
+import numpy as np
+from eng_module.beams import build_beam
+from eng_module.planar import shape_functions
+from eng_module.records import Beam, to_beam_dict
+from eng_module.singularity import sample_diagrams
+
+# Moving loads, like an axle train or a set of crane wheels, are lists of (offset, magnitude):
+#   offset    - the axle's location relative to the train's position (usually 0 for the first axle)
+#   magnitude - an 'Fy' load, like the point loads in beams.parse_loads: a downward wheel load is negative
+# A train at position p puts each of its axles at p + offset; axles off the beam carry nothing.
+STEPS_PER_LENGTH = 200 # the default train step is the beam length / STEPS_PER_LENGTH
+
+
+class InfluenceLines:
+    '''
+    Influence lines of a beam (see beams.build_beam; its loads are ignored) for a unit 'Fy' load anywhere along it:
+    the reaction at each support, and the moment and shear at each of 'stations' (by default 'n_stations' evenly spaced
+    stations plus every support). The stiffness matrix of the planar model is factored once, when this is created,
+    and every unit load position after that is a back-substitution, many at a time (see get_lines).
+    The results are exact at every position, however coarse the mesh: the planar model's nodal displacements and
+    reactions are exact for a point load anywhere, and the moments and shears follow from statics.
+    '''
+
+    def __init__ (self, beam:dict | Beam, stations:list [float] | None=None, n_stations:int=21):
+        beam_DICT = dict (to_beam_dict (beam), Loads=[])
+        self.name = beam_DICT.get ('Name')
+        self.model = build_beam (beam_DICT, backend='planar')
+        self.factored = self.model.factor ()
+        self.start = self.model.X [0]
+        self.end = self.model.X [-1]
+        self.supports = self.model.X [self.model.support_DY]
+        if stations is None:
+            stations = np.concatenate ([np.linspace (self.start, self.end, n_stations), self.supports])
+        self.stations = np.unique (np.asarray (stations, dtype=float))
+        if self.stations.size == 0 or self.stations [0] < self.start or self.stations [-1] > self.end:
+            raise ValueError (f"The stations must be on the beam, from {self.start} to {self.end}")
+
+    def unit_loads (self, positions:np.ndarray) -> np.ndarray:
+        '''
+        Returns the equivalent nodal loads of a unit 'Fy' point load at each of 'positions' (all on the beam),
+        as an array of shape (number of DOFs, number of positions)
+        '''
+        X = self.model.X
+        l = np.diff (X)
+        e = np.clip (np.searchsorted (X, positions, side='right') - 1, 0, len (l) - 1)
+        ret_ARR = np.zeros ((2 * len (X), len (positions)))
+        dofs = 2 * e [:, None] + np.arange (4)
+        ret_ARR [dofs, np.arange (len (positions)) [:, None]] = shape_functions ((positions - X [e]) / l [e], l [e])
+        return ret_ARR
+
+    def get_lines (self, positions:np.ndarray) -> dict:
+        '''
+        Returns the influence lines for a unit 'Fy' load at each of 'positions', all solved together:
+        Returns: ret_DICT - ie
+        {
+            'Reactions': <the reaction at each support, shape (number of positions, number of supports)>,
+            'Moment': <the moment at each station, shape (number of positions, number of stations)>,
+            'Shear': <the shear just to the right of each station, same shape>,
+            'Shear Left': <the shear just to the left of each station, same shape>
+        }
+        The shear at the start of the beam has no left side, nor the shear at the end a right side; both sides are the same there.
+        A position off the beam gives zeros.
+        '''
+        positions = np.asarray (positions, dtype=float)
+        tolerance = 1e-9 * max (abs (self.end), 1.0)
+        on_ARR = (positions >= self.start - tolerance) & (positions <= self.end + tolerance)
+        on_positions = np.clip (positions [on_ARR], self.start, self.end)
+        D, R = self.model.solve (self.factored, self.unit_loads (on_positions))
+
+        n_positions = len (on_positions)
+        X = self.model.X
+        force_coefs = np.concatenate ([np.ones ((n_positions, 1)), R [0::2].T], axis=1)
+        force_locations = np.concatenate ([on_positions [:, None], np.broadcast_to (X, (n_positions, len (X)))], axis=1)
+        force_powers = np.zeros (force_coefs.shape, dtype=int)
+        x = np.broadcast_to (self.stations, (n_positions, len (self.stations)))
+        diagrams_LIST = [
+            sample_diagrams (x, self.start, force_coefs, force_locations, force_powers, R [1::2].T,
+                np.broadcast_to (X, (n_positions, len (X))), D [0], D [1], self.model.E * self.model.I, left_limit)
+            for left_limit in (False, True)]
+        shear_ARR = diagrams_LIST [0]['Shear']
+        shear_left_ARR = diagrams_LIST [1]['Shear']
+        at_start = self.stations == self.start
+        at_end = self.stations == self.end
+        shear_left_ARR [:, at_start] = shear_ARR [:, at_start]
+        shear_ARR [:, at_end] = shear_left_ARR [:, at_end]
+
+        lines_DICT = {
+            'Reactions': R [0::2][self.model.support_DY].T,
+            'Moment': diagrams_LIST [0]['Moment'],
+            'Shear': shear_ARR,
+            'Shear Left': shear_left_ARR,
+        }
+        ret_DICT = {}
+        for name, lines_ARR in lines_DICT.items ():
+            ret_DICT [name] = np.zeros ((len (positions), lines_ARR.shape [1]))
+            ret_DICT [name][on_ARR] = lines_ARR
+        return ret_DICT
+
+    def get_positions (self, offsets_ARR:np.ndarray, step:float | None=None) -> np.ndarray:
+        '''
+        Returns the train positions to check: every 'step' (by default the beam length / STEPS_PER_LENGTH) from where
+        the train first touches the beam to where it leaves it, plus every position that puts an axle on a station or a support,
+        where the peaks of the piecewise linear influence lines of a statically determinate beam are
+        '''
+        first = self.start - offsets_ARR.max ()
+        last = self.end - offsets_ARR.min ()
+        step = step if step is not None else (self.end - self.start) / STEPS_PER_LENGTH
+        if step <= 0:
+            raise ValueError (f"step must be positive, got {step}")
+        grid_ARR = np.linspace (first, last, math.ceil ((last - first) / step) + 1)
+        critical_ARR = (np.concatenate ([self.stations, self.supports]) [:, None] - offsets_ARR [None, :]).ravel ()
+        critical_ARR = critical_ARR [(critical_ARR >= first) & (critical_ARR <= last)]
+        return np.unique (np.concatenate ([grid_ARR, critical_ARR]))
+
+    def get_effects (self, axles_LIST:list [tuple [float, float]], positions:np.ndarray) -> dict:
+        '''
+        Returns the reactions, moments and shears (see get_lines) under the moving load 'axles_LIST' at each train position in 'positions',
+        each an array of shape (number of positions, number of supports or stations). Every axle location is solved once,
+        in one call to get_lines, and the effects are the influence lines shifted by each axle's offset, scaled by its
+        magnitude and summed: a discrete convolution of the influence lines with the train.
+        '''
+        offsets_ARR, magnitudes_ARR = _to_axle_arrays (axles_LIST)
+        positions = np.asarray (positions, dtype=float)
+        locations_ARR = positions [:, None] + offsets_ARR [None, :]
+        unique_ARR, index_ARR = np.unique (locations_ARR, return_inverse=True)
+        index_ARR = index_ARR.reshape (locations_ARR.shape)
+
+        ret_DICT = {}
+        for name, lines_ARR in self.get_lines (unique_ARR).items ():
+            ret_DICT [name] = np.einsum ('pas,a->ps', lines_ARR [index_ARR], magnitudes_ARR)
+        return ret_DICT
+
+    def envelope (self, axles_LIST:list [tuple [float, float]], step:float | None=None) -> dict:
+        '''
+        Moves 'axles_LIST' across the beam (see get_positions) and returns the governing envelope at each station and support,
+        with the train position that gives each value:
+        Returns: ret_DICT - ie
+        {
+            'Stations': array ([0.0, 500.0, ...]),
+            'Max Moment': array ([...]), 'Max Moment At': array ([...]), 'Min Moment': ..., 'Min Moment At': ...,
+            'Max Shear': ..., 'Max Shear At': ..., 'Min Shear': ..., 'Min Shear At': ...,    # either side of the station
+            'Max Reactions': {0.0: 81000.0, 6000.0: ...}, 'Min Reactions': {0.0: -3200.0, 6000.0: ...}
+        }
+        A train that can travel either way round should also be run with its offsets negated.
+        '''
+        offsets_ARR, _ = _to_axle_arrays (axles_LIST)
+        positions = self.get_positions (offsets_ARR, step)
+        effects_DICT = self.get_effects (axles_LIST, positions)
+        # the shear on both sides of each station, side by side
+        effects_DICT ['Shear'] = np.concatenate ([effects_DICT ['Shear'], effects_DICT.pop ('Shear Left')], axis=1)
+
+        n_stations = len (self.stations)
+        ret_DICT = {'Stations': self.stations}
+        for name, effects_ARR in effects_DICT.items ():
+            for extreme, pick in (('Max', np.argmax), ('Min', np.argmin)):
+                best_ARR = pick (effects_ARR, axis=0)
+                values_ARR = effects_ARR [best_ARR, np.arange (effects_ARR.shape [1])]
+                at_ARR = positions [best_ARR]
+                if name == 'Shear':
+                    side_ARR = pick (np.stack ([values_ARR [:n_stations], values_ARR [n_stations:]]), axis=0)
+                    values_ARR = np.where (side_ARR, values_ARR [n_stations:], values_ARR [:n_stations])
+                    at_ARR = np.where (side_ARR, at_ARR [n_stations:], at_ARR [:n_stations])
+                if name == 'Reactions':
+                    ret_DICT [f"{extreme} Reactions"] = dict (zip (self.supports.tolist (), values_ARR.tolist ()))
+                else:
+                    ret_DICT [f"{extreme} {name}"] = values_ARR
+                    ret_DICT [f"{extreme} {name} At"] = at_ARR
+        return ret_DICT
+
+
+def _to_axle_arrays (axles_LIST:list [tuple [float, float]]) -> tuple [np.ndarray, np.ndarray]:
+    if not axles_LIST:
+        raise ValueError ('A moving load needs at least one axle')
+    axles_ARR = np.asarray (axles_LIST, dtype=float).reshape (-1, 2)
+    return axles_ARR [:, 0], axles_ARR [:, 1]
+
+
+def moving_load_envelope (
+    beam:dict | Beam,
+    axles_LIST:list [tuple [float, float]],
+    stations:list [float] | None=None,
+    n_stations:int=21,
+    step:float | None=None
+) -> dict:
+    '''
+    Returns the governing envelope of the moving load 'axles_LIST' (see the top of this module) on 'beam'
+    (see InfluenceLines.envelope), in one pass instead of one analysis per position.
+    Example, a three axle truck, first axle 4.3 m ahead of the second and 4.3 m ahead of the third, in N and mm:
+        moving_load_envelope (beam_DICT, [(0.0, -35000.0), (-4300.0, -145000.0), (-8600.0, -145000.0)])
+    '''
+    return InfluenceLines (beam, stations, n_stations).envelope (axles_LIST, step)
@@ -1,3 +1,9 @@
+from typing import TYPE_CHECKING
+
+# NumPy is only imported by get_factor_matrix, so that the load factors stay quick to import (see benchmarks/bench_import.py)
+if TYPE_CHECKING:
+    import numpy as np
+
 NBCC_2020_COMBOS = {
     "LC1": {"D": 1.4},
     "LC2a": {"D": 1.25, "L": 1.5},
@@ -12,4 +18,49 @@ NBCC_2020_COMBOS = {
     "LC4b": {"D": 1.25, "W": 1.4, "L": 0.5},
     "LC4c": {"D": 0.9, "W": 1.4},
     "LC4d": {"D": 0.9, "W": 1.4, "L": 0.5},
-}
\ No newline at end of file
+}
+
+
+# The load case names used in beam files, and the load symbols they stand for in the combinations above
+LOAD_CASE_SYMBOLS = {
+    "DEAD": "D",
+    "LIVE": "L",
+    "SNOW": "S",
+    "WIND": "W",
+}
+
+
+def get_case_symbol (case_name:str) -> str:
+    '''
+    Returns the load symbol ('D', 'L', 'S' or 'W') for the load case 'case_name' (ie 'Live' or 'L'; case is ignored).
+    Raises a ValueError for a case that isn't used by the load combinations.
+    '''
+    this_case = case_name.strip ().upper ()
+    if this_case in LOAD_CASE_SYMBOLS.values ():
+        return this_case
+    if this_case in LOAD_CASE_SYMBOLS:
+        return LOAD_CASE_SYMBOLS [this_case]
+    raise ValueError (f"Unknown load case '{case_name}'; expected one of {list (LOAD_CASE_SYMBOLS)} or {list (LOAD_CASE_SYMBOLS.values ())}")
+
+
+def get_factor_matrix (case_names_LIST:list [str], combos_DICT:dict=NBCC_2020_COMBOS) -> 'np.ndarray':
+    '''
+    Returns the load factors as an array of shape (number of combos, number of cases), so that the results
+    for every combination are this matrix times the stacked results of each load case on its own.
+    A case that a combination doesn't mention gets a factor of 0.
+    '''
+    import numpy as np
+    symbols_LIST = [get_case_symbol (case_name) for case_name in case_names_LIST]
+    ret_ARR = np.zeros ((len (combos_DICT), len (case_names_LIST)))
+    for i, factors_DICT in enumerate (combos_DICT.values ()):
+        for j, symbol in enumerate (symbols_LIST):
+            ret_ARR [i, j] = factors_DICT.get (symbol, 0.0)
+    return ret_ARR
+
+
+# The unfactored (specified) load combinations that deflections are checked for (see serviceability.py)
+SERVICE_COMBOS = {
+    "L": {"L": 1.0},
+    "S": {"S": 1.0},
+    "D+L": {"D": 1.0, "L": 1.0},
+}
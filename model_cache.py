@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from PyNite import FEModel3D
+from eng_module.beams import add_loads, build_beam, get_model_results, get_moment_of_inertia
+from eng_module.records import Beam, to_beam_dict
+from eng_module.solver import factor_stiffness, solve_load_combos
+
+
+def get_template_key (beam_DICT:dict, load_cases:bool=False) -> tuple:
+    '''
+    Returns the signature of everything in 'beam_DICT' that the stiffness matrix depends on: the length, section,
+    material and supports. With 'load_cases', the load case names are part of it too, as each becomes a load combination.
+    Two beams with the same key only differ in their loads.
+    '''
+    ret_TUPLE = (
+        beam_DICT ['L'],
+        beam_DICT ['E'],
+        get_moment_of_inertia (beam_DICT),
+        beam_DICT ['A'],
+        beam_DICT ['J'],
+        beam_DICT ['nu'],
+        beam_DICT ['rho'],
+        tuple (sorted (beam_DICT ['Supports'].items ())),
+    )
+    if load_cases:
+        ret_TUPLE += (tuple (dict.fromkeys (load_DICT ['Case'] for load_DICT in beam_DICT ['Loads'])),)
+    return ret_TUPLE
+
+
+class ModelTemplateCache:
+    '''
+    Keeps up to 'max_entries' beam models, each with its stiffness matrix already assembled and factored (see solver.factor_stiffness),
+    keyed on the geometry, section and supports (see get_template_key). A beam with the same key as one seen before
+    only needs its loads swapped in and a back-substitution, rather than a new model.
+    The least recently used template is dropped once 'max_entries' is reached. 'hits', 'misses' and 'evictions' count what happened.
+    '''
+
+    def __init__ (self, max_entries:int=128):
+        self.max_entries = max_entries
+        self.templates_DICT = OrderedDict ()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__ (self) -> int:
+        return len (self.templates_DICT)
+
+    def clear (self) -> None:
+        self.templates_DICT.clear ()
+
+    def get_template (self, beam_DICT:dict | Beam, load_cases:bool=False) -> tuple [FEModel3D, dict]:
+        '''
+        Returns the (model, factored stiffness) template for the geometry of 'beam_DICT', building it on a miss.
+        The template's model has no loads; with 'load_cases', it has a load combination named after each load case.
+        '''
+        beam_DICT = to_beam_dict (beam_DICT)
+        key = get_template_key (beam_DICT, load_cases)
+        template_TUPLE = self.templates_DICT.get (key)
+        if template_TUPLE is not None:
+            self.hits += 1
+            self.templates_DICT.move_to_end (key)
+            return template_TUPLE
+
+        self.misses += 1
+        the_model = build_beam (dict (beam_DICT, Loads=[]), load_cases)
+        if load_cases:
+            for case_name in key [-1]:
+                the_model.add_load_combo (case_name, {case_name: 1.0})
+        template_TUPLE = (the_model, factor_stiffness (the_model))
+        self.templates_DICT [key] = template_TUPLE
+        while len (self.templates_DICT) > self.max_entries:
+            self.templates_DICT.popitem (last=False)
+            self.evictions += 1
+        return template_TUPLE
+
+    def solve (self, beam_DICT:dict | Beam, load_cases:bool=False) -> FEModel3D:
+        '''
+        Returns a solved model of 'beam_DICT', like build_beam followed by analyze_linear, but reusing the template for its geometry.
+        The model belongs to the cache: it is reloaded and re-solved by the next call for a beam with the same geometry,
+        so take what is needed from it (ie with beams.get_model_results) before then.
+        '''
+        beam_DICT = to_beam_dict (beam_DICT)
+        the_model, factored_DICT = self.get_template (beam_DICT, load_cases)
+        the_model.delete_loads ()
+        add_loads (the_model, beam_DICT ['Loads'], load_cases)
+        return solve_load_combos (the_model, factored_DICT)
+
+    def analyze (self, beam_DICT:dict | Beam, combo_name:str='Combo 1') -> dict:
+        '''
+        Solves 'beam_DICT' with all of its loads in the default case and returns beams.get_model_results for 'combo_name'
+        '''
+        return get_model_results (self.solve (beam_DICT), combo_name)
@@ -0,0 +1,120 @@
+import numpy as np
+from eng_module.beams import build_beam, get_model_results, get_moment_of_inertia
+from eng_module.combos import analyze_load_combinations
+from eng_module.records import Beam, to_beam_dict
+from eng_module.sections import Catalogue, get_catalogue
+
+DEFLECTION_LIMIT = 360 # the allowable deflection is L / DEFLECTION_LIMIT
+PHI = 0.9 # the resistance factor for bending, for both steel (CSA S16) and timber (CSA O86)
+MAX_SOLVES = 8
+
+
+def get_moment_resistances (section_ARR:np.ndarray, depth_ARR:np.ndarray, strength:float, phi:float=PHI) -> np.ndarray:
+    '''
+    Returns the factored moment resistance, phi * F * S, of each section with moments of inertia 'section_ARR'
+    and depths 'depth_ARR', where S = Iz / (d / 2) and 'strength' is the material's Fy or fb
+    '''
+    return phi * strength * 2 * section_ARR / depth_ARR
+
+
+def get_demands (beam_DICT:dict, combos_DICT:dict | None=None, backend:str='pynite') -> tuple [float, float, int]:
+    '''
+    Analyzes 'beam_DICT' as it is and returns (the largest moment, the largest deflection, the number of solves).
+    The moment is the envelope of 'combos_DICT' (see combos.analyze_load_combinations) if given;
+    otherwise both come from the loads as they are, all acting together.
+    '''
+    the_model = build_beam (beam_DICT, backend=backend)
+    the_model.analyze (check_stability=False)
+    results_DICT = get_model_results (the_model)
+    deflection = max (abs (results_DICT ['Max Deflection']), abs (results_DICT ['Min Deflection']))
+    if combos_DICT is None:
+        return max (abs (results_DICT ['Max Moment']), abs (results_DICT ['Min Moment'])), deflection, 1
+    envelope_DICT = analyze_load_combinations (beam_DICT, combos_DICT) ['Envelope']
+    return max (abs (envelope_DICT ['Max Moment']), abs (envelope_DICT ['Min Moment'])), deflection, 2
+
+
+def optimize_beam (
+    beam_DICT:dict | Beam,
+    table:str='steel',
+    material:str='350W',
+    family:str | None=None,
+    deflection_limit:float=DEFLECTION_LIMIT,
+    combos_DICT:dict | None=None,
+    phi:float=PHI,
+    backend:str='pynite',
+    catalogue:Catalogue | None=None,
+    max_solves:int=MAX_SOLVES
+) -> dict:
+    '''
+    Returns the lightest section in the catalogue's 'table' (ie 'steel' or 'timber', only from 'family' if given) of 'material'
+    for which the beam in 'beam_DICT' (as returned by beams.get_structured_beam_data) passes both:
+        the strength check - the largest moment <= phi * F * S (F is the material's Fy or fb)
+        the deflection check - the largest deflection <= L / 'deflection_limit'
+    The beam is one member of constant section, so its moments don't depend on the section at all, and its deflections
+    are inversely proportional to Iz. So the beam is analyzed once as it is; the smallest Iz that passes the deflection check
+    follows from scaling, and a binary search of the table's sorted Iz index gives the sections with at least that Iz.
+    The lightest of those that is strong enough is analyzed once more to confirm it; should it fail,
+    the next lightest is tried, up to 'max_solves' analyses in all.
+    Returns: ret_DICT - ie
+    {'Name': 'Roof beam', 'Section': 'W310x39', 'Mass': 38.7, 'Moment Utilization': 0.84, 'Deflection Utilization': 0.97, 'Solves': 2}
+    'Section' is None (and the utilizations are NaN) if no section in the table is adequate.
+    '''
+    beam_DICT = to_beam_dict (beam_DICT)
+    the_catalogue = catalogue if catalogue is not None else get_catalogue ()
+    the_table = the_catalogue.tables_DICT [table]
+    material_DICT = the_catalogue.get_material (material)
+    strength = material_DICT ['Fy'] if material_DICT ['Fy'] is not None else material_DICT ['fb']
+    beam_DICT = dict (beam_DICT, E=material_DICT ['E'], nu=material_DICT ['nu'], rho=material_DICT ['rho'])
+    allowable = beam_DICT ['L'] / deflection_limit
+
+    moment, deflection, n_solves = get_demands (beam_DICT, combos_DICT, backend)
+    required_Iz = get_moment_of_inertia (beam_DICT) * deflection / allowable
+
+    rows_ARR, sorted_ARR, _ = the_table.get_index ('Iz', family)
+    rows_ARR = rows_ARR [np.searchsorted (sorted_ARR, required_Iz, side='left'):]
+    Iz_ARR = the_table.values_ARR [rows_ARR, the_table.column_DICT ['Iz']]
+    depth_ARR = the_table.values_ARR [rows_ARR, the_table.column_DICT ['d']]
+    rows_ARR = rows_ARR [get_moment_resistances (Iz_ARR, depth_ARR, strength, phi) >= moment]
+    mass_ARR = the_table.values_ARR [rows_ARR, the_table.column_DICT ['mass']]
+    candidates_ARR = rows_ARR [np.argsort (mass_ARR, kind='stable')]
+
+    ret_DICT = {'Name': beam_DICT.get ('Name'), 'Section': None, 'Mass': np.nan, 'Moment Utilization': np.nan, 'Deflection Utilization': np.nan}
+    for i in candidates_ARR:
+        if n_solves >= max_solves:
+            break
+        section_DICT = the_table.get (the_table.names_LIST [i])
+        this_beam_DICT = dict (beam_DICT, Iz=section_DICT ['Iz'], Iy=section_DICT ['Iy'], A=section_DICT ['A'], J=section_DICT ['J'])
+        this_beam_DICT.pop ('I', None)
+        the_model = build_beam (this_beam_DICT, backend=backend)
+        the_model.analyze (check_stability=False)
+        n_solves += 1
+        results_DICT = get_model_results (the_model)
+        this_deflection = max (abs (results_DICT ['Max Deflection']), abs (results_DICT ['Min Deflection']))
+        resistance = get_moment_resistances (section_DICT ['Iz'], section_DICT ['d'], strength, phi)
+        if this_deflection <= allowable * (1 + 1e-9):
+            ret_DICT.update ({
+                'Section': section_DICT ['Name'],
+                'Mass': section_DICT ['mass'],
+                'Moment Utilization': moment / resistance,
+                'Deflection Utilization': this_deflection / allowable,
+            })
+            break
+    ret_DICT ['Solves'] = n_solves
+    return ret_DICT
+
+
+def optimize_beams (beams_LIST:list [dict | Beam], **kwargs) -> list [dict]:
+    '''
+    Runs optimize_beam (with 'kwargs') on each beam in 'beams_LIST' and returns its result, with an 'Error' item added:
+    None, or the error that stopped that beam from being sized
+    '''
+    ret_LIST = []
+    for beam_DICT in beams_LIST:
+        beam_DICT = to_beam_dict (beam_DICT)
+        try:
+            row_DICT = optimize_beam (beam_DICT, **kwargs)
+            row_DICT ['Error'] = None
+        except Exception as err:
+            row_DICT = {'Name': beam_DICT.get ('Name'), 'Section': None, 'Error': f"{type (err).__name__}: {err}"}
+        ret_LIST.append (row_DICT)
+    return ret_LIST
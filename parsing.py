@@ -0,0 +1,195 @@
+import csv
+import sys
+from typing import IO, Iterator
+from eng_module.utils import RECORD_DELIMITER, iter_record_rows
+from eng_module import profiling
+
+# The beam file schema:
+#   line 1: name
+#   line 2: Length,E,Iz,[Iy,A,J,nu,rho]                              - all numeric, except that E may name a material
+#                                                                      and Iz a section (see sections.NAMED_ATTRIBUTES)
+#   line 3: support_loc:support_type, ...                            - numeric location, type token
+#   line 4+: POINT:direction,magnitude,location,case:load_case       - 2 numeric columns
+#            DIST:direction,w1,w2,x1,x2,case:load_case               - 4 numeric columns
+ATTRIBUTE_NAMES = ('L', 'E', 'Iz', 'Iy', 'A', 'J', 'nu', 'rho')
+REQUIRED_ATTRIBUTES = 3
+NAMED_ATTRIBUTES = ('E', 'Iz') # the attributes that may be given by name (see sections.NAMED_ATTRIBUTES)
+LOAD_SCHEMAS = {
+    'POINT': ('Point', ('Magnitude', 'Location')),
+    'DIST': ('Dist', ('Start Magnitude', 'End Magnitude', 'Start Location', 'End Location')),
+}
+
+
+class BeamFileError (ValueError):
+    '''
+    Raised for malformed beam file data. 'filename', 'line' and 'column' (1-based, counting csv fields) locate the problem,
+    where they are known.
+    '''
+
+    def __init__ (self, message:str, filename:str | None=None, line:int | None=None, column:int | None=None):
+        self.message = message
+        self.filename = filename
+        self.line = line
+        self.column = column
+        where = '' if filename is None else str (filename)
+        if line is not None:
+            where = f"{where}:{line}" if where else f"line {line}"
+        if column is not None:
+            where = f"{where}, column {column}" if where else f"column {column}"
+        super ().__init__ (f"{where}: {message}" if where else message)
+
+
+def to_floats (row_LIST:list [str], first_column:int, filename:str | None, line:int | None) -> list [float]:
+    '''
+    Converts every item of 'row_LIST' to a float in one go; only if that fails are they checked one by one to find the bad column.
+    Raises a BeamFileError for the first item that isn't a number, with 'first_column' as the column of the first item.
+    '''
+    try:
+        return list (map (float, row_LIST))
+    except ValueError:
+        for i, token in enumerate (row_LIST):
+            try:
+                float (token)
+            except ValueError:
+                raise BeamFileError (f"expected a number, got '{token.strip ()}'", filename, line, first_column + i) from None
+        raise
+
+
+def parse_attribute_row (row_LIST:list [str], filename:str | None=None, line:int | None=None) -> dict:
+    '''
+    Parses the attribute row (Length,E,Iz,[Iy,A,J,nu,rho]) into a dict, giving the same result as beams.parse_beam_attributes
+    '''
+    if not REQUIRED_ATTRIBUTES <= len (row_LIST) <= len (ATTRIBUTE_NAMES):
+        raise BeamFileError (f"expected {REQUIRED_ATTRIBUTES} to {len (ATTRIBUTE_NAMES)} attributes, got {len (row_LIST)}", filename, line)
+    try:
+        values_LIST = to_floats (row_LIST, 1, filename, line)
+    except BeamFileError as err:
+        if ATTRIBUTE_NAMES [err.column - 1] not in NAMED_ATTRIBUTES:
+            raise
+        return _parse_named_attribute_row (row_LIST, filename, line)
+    ret_DICT = dict.fromkeys (ATTRIBUTE_NAMES, 1)
+    ret_DICT.update (zip (ATTRIBUTE_NAMES, values_LIST))
+    return ret_DICT
+
+
+def _parse_named_attribute_row (row_LIST:list [str], filename:str | None, line:int | None) -> dict:
+    '''
+    parse_attribute_row for a row that names a material in place of E, or a section in place of Iz (see sections.resolve_attribute).
+    The numbers given in the row take precedence over the named properties.
+    '''
+    from eng_module import sections # only needed (and its tables only loaded) for rows like this
+    ret_DICT = dict.fromkeys (ATTRIBUTE_NAMES, 1)
+    given_DICT = {}
+    for i, (attribute, token) in enumerate (zip (ATTRIBUTE_NAMES, row_LIST)):
+        try:
+            given_DICT [attribute] = float (token)
+        except ValueError:
+            if attribute not in NAMED_ATTRIBUTES:
+                raise BeamFileError (f"expected a number, got '{token.strip ()}'", filename, line, i + 1) from None
+            try:
+                ret_DICT.update (sections.resolve_attribute (attribute, token))
+            except KeyError as err:
+                raise BeamFileError (err.args [0], filename, line, i + 1) from None
+    ret_DICT.update (given_DICT)
+    return ret_DICT
+
+
+def parse_support_row (row_LIST:list [str], filename:str | None=None, line:int | None=None) -> dict [float, str]:
+    '''
+    Parses the supports row (support_loc:support_type, ...) into a dict, giving the same result as beams.parse_supports
+    '''
+    ret_DICT = {}
+    for i, token in enumerate (row_LIST):
+        location, separator, support_type = token.partition (':')
+        if not separator:
+            raise BeamFileError (f"expected 'location:type', got '{token.strip ()}'", filename, line, i + 1)
+        try:
+            ret_DICT [float (location)] = support_type.strip ()
+        except ValueError:
+            raise BeamFileError (f"expected a number for the support location, got '{location.strip ()}'", filename, line, i + 1) from None
+    return ret_DICT
+
+
+def parse_load_row (row_LIST:list [str], filename:str | None=None, line:int | None=None) -> dict:
+    '''
+    Parses one load row (POINT:... or DIST:...) into a dict, giving the same result as beams.parse_loads
+    '''
+    load_type, separator, direction = row_LIST [0].partition (':')
+    load_type = load_type.strip ().upper ()
+    if not separator or load_type not in LOAD_SCHEMAS:
+        raise BeamFileError (f"expected 'POINT:direction' or 'DIST:direction', got '{row_LIST [0].strip ()}'", filename, line, 1)
+    type_name, value_names = LOAD_SCHEMAS [load_type]
+    if len (row_LIST) != len (value_names) + 2:
+        raise BeamFileError (f"a {load_type} load needs {len (value_names) + 2} columns, got {len (row_LIST)}", filename, line)
+
+    case_token = row_LIST [-1]
+    _, separator, case = case_token.partition (':')
+    if not separator:
+        raise BeamFileError (f"expected 'case:load_case', got '{case_token.strip ()}'", filename, line, len (row_LIST))
+
+    ret_DICT = {'Type': type_name, 'Direction': direction.strip ()}
+    ret_DICT.update (zip (value_names, to_floats (row_LIST [1:-1], 2, filename, line)))
+    ret_DICT ['Case'] = case.strip ()
+    return ret_DICT
+
+
+@profiling.timed (profiling.PARSE)
+def parse_beam_rows (
+    rows_LIST:list [list [str]],
+    filename:str | None=None,
+    line_numbers_LIST:list [int] | None=None
+) -> dict:
+    '''
+    Parses the rows of one beam (as read by utils.read_csv_file) into the same dict as beams.get_structured_beam_data,
+    knowing from the schema which columns are numeric instead of trying every token as a float.
+    Raises a BeamFileError giving the file, line and column of the first problem found.
+    Params:
+    'filename' - only used in error messages
+    'line_numbers_LIST' - the line number of each row, if they don't simply start at 1
+    '''
+    if line_numbers_LIST is None:
+        line_numbers_LIST = list (range (1, len (rows_LIST) + 1))
+    if len (rows_LIST) < 3:
+        raise BeamFileError (f"a beam needs a name, attribute and support line, got {len (rows_LIST)} lines", filename, line_numbers_LIST [0] if line_numbers_LIST else None)
+
+    ret_DICT = {'Name': rows_LIST [0][0]}
+    ret_DICT.update (parse_attribute_row (rows_LIST [1], filename, line_numbers_LIST [1]))
+    ret_DICT ['Supports'] = parse_support_row (rows_LIST [2], filename, line_numbers_LIST [2])
+    ret_DICT ['Loads'] = [parse_load_row (row_LIST, filename, line) for row_LIST, line in zip (rows_LIST [3:], line_numbers_LIST [3:])]
+    return ret_DICT
+
+
+def parse_beam_file (the_filename:str) -> dict:
+    '''
+    Reads and parses a single-beam file (see parse_beam_rows)
+    '''
+    with open (the_filename, "r", newline='') as csv_file:
+        rows_LIST = []
+        line_numbers_LIST = []
+        csv_reader = csv.reader (csv_file)
+        for row_LIST in csv_reader:
+            if row_LIST:
+                rows_LIST.append (row_LIST)
+                line_numbers_LIST.append (csv_reader.line_num)
+    return parse_beam_rows (rows_LIST, the_filename, line_numbers_LIST)
+
+
+def iter_beam_records (source:str | IO [str], delimiter:str=RECORD_DELIMITER) -> Iterator [dict]:
+    '''
+    Lazily parses a multi-beam file (see utils.iter_csv_records) and yields one beam dict at a time,
+    with line numbers in any error counted from the start of the whole file.
+    Params:
+    'source' - a filename, '-' for stdin, or an open text file
+    '''
+    if source == '-':
+        yield from _iter_beam_records (sys.stdin, '<stdin>', delimiter)
+    elif isinstance (source, str):
+        with open (source, "r", newline='') as csv_file:
+            yield from _iter_beam_records (csv_file, source, delimiter)
+    else:
+        yield from _iter_beam_records (source, getattr (source, 'name', None), delimiter)
+
+
+def _iter_beam_records (csv_file:IO [str], filename:str | None, delimiter:str) -> Iterator [dict]:
+    for rows_LIST, line_numbers_LIST in iter_record_rows (csv_file, delimiter):
+        yield parse_beam_rows (rows_LIST, filename, line_numbers_LIST)
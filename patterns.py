@@ -0,0 +1,169 @@
+import numpy as np
+from eng_module.beams import build_beam, is_planar_model, sample_model_results
+from eng_module.combos import RESULT_NAMES
+from eng_module.load_factors import NBCC_2020_COMBOS, get_case_symbol, get_factor_matrix
+from eng_module.records import Beam, to_beam_dict
+from eng_module.solver import factor_stiffness, solve_load_combos
+
+# The load symbols (see load_factors.LOAD_CASE_SYMBOLS) whose loads are patterned: each span's share may be on or off,
+# whichever is worse, independently of the other spans
+PATTERNED_SYMBOLS = ('L',)
+
+
+def get_spans (beam_DICT:dict | Beam) -> list [tuple [float, float]]:
+    '''
+    Returns the spans of a beam, the (start, end) of each stretch between its supports, from left to right,
+    with any overhang beyond the first or last support as a span of its own
+    '''
+    beam_DICT = to_beam_dict (beam_DICT)
+    boundaries_LIST = sorted ({0.0, beam_DICT ['L'], *beam_DICT ['Supports']})
+    return list (zip (boundaries_LIST [:-1], boundaries_LIST [1:]))
+
+
+def split_load (load_DICT:dict, spans_LIST:list [tuple [float, float]]) -> list [tuple [int, dict]]:
+    '''
+    Splits a load (as returned by beams.parse_loads) into its share on each span in 'spans_LIST' (see get_spans),
+    as (span index, load dict). A point load on a support goes to the span on its right (or the last span);
+    a distributed load keeps its linear variation across the spans it covers.
+    '''
+    starts_ARR = np.array ([start for start, _ in spans_LIST])
+    if load_DICT ['Type'] == 'Point':
+        i = int (np.clip (np.searchsorted (starts_ARR, load_DICT ['Location'], side='right') - 1, 0, len (spans_LIST) - 1))
+        return [(i, load_DICT)]
+
+    w1 = load_DICT ['Start Magnitude']
+    w2 = load_DICT ['End Magnitude']
+    x1 = load_DICT ['Start Location']
+    x2 = load_DICT ['End Location']
+    ret_LIST = []
+    for i, (start, end) in enumerate (spans_LIST):
+        a = max (start, x1)
+        b = min (end, x2)
+        if b > a:
+            ret_LIST.append ((i, load_DICT | {
+                'Start Magnitude': w1 + (w2 - w1) * (a - x1) / (x2 - x1),
+                'End Magnitude': w1 + (w2 - w1) * (b - x1) / (x2 - x1),
+                'Start Location': a,
+                'End Location': b,
+            }))
+    return ret_LIST
+
+
+def analyze_pattern_loading (
+    beam_DICT:dict | Beam,
+    combos_DICT:dict=NBCC_2020_COMBOS,
+    patterned:tuple [str, ...]=PATTERNED_SYMBOLS,
+    n_stations:int=101,
+    backend:str='pynite'
+) -> dict:
+    '''
+    Analyzes the beam in 'beam_DICT' for every load combination in 'combos_DICT', like combos.analyze_load_combinations,
+    but with the loads of the 'patterned' load symbols on whichever spans (see get_spans) are adverse.
+    Each patterned load case is split by span (see split_load) and every piece is solved as a load case of its own, with
+    a single factorization of the stiffness matrix, so the cost grows with the number of spans rather than 2**spans.
+    Then, for each combination and each station (or support), a span's piece is counted only if its factored result has the sign
+    of the extreme sought, which gives the exact maximum and minimum over every on/off pattern of the spans.
+    Returns: ret_DICT - ie
+    {
+        'Name': 'Floor beam',
+        'Cases': ['Dead', 'Live'],
+        'Spans': [(0.0, 4000.0), (4000.0, 9000.0), (9000.0, 10000.0)],
+        'Combos': {'LC2a': {'Max Reactions': {0.0: ..., ...}, 'Min Reactions': {...}, 'Max Moment': ..., 'Min Moment': ..., ...}, ...},
+        'Envelope': {'Max Reactions': {0.0: ..., ...}, 'Min Reactions': {...}, 'Max Moment': ..., 'Min Moment': ..., ...},
+        'Governing': {'Max Reactions': {0.0: 'LC2a', ...}, 'Min Reactions': {...}, 'Max Moment': 'LC2c', ...},
+        'Loaded Spans': {'Max Moment': {'Live': [0, 2]}, ...},   # the patterned pieces that are on for each 'Envelope' value
+        'Stations': array ([0.0, 100.0, ...]),
+        'Diagrams': {'Max Moment': array ([...]), 'Min Moment': array ([...]), ...}   # the envelope over the combinations at each station
+    }
+    Moment, shear and deflection are sampled at 'n_stations' evenly spaced stations (see beams.sample_model_results).
+    'Loaded Spans' isn't given for the reactions.
+    '''
+    beam_DICT = to_beam_dict (beam_DICT)
+    spans_LIST = get_spans (beam_DICT)
+    case_names_LIST = list (dict.fromkeys (load_DICT ['Case'] for load_DICT in beam_DICT ['Loads']))
+
+    # the loads of the fixed cases stay as they are; each patterned case becomes a case per span that it loads
+    pieces_DICT = {}
+    for load_DICT in beam_DICT ['Loads']:
+        if get_case_symbol (load_DICT ['Case']) in patterned:
+            for i, piece_DICT in split_load (load_DICT, spans_LIST):
+                pieces_DICT.setdefault ((load_DICT ['Case'], i), []).append (piece_DICT | {'Case': f"{load_DICT ['Case']} @ {i}"})
+        else:
+            pieces_DICT.setdefault ((load_DICT ['Case'], None), []).append (load_DICT)
+    fixed_LIST = [key for key in pieces_DICT if key [1] is None]
+    pattern_LIST = [key for key in pieces_DICT if key [1] is not None]
+    solved_LIST = fixed_LIST + pattern_LIST
+    solved_names_LIST = [case_name if i is None else f"{case_name} @ {i}" for case_name, i in solved_LIST]
+
+    the_model = build_beam (beam_DICT | {'Loads': [piece_DICT for key in solved_LIST for piece_DICT in pieces_DICT [key]]}, load_cases=True, backend=backend)
+    for case_name in solved_names_LIST:
+        the_model.add_load_combo (case_name, {case_name: 1.0})
+    if is_planar_model (the_model):
+        the_model.analyze ()
+        support_locations_LIST = the_model.X [the_model.support_DY].tolist ()
+        case_results_DICT = {'Reactions': np.array ([the_model.RxnFY [case_name][the_model.support_DY] for case_name in solved_names_LIST])}
+    else:
+        solve_load_combos (the_model, factor_stiffness (the_model))
+        support_nodes_LIST = sorted ((node for node in the_model.Nodes.values () if node.support_DY), key=lambda node: node.X)
+        support_locations_LIST = [node.X for node in support_nodes_LIST]
+        case_results_DICT = {'Reactions': np.array ([[node.RxnFY [case_name] for node in support_nodes_LIST] for case_name in solved_names_LIST])}
+    samples_DICT = sample_model_results (the_model, n_stations, solved_names_LIST)
+    for result_name in RESULT_NAMES:
+        case_results_DICT [result_name] = samples_DICT [result_name]
+
+    # the fixed cases by superposition, (combos x cases) @ (cases x supports or stations), then each patterned piece,
+    # factored, (combos x pieces x supports or stations), counted only where it makes things worse
+    fixed_factors_ARR = get_factor_matrix ([case_name for case_name, _ in fixed_LIST], combos_DICT)
+    pattern_factors_ARR = get_factor_matrix ([case_name for case_name, _ in pattern_LIST], combos_DICT)
+    n_fixed = len (fixed_LIST)
+    max_DICT = {}
+    min_DICT = {}
+    adverse_DICT = {}
+    for key, results_ARR in case_results_DICT.items ():
+        fixed_ARR = fixed_factors_ARR @ results_ARR [:n_fixed]
+        pieces_ARR = pattern_factors_ARR [:, :, None] * results_ARR [None, n_fixed:]
+        max_DICT [key] = fixed_ARR + np.clip (pieces_ARR, 0.0, None).sum (axis=1)
+        min_DICT [key] = fixed_ARR + np.clip (pieces_ARR, None, 0.0).sum (axis=1)
+        adverse_DICT [key] = (pieces_ARR > 0, pieces_ARR < 0)
+
+    combo_names_LIST = list (combos_DICT)
+    combos_ret_DICT = {combo_name: {} for combo_name in combo_names_LIST}
+    envelope_DICT = {}
+    governing_DICT = {}
+    loaded_DICT = {}
+    diagrams_DICT = {}
+    for key in case_results_DICT:
+        for extreme, extremes_ARR, pick, adverse_ARR in (('Max', max_DICT [key], np.argmax, adverse_DICT [key][0]), ('Min', min_DICT [key], np.argmin, adverse_DICT [key][1])):
+            if key == 'Reactions':
+                name = f"{extreme} Reactions"
+                best_ARR = pick (extremes_ARR, axis=0)
+                for i, combo_name in enumerate (combo_names_LIST):
+                    combos_ret_DICT [combo_name][name] = dict (zip (support_locations_LIST, extremes_ARR [i].tolist ()))
+                envelope_DICT [name] = {loc: extremes_ARR [i, j].item () for j, (loc, i) in enumerate (zip (support_locations_LIST, best_ARR))}
+                governing_DICT [name] = {loc: combo_names_LIST [i] for loc, i in zip (support_locations_LIST, best_ARR)}
+                continue
+            name = f"{extreme} {key}"
+            for i, combo_name in enumerate (combo_names_LIST):
+                combos_ret_DICT [combo_name][name] = extremes_ARR [i, pick (extremes_ARR [i])].item ()
+            i, j = np.unravel_index (pick (extremes_ARR), extremes_ARR.shape)
+            envelope_DICT [name] = extremes_ARR [i, j].item ()
+            governing_DICT [name] = combo_names_LIST [i]
+            loaded_DICT [name] = {}
+            for (case_name, span), is_on in zip (pattern_LIST, adverse_ARR [i, :, j].tolist ()):
+                loaded_DICT [name].setdefault (case_name, [])
+                if is_on:
+                    loaded_DICT [name][case_name].append (span)
+            diagrams_DICT [name] = extremes_ARR.max (axis=0) if extreme == 'Max' else extremes_ARR.min (axis=0)
+
+    ret_DICT = {
+        'Name': beam_DICT.get ('Name'),
+        'Cases': case_names_LIST,
+        'Spans': spans_LIST,
+        'Combos': combos_ret_DICT,
+        'Envelope': envelope_DICT,
+        'Governing': governing_DICT,
+        'Loaded Spans': loaded_DICT,
+        'Stations': samples_DICT ['x'],
+        'Diagrams': diagrams_DICT,
+    }
+    return ret_DICT
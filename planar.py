@@ -0,0 +1,270 @@
+import math
+import numpy as np
+from scipy.linalg import LinAlgError, cho_solve_banded, cholesky_banded
+from eng_module.singularity import get_load_terms, sample_diagrams
+from eng_module import profiling
+
+# 3 Gauss-Legendre points on [0, 1]; enough to integrate the cubic shape functions times a linearly varying load exactly
+GAUSS_POINTS = (np.array ([-math.sqrt (3 / 5), 0.0, math.sqrt (3 / 5)]) + 1) / 2
+GAUSS_WEIGHTS = np.array ([5.0, 8.0, 5.0]) / 18
+
+# number of bands above the diagonal of the stiffness matrix, with the DOFs ordered DY0, RZ0, DY1, RZ1, ...
+UPPER_BANDS = 3
+
+
+def shape_functions (xi:np.ndarray, l:np.ndarray) -> np.ndarray:
+    '''
+    Returns the cubic (Hermite) shape functions of a beam element of length 'l' at 'xi' (0 at the i-node, 1 at the j-node),
+    for the DOFs (DY i, RZ i, DY j, RZ j), as an array of shape xi.shape + (4,)
+    '''
+    xi = np.asarray (xi, dtype=float)
+    l = np.broadcast_to (l, xi.shape)
+    ret_ARR = np.stack ([
+        1 - 3 * xi**2 + 2 * xi**3,
+        l * (xi - 2 * xi**2 + xi**3),
+        3 * xi**2 - 2 * xi**3,
+        l * (xi**3 - xi**2),
+    ], axis=-1)
+    return ret_ARR
+
+
+def element_stiffness (E:float, I:float, l:np.ndarray) -> np.ndarray:
+    '''
+    Returns the Euler-Bernoulli stiffness matrices of beam elements of lengths 'l', shape (n_elements, 4, 4)
+    '''
+    l = np.asarray (l, dtype=float)
+    k = E * I / l**3
+    ret_ARR = np.empty ((len (l), 4, 4))
+    ret_ARR [:, 0] = np.stack ([12 * k, 6 * l * k, -12 * k, 6 * l * k], axis=-1)
+    ret_ARR [:, 1] = np.stack ([6 * l * k, 4 * l**2 * k, -6 * l * k, 2 * l**2 * k], axis=-1)
+    ret_ARR [:, 2] = -ret_ARR [:, 0]
+    ret_ARR [:, 3] = np.stack ([6 * l * k, 2 * l**2 * k, -6 * l * k, 4 * l**2 * k], axis=-1)
+    return ret_ARR
+
+
+class PlanarBeam:
+    '''
+    A straight beam along the X axis, analyzed as a 2D Euler-Bernoulli beam with two DOFs per node, the deflection (DY)
+    and the rotation (RZ). Its stiffness matrix is banded, so it's solved with a banded Cholesky factorization
+    whose cost grows linearly with the number of nodes; 'factor' and 'solve' expose it for many load vectors at once.
+    It's the 'planar' backend of beams.build_beam, and stands in for an FEModel3D there: add_load_combo, analyze,
+    beams.get_model_results and beams.sample_model_results work the same way, with the same sign conventions.
+    Only 'Fy' loads can be carried, and supports can't settle.
+    '''
+
+    def __init__ (self, node_locations_LIST:list [float], E:float, I:float, supports_DICT:dict [float, str]):
+        self.X = np.asarray (node_locations_LIST, dtype=float)
+        self.E = E
+        self.I = I
+        self.support_DY = np.zeros (len (self.X), dtype=bool)
+        self.support_RZ = np.zeros (len (self.X), dtype=bool)
+        for support_location, support_type in supports_DICT.items ():
+            i = int (np.argmin (np.abs (self.X - support_location)))
+            if not math.isclose (self.X [i], support_location, abs_tol=1e-9 * max (abs (self.X [-1]), 1.0)):
+                raise ValueError (f"There's no node at the support at {support_location}")
+            if support_type in ('P', 'R', 'F'):
+                self.support_DY [i] = True
+            if support_type == 'F':
+                self.support_RZ [i] = True
+
+        self.Loads = {} # load case name: a list of load dicts (as returned by beams.parse_loads)
+        self.LoadCombos = {} # load combination name: {load case name: factor}
+        self.DY = {} # the results, by load combination name: an array with a value for each node
+        self.RZ = {}
+        self.RxnFY = {}
+        self.RxnMZ = {}
+        self.solution = None
+
+    def add_load_combo (self, name:str, factors:dict [str, float]) -> None:
+        self.LoadCombos [name] = dict (factors)
+
+    def add_loads (self, loads_LIST:list [dict], load_cases:bool=False) -> None:
+        '''
+        Adds the loads in 'loads_LIST' (as returned by beams.parse_loads), like beams.add_loads does for an FEModel3D.
+        Raises a ValueError for a load in any direction but 'Fy'.
+        '''
+        for load_DICT in loads_LIST:
+            if load_DICT ['Direction'] not in ('Fy', 'FY'):
+                raise ValueError (f"A PlanarBeam can only carry 'Fy' loads, got '{load_DICT ['Direction']}'")
+            case = load_DICT ['Case'] if load_cases else 'Case 1'
+            self.Loads.setdefault (case, []).append (load_DICT)
+
+    def delete_loads (self) -> None:
+        self.Loads = {}
+        self.DY, self.RZ, self.RxnFY, self.RxnMZ = {}, {}, {}, {}
+        self.solution = None
+
+    def element_loads (self, loads_LIST:list [dict]) -> np.ndarray:
+        '''
+        Returns the equivalent nodal loads of 'loads_LIST' as a vector with a value for each DOF
+        '''
+        l = np.diff (self.X)
+        ret_ARR = np.zeros (2 * len (self.X))
+        for load_DICT in loads_LIST:
+            if load_DICT ['Type'] == 'Point':
+                x = load_DICT ['Location']
+                e = min (max (int (np.searchsorted (self.X, x, side='right')) - 1, 0), len (l) - 1)
+                ret_ARR [2 * e:2 * e + 4] += load_DICT ['Magnitude'] * shape_functions ((x - self.X [e]) / l [e], l [e])
+            else:
+                w1 = load_DICT ['Start Magnitude']
+                w2 = load_DICT ['End Magnitude']
+                x1 = load_DICT ['Start Location']
+                x2 = load_DICT ['End Location']
+                # the part of the load on each element, integrated with Gauss points
+                a = np.maximum (self.X [:-1], x1)
+                b = np.minimum (self.X [1:], x2)
+                elements = np.nonzero (b > a) [0]
+                a = a [elements]
+                b = b [elements]
+                x = a [:, None] + (b - a) [:, None] * GAUSS_POINTS [None, :]
+                w = w1 + (w2 - w1) * (x - x1) / (x2 - x1)
+                N = shape_functions ((x - self.X [elements, None]) / l [elements, None], l [elements, None])
+                f = np.einsum ('eg,g,egk->ek', w * (b - a) [:, None], GAUSS_WEIGHTS, N)
+                dofs = 2 * elements [:, None] + np.arange (4)
+                np.add.at (ret_ARR, dofs, f)
+        return ret_ARR
+
+    def factor (self) -> dict:
+        '''
+        Assembles the banded stiffness matrix, with every supported DOF fixed at 0, and returns its Cholesky factorization:
+        {
+            'k': <the element stiffness matrices, see element_stiffness>,
+            'Supported': <a bool for each DOF>,
+            'Cholesky': <the upper bands of the factor, for scipy.linalg.cho_solve_banded>
+        }
+        It depends only on the beam and its supports, so any number of load vectors can be solved with it (see 'solve').
+        Raises an Exception if the beam is unstable.
+        '''
+        n_dofs = 2 * len (self.X)
+        l = np.diff (self.X)
+        k = element_stiffness (self.E, self.I, l)
+
+        # the upper bands: K [i, j] is K_banded [UPPER_BANDS + i - j, j]
+        K_banded = np.zeros ((UPPER_BANDS + 1, n_dofs))
+        for a in range (4):
+            for b in range (a, 4):
+                K_banded [UPPER_BANDS + a - b, 2 * np.arange (len (l)) + b] += k [:, a, b]
+
+        # each supported DOF is fixed at 0 by replacing its row and column with the identity, which keeps the band
+        supported_ARR = np.empty (n_dofs, dtype=bool)
+        supported_ARR [0::2] = self.support_DY
+        supported_ARR [1::2] = self.support_RZ
+        for i in np.nonzero (supported_ARR) [0]:
+            K_banded [:UPPER_BANDS, i] = 0.0
+            for offset in range (1, UPPER_BANDS + 1):
+                if i + offset < n_dofs:
+                    K_banded [UPPER_BANDS - offset, i + offset] = 0.0
+            K_banded [UPPER_BANDS, i] = 1.0
+        try:
+            cholesky_ARR = cholesky_banded (K_banded, check_finite=False)
+        except LinAlgError:
+            raise Exception ('The stiffness matrix is singular, which implies rigid body motion. The structure is unstable. Aborting analysis.')
+
+        ret_DICT = {
+            'k': k,
+            'Supported': supported_ARR,
+            'Cholesky': cholesky_ARR,
+        }
+        return ret_DICT
+
+    def solve (self, factored_DICT:dict, F:np.ndarray) -> tuple [np.ndarray, np.ndarray]:
+        '''
+        Solves the load vectors 'F' (shape (number of DOFs, number of load vectors), see element_loads)
+        with the factorization from 'factor', and returns the displacements and the reactions, both of the same shape as 'F'
+        '''
+        supported_ARR = factored_DICT ['Supported']
+        k = factored_DICT ['k']
+        D = cho_solve_banded ((factored_DICT ['Cholesky'], False), np.where (supported_ARR [:, None], 0.0, F), check_finite=False)
+
+        # reactions = K D - F at the supported DOFs, with K applied element by element
+        element_dofs = 2 * np.arange (len (k)) [:, None] + np.arange (4)
+        KD = np.zeros_like (D)
+        np.add.at (KD, element_dofs, np.einsum ('eab,ebc->eac', k, D [element_dofs]))
+        R = np.where (supported_ARR [:, None], KD - F, 0.0)
+        return D, R
+
+    @profiling.timed (profiling.SOLVE)
+    def analyze (self, *args, **kwargs) -> None:
+        '''
+        Solves every load combination (adding PyNite's default 'Combo 1' of 'Case 1' if there are none).
+        Takes, and ignores, FEModel3D.analyze's arguments, so it can be called the same way.
+        Raises an Exception if the beam is unstable.
+        '''
+        if not self.LoadCombos:
+            self.add_load_combo ('Combo 1', {'Case 1': 1.0})
+        n_dofs = 2 * len (self.X)
+        factored_DICT = self.factor ()
+
+        case_names_LIST = list (self.Loads)
+        F_cases = np.zeros ((n_dofs, len (case_names_LIST)))
+        for j, case_name in enumerate (case_names_LIST):
+            F_cases [:, j] = self.element_loads (self.Loads [case_name])
+        factors_ARR = np.array ([[factors_DICT.get (case_name, 0.0) for case_name in case_names_LIST] for factors_DICT in self.LoadCombos.values ()])
+        F = F_cases @ factors_ARR.T if case_names_LIST else np.zeros ((n_dofs, len (self.LoadCombos)))
+        D, R = self.solve (factored_DICT, F)
+
+        for j, combo_name in enumerate (self.LoadCombos):
+            self.DY [combo_name] = D [0::2, j]
+            self.RZ [combo_name] = D [1::2, j]
+            self.RxnFY [combo_name] = R [0::2, j]
+            self.RxnMZ [combo_name] = R [1::2, j]
+        self.solution = 'Linear'
+
+    analyze_linear = analyze
+
+    def sample (self, x:np.ndarray, combo_names_LIST:list [str], left_limit:bool=False) -> dict:
+        '''
+        Returns the shear, moment and deflection at the stations 'x' (shape (n_stations,)) for each load combination
+        in 'combo_names_LIST' (see singularity.sample_diagrams), each an array of shape (number of combos, n_stations)
+        '''
+        terms_DICT = {case_name: get_load_terms (loads_LIST) for case_name, loads_LIST in self.Loads.items ()}
+        force_terms_LIST = []
+        for combo_name in combo_names_LIST:
+            factors_DICT = self.LoadCombos [combo_name]
+            this_combo_LIST = [(coef * factor, location, power) for case_name, factor in factors_DICT.items () for coef, location, power in terms_DICT.get (case_name, [])]
+            this_combo_LIST.extend (zip (self.RxnFY [combo_name], self.X, [0] * len (self.X)))
+            force_terms_LIST.append (this_combo_LIST)
+        n_terms = max (len (terms_LIST) for terms_LIST in force_terms_LIST)
+        force_ARR = np.zeros ((len (combo_names_LIST), n_terms, 3))
+        for i, terms_LIST in enumerate (force_terms_LIST):
+            force_ARR [i, :len (terms_LIST)] = terms_LIST
+
+        n_combos = len (combo_names_LIST)
+        ret_DICT = sample_diagrams (
+            np.broadcast_to (x, (n_combos, len (x))),
+            self.X [0],
+            force_ARR [:, :, 0],
+            force_ARR [:, :, 1],
+            force_ARR [:, :, 2].astype (int),
+            np.array ([self.RxnMZ [combo_name] for combo_name in combo_names_LIST]),
+            np.broadcast_to (self.X, (n_combos, len (self.X))),
+            np.array ([self.DY [combo_name][0] for combo_name in combo_names_LIST]),
+            np.array ([self.RZ [combo_name][0] for combo_name in combo_names_LIST]),
+            self.E * self.I,
+            left_limit)
+        return ret_DICT
+
+    def get_results (self, combo_name:str='Combo 1', n_stations:int=201) -> dict:
+        '''
+        Returns the same summary as beams.get_model_results. The extremes are taken from 'n_stations' evenly spaced stations
+        plus every node and load location, on both sides of any step.
+        '''
+        locations_LIST = [location for loads_LIST in self.Loads.values () for _, location, _ in get_load_terms (loads_LIST)]
+        x = np.unique (np.concatenate ([np.linspace (self.X [0], self.X [-1], n_stations), self.X, np.clip (locations_LIST, self.X [0], self.X [-1])]))
+        right_DICT = self.sample (x, [combo_name])
+        left_DICT = self.sample (x, [combo_name], left_limit=True)
+        # the left limit at the start and the right limit at the end are outside the beam
+        shear_ARR = np.concatenate ([right_DICT ['Shear'][0, :-1], left_DICT ['Shear'][0, 1:]])
+        moment_ARR = np.concatenate ([right_DICT ['Moment'][0, :-1], left_DICT ['Moment'][0, 1:]])
+        deflection_ARR = right_DICT ['Deflection'][0]
+
+        ret_DICT = {
+            'Reactions': {x: R for x, R in zip (self.X [self.support_DY].tolist (), self.RxnFY [combo_name][self.support_DY].tolist ())},
+            'Max Moment': moment_ARR.max ().item (),
+            'Min Moment': moment_ARR.min ().item (),
+            'Max Shear': shear_ARR.max ().item (),
+            'Min Shear': shear_ARR.min ().item (),
+            'Max Deflection': deflection_ARR.max ().item (),
+            'Min Deflection': deflection_ARR.min ().item (),
+        }
+        return ret_DICT
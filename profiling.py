@@ -0,0 +1,148 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator
+
+# The stages of the pipeline that are timed
+PARSE = 'parse'
+BUILD = 'build'
+SOLVE = 'solve'
+EXTRACT = 'extract'
+
+# The profiler collecting timings, if any. While it's None, timers and counters cost a global lookup and nothing else.
+_active_profiler = None
+_NULL_TIMER = nullcontext ()
+
+
+class Profiler:
+    '''
+    Collects the time spent in each pipeline stage (see 'timer' and 'timed') and any counters (see 'count')
+    while it's active, i.e. inside a 'with' block:
+
+        with profiling.Profiler () as the_profiler:
+            ... # parse, build, solve
+        the_profiler.dump_json ("profile.json")
+        the_profiler.dump_chrome_trace ("trace.json") # for chrome://tracing or Perfetto
+
+    With 'trace' set, every timed call is also kept as an event for the Chrome trace, up to 'max_events' of them.
+    '''
+
+    def __init__ (self, trace:bool=True, max_events:int=1_000_000):
+        self.trace = trace
+        self.max_events = max_events
+        self.stages_DICT = {} # stage: [number of calls, total seconds]
+        self.counters_DICT = {}
+        self.events_LIST = [] # (stage, start, seconds, thread id)
+        self.dropped_events = 0
+        self.start = time.perf_counter ()
+        self._lock = threading.Lock ()
+        self._previous_profiler = None
+
+    def __enter__ (self) -> 'Profiler':
+        global _active_profiler
+        self._previous_profiler = _active_profiler
+        _active_profiler = self
+        return self
+
+    def __exit__ (self, *exc_info) -> None:
+        global _active_profiler
+        _active_profiler = self._previous_profiler
+        self._previous_profiler = None
+
+    @contextmanager
+    def timer (self, stage:str) -> Iterator [None]:
+        start = time.perf_counter ()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter () - start
+            with self._lock:
+                totals_LIST = self.stages_DICT.setdefault (stage, [0, 0.0])
+                totals_LIST [0] += 1
+                totals_LIST [1] += seconds
+                if self.trace:
+                    if len (self.events_LIST) < self.max_events:
+                        self.events_LIST.append ((stage, start, seconds, threading.get_ident ()))
+                    else:
+                        self.dropped_events += 1
+
+    def count (self, name:str, n:int=1) -> None:
+        with self._lock:
+            self.counters_DICT [name] = self.counters_DICT.get (name, 0) + n
+
+    def to_dict (self) -> dict:
+        '''
+        Returns: ret_DICT - ie
+        {
+            'stages': {'parse': {'calls': 120, 'seconds': 0.031}, 'build': {...}, ...},
+            'counters': {'nodes': 480, ...},
+            'wall seconds': 1.52 # since the profiler was created
+        }
+        '''
+        ret_DICT = {
+            'stages': {stage: {'calls': calls, 'seconds': seconds} for stage, (calls, seconds) in self.stages_DICT.items ()},
+            'counters': dict (self.counters_DICT),
+            'wall seconds': time.perf_counter () - self.start,
+        }
+        return ret_DICT
+
+    def to_chrome_trace (self) -> dict:
+        '''
+        Returns the timed calls in the Chrome trace event format, as complete ('X') events in microseconds,
+        with the counters' totals as counter ('C') events at the end
+        '''
+        pid = os.getpid ()
+        events_LIST = [
+            {'name': stage, 'cat': 'eng_module', 'ph': 'X', 'ts': (start - self.start) * 1e6, 'dur': seconds * 1e6, 'pid': pid, 'tid': tid}
+            for stage, start, seconds, tid in self.events_LIST]
+        end = max ((event_DICT ['ts'] + event_DICT ['dur'] for event_DICT in events_LIST), default=0.0)
+        for name, value in self.counters_DICT.items ():
+            events_LIST.append ({'name': name, 'ph': 'C', 'ts': end, 'pid': pid, 'args': {name: value}})
+        return {'traceEvents': events_LIST, 'displayTimeUnit': 'ms'}
+
+    def dump_json (self, the_filename:str) -> None:
+        with open (the_filename, "w") as json_file:
+            json.dump (self.to_dict (), json_file, indent=2)
+
+    def dump_chrome_trace (self, the_filename:str) -> None:
+        with open (the_filename, "w") as json_file:
+            json.dump (self.to_chrome_trace (), json_file)
+
+
+def get_active_profiler () -> Profiler | None:
+    return _active_profiler
+
+
+def timer (stage:str):
+    '''
+    Returns a context manager timing its block as 'stage' of the active profiler, or one that does nothing if there isn't one
+    '''
+    if _active_profiler is None:
+        return _NULL_TIMER
+    return _active_profiler.timer (stage)
+
+
+def count (name:str, n:int=1) -> None:
+    '''
+    Adds 'n' to the counter 'name' of the active profiler, if there is one
+    '''
+    if _active_profiler is not None:
+        _active_profiler.count (name, n)
+
+
+def timed (stage:str) -> Callable:
+    '''
+    A decorator timing every call of the function as 'stage' of the active profiler, if there is one
+    '''
+    def decorator (function:Callable) -> Callable:
+        @functools.wraps (function)
+        def wrapper (*args, **kwargs):
+            if _active_profiler is None:
+                return function (*args, **kwargs)
+            with _active_profiler.timer (stage):
+                return function (*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,295 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+SUPPORT_TYPES = ('P', 'R', 'F')
+LOAD_DIRECTIONS = ('Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz', 'FX', 'FY', 'FZ', 'MX', 'MY', 'MZ')
+POINT = 0
+DIST = 1
+
+
+@dataclass (slots=True)
+class Support:
+    location: float
+    type: str # 'P' (pin), 'R' (roller) or 'F' (fixed)
+
+
+@dataclass (slots=True)
+class PointLoad:
+    direction: str
+    magnitude: float
+    location: float
+    case: str
+
+    def to_dict (self) -> dict:
+        '''
+        Returns the load in the format produced by beams.parse_loads
+        '''
+        return {'Type': 'Point', 'Direction': self.direction, 'Magnitude': self.magnitude, 'Location': self.location, 'Case': self.case}
+
+
+@dataclass (slots=True)
+class DistLoad:
+    direction: str
+    start_magnitude: float
+    end_magnitude: float
+    start_location: float
+    end_location: float
+    case: str
+
+    def to_dict (self) -> dict:
+        '''
+        Returns the load in the format produced by beams.parse_loads
+        '''
+        return {
+            'Type': 'Dist',
+            'Direction': self.direction,
+            'Start Magnitude': self.start_magnitude,
+            'End Magnitude': self.end_magnitude,
+            'Start Location': self.start_location,
+            'End Location': self.end_location,
+            'Case': self.case}
+
+
+@dataclass (slots=True)
+class Beam:
+    name: str
+    L: float
+    E: float
+    Iz: float
+    Iy: float = 1
+    A: float = 1
+    J: float = 1
+    nu: float = 1
+    rho: float = 1
+    supports: list [Support] = field (default_factory=list)
+    loads: list [PointLoad | DistLoad] = field (default_factory=list)
+
+    @classmethod
+    def from_dict (cls, beam_DICT:dict) -> 'Beam':
+        '''
+        Returns a Beam from a dict in the format produced by beams.get_structured_beam_data.
+        Its Iz is the moment of inertia that beams.build_beam would use for the dict: 'I', 'Iz', 'Ix' or 'Iy', whichever
+        comes first (the same order as beams.get_moment_of_inertia).
+        '''
+        moment_names_LIST = [name for name in ('I', 'Iz', 'Ix', 'Iy') if name in beam_DICT]
+        return cls (
+            name=beam_DICT ['Name'],
+            L=beam_DICT ['L'],
+            E=beam_DICT ['E'],
+            Iz=beam_DICT [moment_names_LIST [0]] if moment_names_LIST else 1,
+            Iy=beam_DICT.get ('Iy', 1),
+            A=beam_DICT.get ('A', 1),
+            J=beam_DICT.get ('J', 1),
+            nu=beam_DICT.get ('nu', 1),
+            rho=beam_DICT.get ('rho', 1),
+            supports=[Support (location, support_type) for location, support_type in beam_DICT ['Supports'].items ()],
+            loads=[load_from_dict (load_DICT) for load_DICT in beam_DICT ['Loads']])
+
+    def to_dict (self) -> dict:
+        '''
+        Returns the beam in the format produced by beams.get_structured_beam_data (and expected by beams.build_beam)
+        '''
+        return {
+            'Name': self.name,
+            'L': self.L,
+            'E': self.E,
+            'Iz': self.Iz,
+            'Iy': self.Iy,
+            'A': self.A,
+            'J': self.J,
+            'nu': self.nu,
+            'rho': self.rho,
+            'Supports': {support.location: support.type for support in self.supports},
+            'Loads': [load.to_dict () for load in self.loads]}
+
+
+def load_from_dict (load_DICT:dict) -> PointLoad | DistLoad:
+    '''
+    Returns a PointLoad or DistLoad from a load dict in the format produced by beams.parse_loads
+    '''
+    if load_DICT ['Type'] == 'Point':
+        return PointLoad (load_DICT ['Direction'], load_DICT ['Magnitude'], load_DICT ['Location'], load_DICT ['Case'])
+    elif load_DICT ['Type'] == 'Dist':
+        return DistLoad (
+            load_DICT ['Direction'],
+            load_DICT ['Start Magnitude'],
+            load_DICT ['End Magnitude'],
+            load_DICT ['Start Location'],
+            load_DICT ['End Location'],
+            load_DICT ['Case'])
+    raise ValueError (f"Unknown load type '{load_DICT ['Type']}'")
+
+
+def to_beam (beam:Beam | dict) -> Beam:
+    '''
+    Returns 'beam' as a Beam, converting it first if it is a dict
+    '''
+    if isinstance (beam, Beam):
+        return beam
+    return Beam.from_dict (beam)
+
+
+def to_beam_dict (beam:Beam | dict) -> dict:
+    '''
+    Returns 'beam' as a dict, converting it first if it is a Beam
+    '''
+    if isinstance (beam, Beam):
+        return beam.to_dict ()
+    return beam
+
+
+class BeamSet:
+    '''
+    A columnar (struct of arrays) store for large numbers of beams.
+    Every attribute is a NumPy array with one entry per beam; the supports and loads of all the beams are
+    stored end to end in their own arrays, with 'support_offsets'/'load_offsets' marking where each beam's rows start,
+    ie beam i's supports are rows support_offsets [i] to support_offsets [i + 1].
+    Load directions, support types and load cases are stored as small integer codes.
+    Point loads keep their magnitude and location in the 'start' columns (and repeat them in the 'end' columns).
+    '''
+    ATTRIBUTES = ('L', 'E', 'Iz', 'Iy', 'A', 'J', 'nu', 'rho')
+
+    def __init__ (self, beams:Iterable [Beam | dict]=()):
+        import numpy as np # only imported here, so that the records themselves stay cheap to import
+        self.names = []
+        self.case_names = []
+        case_codes_DICT = {}
+
+        attributes_DICT = {name: array ('d') for name in self.ATTRIBUTES}
+        support_offsets = array ('q', [0])
+        support_location = array ('d')
+        support_type = array ('B')
+        load_offsets = array ('q', [0])
+        load_type = array ('B')
+        load_direction = array ('B')
+        load_case = array ('H')
+        start_magnitude = array ('d')
+        end_magnitude = array ('d')
+        start_location = array ('d')
+        end_location = array ('d')
+
+        for beam in beams:
+            beam = to_beam (beam)
+            self.names.append (beam.name)
+            for name in self.ATTRIBUTES:
+                attributes_DICT [name].append (getattr (beam, name))
+            for support in beam.supports:
+                support_location.append (support.location)
+                support_type.append (SUPPORT_TYPES.index (support.type))
+            support_offsets.append (len (support_location))
+            for load in beam.loads:
+                if load.case not in case_codes_DICT:
+                    case_codes_DICT [load.case] = len (self.case_names)
+                    self.case_names.append (load.case)
+                load_case.append (case_codes_DICT [load.case])
+                load_direction.append (LOAD_DIRECTIONS.index (load.direction))
+                if isinstance (load, PointLoad):
+                    load_type.append (POINT)
+                    start_magnitude.append (load.magnitude)
+                    end_magnitude.append (load.magnitude)
+                    start_location.append (load.location)
+                    end_location.append (load.location)
+                else:
+                    load_type.append (DIST)
+                    start_magnitude.append (load.start_magnitude)
+                    end_magnitude.append (load.end_magnitude)
+                    start_location.append (load.start_location)
+                    end_location.append (load.end_location)
+            load_offsets.append (len (load_type))
+
+        for name in self.ATTRIBUTES:
+            setattr (self, name, np.frombuffer (attributes_DICT [name], dtype=np.float64))
+        self.support_offsets = np.frombuffer (support_offsets, dtype=np.int64)
+        self.support_location = np.frombuffer (support_location, dtype=np.float64)
+        self.support_type = np.frombuffer (support_type, dtype=np.uint8)
+        self.load_offsets = np.frombuffer (load_offsets, dtype=np.int64)
+        self.load_type = np.frombuffer (load_type, dtype=np.uint8)
+        self.load_direction = np.frombuffer (load_direction, dtype=np.uint8)
+        self.load_case = np.frombuffer (load_case, dtype=np.uint16)
+        self.start_magnitude = np.frombuffer (start_magnitude, dtype=np.float64)
+        self.end_magnitude = np.frombuffer (end_magnitude, dtype=np.float64)
+        self.start_location = np.frombuffer (start_location, dtype=np.float64)
+        self.end_location = np.frombuffer (end_location, dtype=np.float64)
+
+    COLUMNS = (
+        'support_offsets', 'support_location', 'support_type',
+        'load_offsets', 'load_type', 'load_direction', 'load_case',
+        'start_magnitude', 'end_magnitude', 'start_location', 'end_location')
+
+    @classmethod
+    def from_arrays (cls, arrays_DICT:dict) -> 'BeamSet':
+        '''
+        Returns a BeamSet from the arrays produced by 'to_arrays' (ie after a round trip through numpy.savez/numpy.load)
+        '''
+        ret_SET = cls.__new__ (cls)
+        ret_SET.names = [str (name) for name in arrays_DICT ['names']]
+        ret_SET.case_names = [str (name) for name in arrays_DICT ['case_names']]
+        for name in cls.ATTRIBUTES + cls.COLUMNS:
+            setattr (ret_SET, name, arrays_DICT [name])
+        return ret_SET
+
+    def to_arrays (self) -> dict:
+        '''
+        Returns every column of the set as a dict of NumPy arrays (the names become unicode arrays),
+        ready for numpy.savez
+        '''
+        import numpy as np
+        ret_DICT = {
+            'names': np.array (self.names, dtype=str),
+            'case_names': np.array (self.case_names, dtype=str),
+        }
+        for name in self.ATTRIBUTES + self.COLUMNS:
+            ret_DICT [name] = getattr (self, name)
+        return ret_DICT
+
+    def __len__ (self) -> int:
+        return len (self.names)
+
+    def __getitem__ (self, i:int) -> Beam:
+        if i < 0:
+            i += len (self)
+        if not 0 <= i < len (self):
+            raise IndexError ('BeamSet index out of range')
+
+        supports_LIST = []
+        for j in range (self.support_offsets [i], self.support_offsets [i + 1]):
+            supports_LIST.append (Support (self.support_location [j].item (), SUPPORT_TYPES [self.support_type [j]]))
+
+        loads_LIST = []
+        for j in range (self.load_offsets [i], self.load_offsets [i + 1]):
+            direction = LOAD_DIRECTIONS [self.load_direction [j]]
+            case = self.case_names [self.load_case [j]]
+            if self.load_type [j] == POINT:
+                loads_LIST.append (PointLoad (direction, self.start_magnitude [j].item (), self.start_location [j].item (), case))
+            else:
+                loads_LIST.append (DistLoad (
+                    direction,
+                    self.start_magnitude [j].item (),
+                    self.end_magnitude [j].item (),
+                    self.start_location [j].item (),
+                    self.end_location [j].item (),
+                    case))
+
+        return Beam (
+            self.names [i],
+            *(getattr (self, name) [i].item () for name in self.ATTRIBUTES),
+            supports=supports_LIST,
+            loads=loads_LIST)
+
+    def __iter__ (self) -> Iterator [Beam]:
+        for i in range (len (self)):
+            yield self [i]
+
+    def to_dicts (self) -> list [dict]:
+        '''
+        Returns every beam in the set as a dict (see Beam.to_dict)
+        '''
+        return [beam.to_dict () for beam in self]
+
+    @property
+    def nbytes (self) -> int:
+        '''
+        The memory used by the numeric columns, in bytes (the names are not included)
+        '''
+        return sum (getattr (self, name).nbytes for name in self.ATTRIBUTES + self.COLUMNS)
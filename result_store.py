@@ -0,0 +1,183 @@
+import hashlib
+import itertools
+import json
+import pickle
+import sqlite3
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable
+from eng_module.beams import build_beam, get_model_results
+from eng_module.combos import analyze_load_combinations
+from eng_module.records import Beam, to_beam_dict
+from eng_module import profiling
+
+RESULT_VERSION = 1 # bump this whenever the analysis or its results change, so that every stored result is recomputed
+SQLITE_MAX_PARAMETERS = 500 # the keys looked up per query
+
+
+def get_fingerprint (beam_DICT:dict, combos_DICT:dict | None=None) -> str:
+    '''
+    Returns the SHA-1 hex digest of everything the results of 'beam_DICT' depend on: its attributes, supports and loads,
+    the load combinations 'combos_DICT' and RESULT_VERSION. The name isn't part of it, so renaming a beam doesn't
+    make it stale. Floats are written exactly (repr), so any change at all gives a new fingerprint.
+    '''
+    content_DICT = {key: value for key, value in beam_DICT.items () if key not in ('Name', 'Supports', 'Loads')}
+    content_DICT ['Supports'] = sorted (beam_DICT ['Supports'].items ())
+    content_DICT ['Loads'] = [sorted (load_DICT.items ()) for load_DICT in beam_DICT ['Loads']]
+    content_DICT ['Combos'] = combos_DICT
+    content_DICT ['Version'] = RESULT_VERSION
+    return hashlib.sha1 (json.dumps (content_DICT, sort_keys=True, default=repr).encode ()).hexdigest ()
+
+
+def analyze_beams (beams_LIST:list [dict], combos_DICT:dict | None=None) -> list [tuple [dict | None, str | None]]:
+    '''
+    Analyzes each beam in 'beams_LIST' and returns (its results, None), or (None, the error) if it failed.
+    The results are beams.get_model_results, or combos.analyze_load_combinations if 'combos_DICT' is given.
+    This is the unit of work sent to each worker process.
+    '''
+    ret_LIST = []
+    for beam_DICT in beams_LIST:
+        try:
+            if combos_DICT is None:
+                the_model = build_beam (beam_DICT)
+                the_model.analyze ()
+                ret_LIST.append ((get_model_results (the_model), None))
+            else:
+                ret_LIST.append ((analyze_load_combinations (beam_DICT, combos_DICT), None))
+        except Exception as err:
+            ret_LIST.append ((None, f"{type (err).__name__}: {err}"))
+    return ret_LIST
+
+
+class ResultStore:
+    '''
+    A SQLite file of analysis results, one row per beam: its key (ie its name), the fingerprint of its inputs
+    (see get_fingerprint), when it was analyzed, and its results (pickled). Use it as a context manager, or call close.
+    '''
+
+    def __init__ (self, path:str):
+        self.path = path
+        self.connection = sqlite3.connect (path)
+        self.connection.execute ('PRAGMA journal_mode=WAL')
+        self.connection.execute (
+            'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, analyzed REAL NOT NULL, results BLOB NOT NULL)')
+        self.connection.commit ()
+
+    def __enter__ (self) -> 'ResultStore':
+        return self
+
+    def __exit__ (self, *exc_info) -> None:
+        self.close ()
+
+    def __len__ (self) -> int:
+        return self.connection.execute ('SELECT COUNT(*) FROM results').fetchone () [0]
+
+    def close (self) -> None:
+        self.connection.close ()
+
+    def get_fingerprints (self) -> dict [str, str]:
+        '''
+        Returns the fingerprint of every stored beam, by key
+        '''
+        return dict (self.connection.execute ('SELECT key, fingerprint FROM results'))
+
+    def get_results (self, keys:Iterable [str]) -> dict [str, dict]:
+        '''
+        Returns the stored results of each of 'keys' that is in the store
+        '''
+        ret_DICT = {}
+        keys_ITER = iter (keys)
+        while chunk_LIST := list (itertools.islice (keys_ITER, SQLITE_MAX_PARAMETERS)):
+            query = f"SELECT key, results FROM results WHERE key IN ({','.join ('?' * len (chunk_LIST))})"
+            for key, results_BLOB in self.connection.execute (query, chunk_LIST):
+                ret_DICT [key] = pickle.loads (results_BLOB)
+        return ret_DICT
+
+    def put_results (self, rows:Iterable [tuple [str, str, dict]]) -> None:
+        '''
+        Stores each (key, fingerprint, results) in 'rows', replacing what was there, in a single transaction
+        '''
+        analyzed = time.time ()
+        with self.connection:
+            self.connection.executemany (
+                'INSERT OR REPLACE INTO results (key, fingerprint, analyzed, results) VALUES (?, ?, ?, ?)',
+                ((key, fingerprint, analyzed, pickle.dumps (results_DICT, pickle.HIGHEST_PROTOCOL)) for key, fingerprint, results_DICT in rows))
+
+    def delete (self, keys:Iterable [str]) -> int:
+        '''
+        Deletes the results of 'keys' and returns how many there were
+        '''
+        with self.connection:
+            return self.connection.executemany ('DELETE FROM results WHERE key = ?', ((key,) for key in keys)).rowcount
+
+
+def run_project (
+    beams:Iterable [dict | Beam],
+    store:ResultStore,
+    combos_DICT:dict | None=None,
+    key:Callable [[dict], str] | None=None,
+    prune:bool=False,
+    max_workers:int | None=1,
+    chunk_size:int=64
+) -> dict:
+    '''
+    Analyzes a whole project incrementally: only the beams whose fingerprint (see get_fingerprint) differs from
+    the one in 'store', or that aren't in it yet, are solved (see analyze_beams); the rest reuse their stored results.
+    New results are saved to 'store'; failed beams aren't, so they are tried again next time.
+    Params:
+    'key' - gives each beam's key in the store (by default its 'Name'); keys must be unique within the project
+    'prune' - also delete the stored results of beams that are no longer in the project
+    'max_workers' - the number of worker processes for the beams that need solving; 1 (the default) solves in this process
+    Returns: ret_DICT - ie
+    {
+        'Results': [{'Key': 'B1', 'Reused': True, 'Error': None, 'Reactions': {...}, 'Max Moment': ..., ...}, ...], # in the order of 'beams'
+        'Reused': 19870, 'Recomputed': 130, 'Failed': 0, 'Removed': 0
+    }
+    '''
+    key = key if key is not None else (lambda beam_DICT: beam_DICT ['Name'])
+    beams_LIST = [to_beam_dict (beam) for beam in beams]
+    keys_LIST = [key (beam_DICT) for beam_DICT in beams_LIST]
+    duplicates_LIST = sorted (this_key for this_key, n in Counter (keys_LIST).items () if n > 1)
+    if duplicates_LIST:
+        raise ValueError (f"Beam keys must be unique; repeated: {duplicates_LIST [:10]}")
+    fingerprints_LIST = [get_fingerprint (beam_DICT, combos_DICT) for beam_DICT in beams_LIST]
+
+    stored_DICT = store.get_fingerprints ()
+    reused_SET = {this_key for this_key, fingerprint in zip (keys_LIST, fingerprints_LIST) if stored_DICT.get (this_key) == fingerprint}
+    results_DICT = store.get_results (reused_SET)
+    stale_LIST = [i for i, this_key in enumerate (keys_LIST) if this_key not in reused_SET]
+
+    stale_beams_LIST = [beams_LIST [i] for i in stale_LIST]
+    chunks_LIST = [stale_beams_LIST [i:i + chunk_size] for i in range (0, len (stale_beams_LIST), chunk_size)]
+    if max_workers == 1 or len (chunks_LIST) <= 1:
+        outcomes_LIST = [outcome for chunk_LIST in chunks_LIST for outcome in analyze_beams (chunk_LIST, combos_DICT)]
+    else:
+        with ProcessPoolExecutor (max_workers=max_workers) as pool:
+            outcomes_LIST = [outcome for outcomes in pool.map (analyze_beams, chunks_LIST, itertools.repeat (combos_DICT)) for outcome in outcomes]
+
+    errors_DICT = {}
+    new_rows_LIST = []
+    for i, (this_results_DICT, error) in zip (stale_LIST, outcomes_LIST):
+        if error is None:
+            results_DICT [keys_LIST [i]] = this_results_DICT
+            new_rows_LIST.append ((keys_LIST [i], fingerprints_LIST [i], this_results_DICT))
+        else:
+            errors_DICT [keys_LIST [i]] = error
+    store.put_results (new_rows_LIST)
+    n_removed = store.delete (set (stored_DICT) - set (keys_LIST)) if prune else 0
+    profiling.count ('reused', len (reused_SET))
+    profiling.count ('recomputed', len (stale_LIST) - len (errors_DICT))
+
+    rows_LIST = []
+    for this_key in keys_LIST:
+        row_DICT = {'Key': this_key, 'Reused': this_key in reused_SET, 'Error': errors_DICT.get (this_key)}
+        row_DICT.update (results_DICT.get (this_key, {}))
+        rows_LIST.append (row_DICT)
+    return {
+        'Results': rows_LIST,
+        'Reused': len (reused_SET),
+        'Recomputed': len (stale_LIST) - len (errors_DICT),
+        'Failed': len (errors_DICT),
+        'Removed': n_removed,
+    }
@@ -0,0 +1,229 @@
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Iterable
+import numpy as np
+from eng_module.beams import build_beam, get_model_results, sample_model_results
+from eng_module.parsing import parse_beam_file
+from eng_module.records import Beam
+
+# The fixed layout of the result arrays, one row per beam (see ResultArrays):
+#   'Status'                              - NOT_RUN, DONE or FAILED
+#   'Supports', 'Reactions'               - each support's location and vertical reaction, from left to right, NaN padded to max_supports
+#   'Extremes'                            - the values of EXTREME_NAMES, in that order (see beams.get_model_results)
+#   'x', 'Moment', 'Shear', 'Deflection'  - the diagrams at n_stations evenly spaced stations (see beams.sample_model_results)
+EXTREME_NAMES = ('Max Moment', 'Min Moment', 'Max Shear', 'Min Shear', 'Max Deflection', 'Min Deflection')
+DIAGRAM_NAMES = ('x', 'Moment', 'Shear', 'Deflection')
+NOT_RUN = 0
+DONE = 1
+FAILED = 2
+ALIGNMENT = 64 # each array starts on a cache line
+
+# the ResultArrays each worker process has attached to, by name, kept between chunks
+_worker_arrays = {}
+
+
+def get_layout (n_beams:int, n_stations:int=101, max_supports:int=8) -> tuple [dict [str, tuple [tuple, str, int]], int]:
+    '''
+    Returns the (shape, dtype, offset in bytes) of each result array (see the layout above), and the total size in bytes
+    '''
+    arrays_LIST = [('Status', (n_beams,), 'int8')]
+    arrays_LIST.extend ((name, (n_beams, max_supports), 'float64') for name in ('Supports', 'Reactions'))
+    arrays_LIST.append (('Extremes', (n_beams, len (EXTREME_NAMES)), 'float64'))
+    arrays_LIST.extend ((name, (n_beams, n_stations), 'float64') for name in DIAGRAM_NAMES)
+
+    ret_DICT = {}
+    offset = 0
+    for name, shape, dtype in arrays_LIST:
+        ret_DICT [name] = (shape, dtype, offset)
+        offset += -(-math.prod (shape) * np.dtype (dtype).itemsize // ALIGNMENT) * ALIGNMENT
+    return ret_DICT, max (offset, 1)
+
+
+class ResultArrays:
+    '''
+    The results of many beams as NumPy arrays in one block of memory that any number of processes can write into and read
+    without copying: a multiprocessing.shared_memory block or, given a 'path', a memory-mapped file (which outlives the processes).
+    Make one with 'create' and pass its 'spec' (a small dict) to other processes, which 'attach' to it.
+    Each array (see the layout above) is ResultArrays [name]; use it as a context manager, or call close
+    (and, for the process that created a shared memory block, unlink).
+    '''
+
+    def __init__ (self, spec:dict, create:bool=False):
+        self.spec = dict (spec)
+        self.owner = create
+        layout_DICT, n_bytes = get_layout (spec ['n_beams'], spec ['n_stations'], spec ['max_supports'])
+        self.shared_memory = None
+        if spec ['path'] is not None:
+            buffer = np.memmap (spec ['path'], dtype=np.uint8, mode='w+' if create else 'r+', shape=(n_bytes,))
+        elif create:
+            self.shared_memory = shared_memory.SharedMemory (create=True, size=n_bytes)
+            self.spec ['name'] = self.shared_memory.name
+            buffer = self.shared_memory.buf
+        else:
+            self.shared_memory = shared_memory.SharedMemory (spec ['name'])
+            buffer = self.shared_memory.buf
+        self.arrays_DICT = {name: np.ndarray (shape, dtype, buffer, offset) for name, (shape, dtype, offset) in layout_DICT.items ()}
+        if create:
+            for name, array_ARR in self.arrays_DICT.items ():
+                array_ARR [...] = NOT_RUN if name == 'Status' else np.nan
+        self.names = [None] * spec ['n_beams']
+        self.errors_DICT = {}
+
+    @classmethod
+    def create (cls, n_beams:int, n_stations:int=101, max_supports:int=8, path:str | None=None) -> 'ResultArrays':
+        return cls ({'n_beams': n_beams, 'n_stations': n_stations, 'max_supports': max_supports, 'path': path, 'name': None}, create=True)
+
+    @classmethod
+    def attach (cls, spec:dict) -> 'ResultArrays':
+        return cls (spec)
+
+    def __enter__ (self) -> 'ResultArrays':
+        return self
+
+    def __exit__ (self, *exc_info) -> None:
+        self.close ()
+        if self.owner:
+            self.unlink ()
+
+    def __getitem__ (self, name:str) -> np.ndarray:
+        return self.arrays_DICT [name]
+
+    def __len__ (self) -> int:
+        return self.spec ['n_beams']
+
+    def close (self) -> None:
+        '''
+        Lets go of the arrays, which can't be used after this. The data stays, for the other processes or in the file.
+        '''
+        self.arrays_DICT = {} # the views must go before the block they're on can be closed
+        if self.shared_memory is not None:
+            self.shared_memory.close ()
+
+    def unlink (self) -> None:
+        '''
+        Frees the shared memory block, once every process has closed it (a file is left where it is)
+        '''
+        if self.shared_memory is not None:
+            self.shared_memory.unlink ()
+
+    def write (self, i:int, the_model:object) -> None:
+        '''
+        Writes the results of the solved beam model 'the_model' (see beams.get_model_results and beams.sample_model_results)
+        into row 'i'. Raises a ValueError if the beam has more than 'max_supports' supports.
+        '''
+        summary_DICT = get_model_results (the_model)
+        reactions_DICT = summary_DICT ['Reactions']
+        if len (reactions_DICT) > self.spec ['max_supports']:
+            raise ValueError (f"The beam has {len (reactions_DICT)} supports, but the result arrays have room for {self.spec ['max_supports']}")
+        samples_DICT = sample_model_results (the_model, self.spec ['n_stations'])
+
+        n_supports = len (reactions_DICT)
+        self ['Supports'][i] = np.nan
+        self ['Reactions'][i] = np.nan
+        self ['Supports'][i, :n_supports] = list (reactions_DICT)
+        self ['Reactions'][i, :n_supports] = list (reactions_DICT.values ())
+        self ['Extremes'][i] = [summary_DICT [name] for name in EXTREME_NAMES]
+        for name in DIAGRAM_NAMES:
+            self [name][i] = samples_DICT [name]
+        self ['Status'][i] = DONE # last, so a row is only ever seen as done once all of it is written
+
+    def get_result (self, i:int) -> dict:
+        '''
+        Returns row 'i' as a dict, in the format of beams.get_model_results, plus 'Name' and 'Error'
+        (the names and errors are only known to the process that ran analyze_to_arrays)
+        '''
+        ret_DICT = {'Name': self.names [i], 'Error': self.errors_DICT.get (i)}
+        if self ['Status'][i] != DONE:
+            return ret_DICT
+        supports_ARR = self ['Supports'][i]
+        supported_ARR = ~np.isnan (supports_ARR)
+        ret_DICT ['Reactions'] = dict (zip (supports_ARR [supported_ARR].tolist (), self ['Reactions'][i, supported_ARR].tolist ()))
+        ret_DICT.update (zip (EXTREME_NAMES, self ['Extremes'][i].tolist ()))
+        return ret_DICT
+
+
+def analyze_into (spec:dict, start:int, beams_LIST:list [str | dict | Beam]) -> list [tuple [str | None, str | None]]:
+    '''
+    Attaches to the ResultArrays given by 'spec' (once per worker process) and runs analyze_rows.
+    This is the unit of work sent to each worker process.
+    '''
+    key = spec ['name'] or spec ['path']
+    if key not in _worker_arrays:
+        _worker_arrays [key] = ResultArrays.attach (spec)
+    return analyze_rows (_worker_arrays [key], start, beams_LIST)
+
+
+def analyze_rows (arrays:ResultArrays, start:int, beams_LIST:list [str | dict | Beam]) -> list [tuple [str | None, str | None]]:
+    '''
+    Builds and analyzes each beam in 'beams_LIST' (a beam file, or a beam dict or record) and writes its results into
+    row 'start' + its index of 'arrays', marking the rows of any that fail as FAILED.
+    Returns only (name, error) for each beam, so nothing bigger than that is pickled back from a worker process.
+    '''
+    ret_LIST = []
+    for i, beam in enumerate (beams_LIST, start):
+        name = None
+        try:
+            beam_DICT = parse_beam_file (beam) if isinstance (beam, str) else beam
+            name = beam_DICT ['Name'] if isinstance (beam_DICT, dict) else beam_DICT.name
+            the_model = build_beam (beam_DICT)
+            the_model.analyze ()
+            arrays.write (i, the_model)
+            ret_LIST.append ((name, None))
+        except Exception as err:
+            arrays ['Status'][i] = FAILED
+            ret_LIST.append ((name, f"{type (err).__name__}: {err}"))
+    return ret_LIST
+
+
+def analyze_to_arrays (
+    beams:Iterable [str | dict | Beam],
+    n_stations:int=101,
+    max_supports:int=8,
+    max_workers:int | None=None,
+    chunk_size:int=16,
+    path:str | None=None
+) -> ResultArrays:
+    '''
+    Analyzes every beam in 'beams' (beam files, beam dicts or records) across a pool of worker processes that write their
+    results straight into a new ResultArrays (in shared memory, or the memory-mapped file 'path'), one row per beam in order,
+    so that no model or result is pickled back; only each beam's name and error, which go into 'names' and 'errors_DICT'.
+    The caller owns the arrays: use the result as a context manager, or close and unlink it when done.
+    Params:
+    'max_workers' - the number of worker processes; None uses every CPU, 1 runs in this process
+    'chunk_size' - the number of beams sent to a worker at a time
+    '''
+    beams_LIST = list (beams)
+    if chunk_size < 1:
+        raise ValueError (f"chunk_size must be at least 1, got {chunk_size}")
+    arrays = ResultArrays.create (len (beams_LIST), n_stations, max_supports, path)
+    starts_LIST = list (range (0, len (beams_LIST), chunk_size))
+    try:
+        if max_workers == 1:
+            for start in starts_LIST:
+                _record_outcomes (arrays, start, analyze_rows (arrays, start, beams_LIST [start:start + chunk_size]))
+            return arrays
+
+        with ProcessPoolExecutor (max_workers=max_workers) as pool:
+            futures_DICT = {pool.submit (analyze_into, arrays.spec, start, beams_LIST [start:start + chunk_size]): start for start in starts_LIST}
+            for future in as_completed (futures_DICT):
+                start = futures_DICT [future]
+                try:
+                    _record_outcomes (arrays, start, future.result ())
+                except Exception as err: # the worker itself died, e.g. BrokenProcessPool
+                    n_beams = len (beams_LIST [start:start + chunk_size])
+                    arrays ['Status'][start:start + n_beams] = FAILED
+                    _record_outcomes (arrays, start, itertools.repeat ((None, f"{type (err).__name__}: {err}"), n_beams))
+    except BaseException:
+        arrays.close ()
+        arrays.unlink ()
+        raise
+    return arrays
+
+
+def _record_outcomes (arrays:ResultArrays, start:int, outcomes:Iterable [tuple [str | None, str | None]]) -> None:
+    for i, (name, error) in enumerate (outcomes, start):
+        arrays.names [i] = name
+        if error is not None:
+            arrays.errors_DICT [i] = error
@@ -0,0 +1,271 @@
+import csv
+import json
+import math
+import os
+import numpy as np
+
+# The tables that ship in data/ - units are mm, mm2, mm4 and kg/m (see the comment at the top of each file)
+DATA_DIR = os.path.join (os.path.dirname (os.path.abspath (__file__)), "data")
+SECTION_FILES = {
+    'steel': "steel_sections.csv",
+    'timber': "timber_sections.csv",
+}
+MATERIAL_FILE = "materials.csv"
+STORE_DIR = os.path.join (DATA_DIR, "store")
+STORE_VERSION = 1 # bump this whenever the store format changes, so that old stores are rebuilt
+KG_PER_M3_TO_N_PER_MM3 = 9.81e-9
+
+# The beam attributes that may be given by name in a beam file (see parsing.parse_attribute_row), and what each name supplies
+NAMED_ATTRIBUTES = {
+    'E': ('E', 'nu', 'rho'), # a material, ie 350W or D.Fir-L No.1/No.2
+    'Iz': ('Iz', 'Iy', 'A', 'J'), # a section, ie W310x39 or 89x235
+}
+
+# the catalogue of the tables in data/, built when first needed (see get_catalogue)
+_default_catalogue = None
+
+
+def _read_csv_rows (the_filename:str) -> list [dict]:
+    '''
+    Returns the rows of 'the_filename' as dicts keyed on its header, skipping the '#' comment lines
+    '''
+    with open (the_filename, newline='') as csv_file:
+        return list (csv.DictReader (line for line in csv_file if not line.startswith ('#')))
+
+
+class SectionTable:
+    '''
+    A table of section properties: one row per section, with a name, a family (ie 'W', 'Sawn', 'Glulam') and
+    the numeric 'columns_TUPLE' (ie d, b, A, Iz, Iy, J, mass) held in 'values_ARR', which may be a read-only memory map.
+    Lookups by name are a dict lookup. Range queries on a column (see lightest and select) use a sorted index,
+    built the first time that column is queried.
+    '''
+
+    def __init__ (self, names_LIST:list [str], families_LIST:list [str], columns_TUPLE:tuple [str], values_ARR:np.ndarray):
+        if values_ARR.shape != (len (names_LIST), len (columns_TUPLE)):
+            raise ValueError (f"expected a {len (names_LIST)} x {len (columns_TUPLE)} array of values, got {values_ARR.shape}")
+        self.names_LIST = list (names_LIST)
+        self.families_LIST = list (families_LIST)
+        self.columns_TUPLE = tuple (columns_TUPLE)
+        self.values_ARR = values_ARR
+        self.rows_DICT = {name: i for i, name in enumerate (self.names_LIST)}
+        self.column_DICT = {column: j for j, column in enumerate (self.columns_TUPLE)}
+        self._indexes_DICT = {}
+
+    def __len__ (self) -> int:
+        return len (self.names_LIST)
+
+    def __contains__ (self, name:str) -> bool:
+        return name in self.rows_DICT
+
+    @classmethod
+    def from_csv (cls, the_filename:str) -> 'SectionTable':
+        '''
+        Reads a table with a 'Name' and a 'Family' column, followed by numeric columns (see data/steel_sections.csv)
+        '''
+        rows_LIST = _read_csv_rows (the_filename)
+        if not rows_LIST:
+            raise ValueError (f"{the_filename} has no sections")
+        columns_TUPLE = tuple (column for column in rows_LIST [0] if column not in ('Name', 'Family'))
+        values_ARR = np.array ([[float (row_DICT [column]) for column in columns_TUPLE] for row_DICT in rows_LIST], dtype=float)
+        return cls ([row_DICT ['Name'] for row_DICT in rows_LIST], [row_DICT ['Family'] for row_DICT in rows_LIST], columns_TUPLE, values_ARR)
+
+    def save (self, path:str, source_mtime:float=0.0) -> None:
+        '''
+        Writes the table to 'path'.npy (the values) and 'path'.json (the names and columns).
+        Each file is written to a temporary file and moved into place, the values first, so that another process
+        that has the old values memory-mapped keeps them, and one opening the table never sees half a file
+        or a new header with the old values.
+        '''
+        temp_path = f"{path}.{os.getpid ()}.tmp"
+        with open (temp_path, "wb") as npy_file:
+            np.save (npy_file, np.ascontiguousarray (self.values_ARR))
+        os.replace (temp_path, f"{path}.npy")
+        header_DICT = {
+            'version': STORE_VERSION,
+            'source_mtime': source_mtime,
+            'names': self.names_LIST,
+            'families': self.families_LIST,
+            'columns': list (self.columns_TUPLE),
+        }
+        with open (temp_path, "w") as json_file:
+            json.dump (header_DICT, json_file)
+        os.replace (temp_path, f"{path}.json")
+
+    @classmethod
+    def open (cls, path:str, source_mtime:float | None=None) -> 'SectionTable | None':
+        '''
+        Opens a table written by 'save', with its values memory-mapped. Returns None if there is no such table,
+        it was written by another STORE_VERSION, or (if 'source_mtime' is given) it was saved from an older source file.
+        '''
+        try:
+            with open (f"{path}.json") as json_file:
+                header_DICT = json.load (json_file)
+            if header_DICT ['version'] != STORE_VERSION:
+                return None
+            if source_mtime is not None and header_DICT ['source_mtime'] != source_mtime:
+                return None
+            values_ARR = np.load (f"{path}.npy", mmap_mode='r')
+            return cls (header_DICT ['names'], header_DICT ['families'], header_DICT ['columns'], values_ARR)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def get (self, name:str) -> dict:
+        '''
+        Returns the properties of the section 'name', ie {'Name': 'W310x39', 'Family': 'W', 'd': 310.0, ..., 'mass': 38.7}.
+        Raises a KeyError for an unknown section.
+        '''
+        try:
+            i = self.rows_DICT [name]
+        except KeyError:
+            raise KeyError (f"Unknown section '{name}'") from None
+        ret_DICT = {'Name': name, 'Family': self.families_LIST [i]}
+        ret_DICT.update (zip (self.columns_TUPLE, self.values_ARR [i].tolist ()))
+        return ret_DICT
+
+    def get_index (self, column:str, family:str | None=None) -> tuple [np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        Returns the sorted index of 'column' (only over the sections in 'family', if given) as 3 arrays:
+        the rows in order of 'column', the sorted values of 'column', and for each position in that order,
+        the row of the lightest section from that position to the end.
+        '''
+        key = (column, family)
+        if key not in self._indexes_DICT:
+            rows_ARR = np.arange (len (self))
+            if family is not None:
+                rows_ARR = rows_ARR [np.array (self.families_LIST) == family]
+            values_ARR = self.values_ARR [rows_ARR, self.column_DICT [column]]
+            order_ARR = np.argsort (values_ARR, kind='stable')
+            rows_ARR = rows_ARR [order_ARR]
+            mass_ARR = self.values_ARR [rows_ARR, self.column_DICT ['mass']]
+            # the lightest of each suffix: a running minimum taken from the end, and the position where it was last reached
+            reversed_ARR = mass_ARR [::-1]
+            positions_ARR = np.arange (len (reversed_ARR))
+            best_ARR = np.maximum.accumulate (np.where (reversed_ARR <= np.minimum.accumulate (reversed_ARR), positions_ARR, 0))
+            lightest_ARR = rows_ARR [::-1][best_ARR][::-1]
+            self._indexes_DICT [key] = (rows_ARR, values_ARR [order_ARR], lightest_ARR)
+        return self._indexes_DICT [key]
+
+    def lightest (self, column:str='Iz', minimum:float=0.0, family:str | None=None) -> dict | None:
+        '''
+        Returns the properties (see get) of the lightest section with 'column' >= 'minimum' (of those in 'family', if given),
+        or None if no section is big enough. A binary search of the sorted index, so each call is O(log n).
+        '''
+        rows_ARR, sorted_ARR, lightest_ARR = self.get_index (column, family)
+        k = np.searchsorted (sorted_ARR, minimum, side='left')
+        if k == len (sorted_ARR):
+            return None
+        return self.get (self.names_LIST [lightest_ARR [k]])
+
+    def select (self, column:str, minimum:float=-math.inf, maximum:float=math.inf, family:str | None=None) -> list [str]:
+        '''
+        Returns the names of the sections with 'minimum' <= 'column' <= 'maximum' (of those in 'family', if given),
+        in increasing order of 'column'
+        '''
+        rows_ARR, sorted_ARR, _ = self.get_index (column, family)
+        start = np.searchsorted (sorted_ARR, minimum, side='left')
+        stop = np.searchsorted (sorted_ARR, maximum, side='right')
+        return [self.names_LIST [i] for i in rows_ARR [start:stop]]
+
+
+class Catalogue:
+    '''
+    The section tables (ie {'steel': SectionTable, 'timber': SectionTable}) and materials (ie {'350W': {...}})
+    that a beam file may refer to by name
+    '''
+
+    def __init__ (self, tables_DICT:dict [str, SectionTable], materials_DICT:dict [str, dict]):
+        self.tables_DICT = tables_DICT
+        self.materials_DICT = materials_DICT
+
+    @classmethod
+    def load (cls, data_dir:str=DATA_DIR, store_dir:str | None=STORE_DIR) -> 'Catalogue':
+        '''
+        Loads the tables in 'data_dir' (see SECTION_FILES and MATERIAL_FILE). Each section table is memory-mapped from 'store_dir',
+        and written there first if it isn't there yet or its csv file has changed since. If 'store_dir' is None, or can't be
+        written to, the tables are read straight from the csv files instead.
+        '''
+        tables_DICT = {}
+        for table_name, csv_name in SECTION_FILES.items ():
+            csv_path = os.path.join (data_dir, csv_name)
+            source_mtime = os.path.getmtime (csv_path)
+            the_table = None
+            if store_dir is not None:
+                store_path = os.path.join (store_dir, table_name)
+                the_table = SectionTable.open (store_path, source_mtime)
+                if the_table is None:
+                    try:
+                        os.makedirs (store_dir, exist_ok=True)
+                        SectionTable.from_csv (csv_path).save (store_path, source_mtime)
+                        the_table = SectionTable.open (store_path, source_mtime)
+                    except OSError:
+                        pass
+            tables_DICT [table_name] = the_table if the_table is not None else SectionTable.from_csv (csv_path)
+
+        materials_DICT = {}
+        for row_DICT in _read_csv_rows (os.path.join (data_dir, MATERIAL_FILE)):
+            material_DICT = {'Name': row_DICT ['Name'], 'Kind': row_DICT ['Kind']}
+            for column in ('E', 'nu', 'rho', 'Fy', 'fb'):
+                material_DICT [column] = float (row_DICT [column]) if row_DICT.get (column) else None
+            material_DICT ['rho'] *= KG_PER_M3_TO_N_PER_MM3
+            materials_DICT [row_DICT ['Name']] = material_DICT
+        return cls (tables_DICT, materials_DICT)
+
+    def get_section (self, name:str) -> dict:
+        '''
+        Returns the properties of the section 'name' from whichever table has it (see SectionTable.get).
+        Raises a KeyError for an unknown section.
+        '''
+        for the_table in self.tables_DICT.values ():
+            if name in the_table:
+                return the_table.get (name)
+        raise KeyError (f"Unknown section '{name}'")
+
+    def get_material (self, name:str) -> dict:
+        '''
+        Returns the material 'name', ie {'Name': '350W', 'Kind': 'Steel', 'E': 200000.0, 'nu': 0.3, 'rho': 7.7e-05, 'Fy': 350.0, 'fb': None}.
+        Raises a KeyError for an unknown material.
+        '''
+        try:
+            return self.materials_DICT [name]
+        except KeyError:
+            raise KeyError (f"Unknown material '{name}'") from None
+
+
+def get_catalogue () -> Catalogue:
+    '''
+    Returns the catalogue of the tables in data/, loading it on the first call
+    '''
+    global _default_catalogue
+    if _default_catalogue is None:
+        _default_catalogue = Catalogue.load ()
+    return _default_catalogue
+
+
+def get_section (name:str) -> dict:
+    '''
+    Returns the properties of the section 'name' from the default catalogue (see Catalogue.get_section)
+    '''
+    return get_catalogue ().get_section (name.strip ())
+
+
+def get_material (name:str) -> dict:
+    '''
+    Returns the material 'name' from the default catalogue (see Catalogue.get_material)
+    '''
+    return get_catalogue ().get_material (name.strip ())
+
+
+def resolve_attribute (attribute:str, name:str) -> dict [str, float]:
+    '''
+    Returns the beam attributes that the 'name' given in place of 'attribute' stands for (see NAMED_ATTRIBUTES):
+    ie resolve_attribute ('Iz', 'W310x39') -> {'Iz': 84.91e6, 'Iy': 7.201e6, 'A': 4935.0, 'J': 124900.0}
+    Raises a KeyError for an unknown name, or an attribute that can't be named.
+    '''
+    if attribute == 'E':
+        properties_DICT = get_material (name)
+    elif attribute == 'Iz':
+        properties_DICT = get_section (name)
+    else:
+        raise KeyError (f"'{attribute}' can't be given by name")
+    return {key: properties_DICT [key] for key in NAMED_ATTRIBUTES [attribute]}
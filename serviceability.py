@@ -0,0 +1,224 @@
+from typing import Iterable
+import numpy as np
+from eng_module.beams import build_beam, sample_model_results
+from eng_module.load_factors import SERVICE_COMBOS, get_case_symbol
+from eng_module.records import Beam, to_beam_dict
+
+# The deflection limit for each service combination (see load_factors.SERVICE_COMBOS), as the span / deflection ratio,
+# ie 360 for L/360. A cantilever is checked against twice its length, ie 2 * L/360.
+DEFLECTION_LIMITS = {
+    "L": 360,
+    "S": 240,
+    "D+L": 240,
+}
+CANTILEVER_FACTOR = 2.0
+
+
+def get_span_bounds (supports_ARR:np.ndarray, start_ARR:np.ndarray, end_ARR:np.ndarray) -> tuple [np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Returns the start, the end and whether it's a cantilever of every span of many beams at once, each of shape
+    (number of beams, max_supports + 1): the backspans between the supports and the overhangs beyond the first and last support,
+    as in beams.get_spans. 'supports_ARR' holds each beam's support locations, NaN padded to max_supports
+    (as in results.ResultArrays); spans that a beam doesn't have come out with zero length.
+    '''
+    supports_ARR = np.asarray (supports_ARR, dtype=float)
+    start_ARR = np.asarray (start_ARR, dtype=float) [:, None]
+    end_ARR = np.asarray (end_ARR, dtype=float) [:, None]
+    filled_ARR = np.sort (np.where (np.isnan (supports_ARR), end_ARR, supports_ARR), axis=1)
+    starts_ARR = np.concatenate ([start_ARR, filled_ARR], axis=1)
+    ends_ARR = np.concatenate ([filled_ARR, end_ARR], axis=1)
+
+    first_ARR = np.where (np.isnan (supports_ARR), np.inf, supports_ARR).min (axis=1, keepdims=True, initial=np.inf)
+    last_ARR = np.where (np.isnan (supports_ARR), -np.inf, supports_ARR).max (axis=1, keepdims=True, initial=-np.inf)
+    cantilevers_ARR = (ends_ARR <= first_ARR) | (starts_ARR >= last_ARR)
+    return starts_ARR, ends_ARR, cantilevers_ARR
+
+
+def get_span_deflections (x_ARR:np.ndarray, deflection_ARR:np.ndarray, supports_ARR:np.ndarray) -> np.ndarray:
+    '''
+    Returns the largest deflection (in size) in every span (see get_span_bounds) of many beams at once, from their sampled diagrams.
+    Params:
+    'x_ARR' - the stations of each beam, shape (number of beams, n_stations)
+    'deflection_ARR' - the deflection at each station, shape (number of beams, n_stations),
+        or (number of beams, number of combinations, n_stations) for several load combinations
+    'supports_ARR' - each beam's support locations, NaN padded, shape (number of beams, max_supports)
+    Returns: an array of shape (number of beams, [number of combinations,] max_supports + 1)
+    '''
+    x_ARR = np.asarray (x_ARR, dtype=float)
+    deflection_ARR = np.asarray (deflection_ARR, dtype=float)
+    single = deflection_ARR.ndim == 2
+    if single:
+        deflection_ARR = deflection_ARR [:, None, :]
+    n_beams, n_combos, n_stations = deflection_ARR.shape
+    n_spans = supports_ARR.shape [1] + 1
+
+    # each station's span is the number of supports before it, so a station on a support ends the span on its left
+    filled_ARR = np.sort (np.where (np.isnan (supports_ARR), np.inf, supports_ARR), axis=1)
+    span_ARR = (x_ARR [:, :, None] > filled_ARR [:, None, :]).sum (axis=2)
+    # one group per (beam, combination, span), reduced in a single unbuffered pass
+    groups_ARR = (np.arange (n_beams) [:, None, None] * n_combos + np.arange (n_combos) [None, :, None]) * n_spans + span_ARR [:, None, :]
+    ret_ARR = np.zeros (n_beams * n_combos * n_spans)
+    np.fmax.at (ret_ARR, groups_ARR.ravel (), np.abs (deflection_ARR).ravel ())
+    ret_ARR [np.isnan (deflection_ARR).any (axis=2).repeat (n_spans)] = np.nan
+    ret_ARR = ret_ARR.reshape (n_beams, n_combos, n_spans)
+    return ret_ARR [:, 0] if single else ret_ARR
+
+
+def check_span_deflections (
+    x_ARR:np.ndarray,
+    deflection_ARR:np.ndarray,
+    supports_ARR:np.ndarray,
+    ratios:Iterable [float],
+    cantilever_factor:float=CANTILEVER_FACTOR
+) -> dict:
+    '''
+    Checks the deflection of every span of many beams at once against span / ratio, with one ratio per load combination.
+    The arguments are as for get_span_deflections, with 'deflection_ARR' of shape (number of beams, number of combinations, n_stations)
+    and 'ratios' giving each combination's limit (ie 360 for L/360).
+    Returns: ret_DICT - ie
+    {
+        'Length': ..., 'Cantilever': ...,                     # shape (number of beams, max_supports + 1)
+        'Deflection': ..., 'Allowable': ..., 'Utilization': ... # shape (number of beams, number of combinations, max_supports + 1)
+    }
+    Spans that a beam doesn't have have a NaN utilization, as do beams with NaN deflections (ie that failed).
+    '''
+    x_ARR = np.asarray (x_ARR, dtype=float)
+    starts_ARR, ends_ARR, cantilevers_ARR = get_span_bounds (supports_ARR, x_ARR [:, 0], x_ARR [:, -1])
+    lengths_ARR = ends_ARR - starts_ARR
+    deflections_ARR = get_span_deflections (x_ARR, deflection_ARR, supports_ARR)
+    ratios_ARR = np.asarray (list (ratios), dtype=float)
+
+    effective_ARR = np.where (cantilevers_ARR, cantilever_factor * lengths_ARR, lengths_ARR)
+    allowable_ARR = effective_ARR [:, None, :] / ratios_ARR [None, :, None]
+    with np.errstate (divide='ignore', invalid='ignore'):
+        utilization_ARR = np.where (allowable_ARR > 0, deflections_ARR / allowable_ARR, np.nan)
+    ret_DICT = {
+        'Length': lengths_ARR,
+        'Cantilever': cantilevers_ARR & (lengths_ARR > 0),
+        'Deflection': deflections_ARR,
+        'Allowable': allowable_ARR,
+        'Utilization': utilization_ARR,
+    }
+    return ret_DICT
+
+
+def sample_service_deflections (
+    beams:Iterable [dict | Beam],
+    combos_DICT:dict=SERVICE_COMBOS,
+    n_stations:int=101,
+    max_supports:int | None=None,
+    backend:str='pynite'
+) -> dict:
+    '''
+    Analyzes each beam in 'beams' for every (unfactored) load combination in 'combos_DICT' and returns the sampled deflections
+    of them all, ready for check_span_deflections:
+    Returns: ret_DICT - ie
+    {
+        'Names': ['B1', ...],
+        'x': array, 'Supports': array, 'Deflection': array,  # as check_span_deflections takes them (NaN for a beam that failed)
+        'Error': [None, ...]
+    }
+    The supports are padded to 'max_supports' (by default the most any beam has).
+    '''
+    beams_LIST = [to_beam_dict (beam) for beam in beams]
+    combo_names_LIST = list (combos_DICT)
+    if max_supports is None:
+        max_supports = max ((len (beam_DICT ['Supports']) for beam_DICT in beams_LIST), default=0)
+    x_ARR = np.full ((len (beams_LIST), n_stations), np.nan)
+    deflection_ARR = np.full ((len (beams_LIST), len (combo_names_LIST), n_stations), np.nan)
+    supports_ARR = np.full ((len (beams_LIST), max_supports), np.nan)
+    errors_LIST = []
+    for i, beam_DICT in enumerate (beams_LIST):
+        try:
+            supports_LIST = sorted (beam_DICT ['Supports'])
+            if len (supports_LIST) > max_supports:
+                raise ValueError (f"The beam has {len (supports_LIST)} supports, but max_supports is {max_supports}")
+            the_model = build_beam (beam_DICT, load_cases=True, backend=backend)
+            case_names_LIST = list (dict.fromkeys (load_DICT ['Case'] for load_DICT in beam_DICT ['Loads']))
+            for combo_name, factors_DICT in combos_DICT.items ():
+                the_model.add_load_combo (combo_name, {case_name: factors_DICT.get (get_case_symbol (case_name), 0.0) for case_name in case_names_LIST})
+            the_model.analyze ()
+            samples_DICT = sample_model_results (the_model, n_stations, combo_names_LIST)
+            if not np.isfinite (samples_DICT ['Deflection']).all (): # PyNite solves a mechanism to NaN rather than raising
+                raise Exception ('The deflections are not finite, so the model is unstable')
+            x_ARR [i] = samples_DICT ['x']
+            deflection_ARR [i] = samples_DICT ['Deflection']
+            supports_ARR [i, :len (supports_LIST)] = supports_LIST
+            errors_LIST.append (None)
+        except Exception as err:
+            x_ARR [i] = np.linspace (0.0, beam_DICT.get ('L', 1.0), n_stations)
+            errors_LIST.append (f"{type (err).__name__}: {err}")
+
+    ret_DICT = {
+        'Names': [beam_DICT.get ('Name') for beam_DICT in beams_LIST],
+        'x': x_ARR,
+        'Supports': supports_ARR,
+        'Deflection': deflection_ARR,
+        'Error': errors_LIST,
+    }
+    return ret_DICT
+
+
+def get_table (checked_DICT:dict, combo_names_LIST:list [str]) -> dict [str, np.ndarray]:
+    '''
+    Reduces the span by span results of check_span_deflections to one row per beam, as columns:
+    Returns: ret_DICT - ie
+    {
+        'Pass': array ([True, False, ...]),
+        'Utilization': ..., 'Governing': ..., 'Span': ..., 'Cantilever': ..., 'Length': ..., 'Deflection': ..., 'Allowable': ...,
+        'L Utilization': ..., 'D+L Utilization': ..., ...  # the worst span for each combination
+    }
+    where 'Governing' and 'Span' are the combination and span (0-based, see get_span_bounds) with the highest utilization.
+    A beam passes if every span is within its limit for every combination; one with NaN results (ie that failed) doesn't.
+    '''
+    utilization_ARR = checked_DICT ['Utilization']
+    n_beams, n_combos, n_spans = utilization_ARR.shape
+    flat_ARR = np.nan_to_num (utilization_ARR.reshape (n_beams, -1), nan=-np.inf)
+    worst_ARR = flat_ARR.argmax (axis=1)
+    combo_ARR, span_ARR = np.divmod (worst_ARR, n_spans)
+    beams_ARR = np.arange (n_beams)
+    failed_ARR = np.isnan (checked_DICT ['Deflection']).any (axis=(1, 2))
+
+    ret_DICT = {
+        'Pass': ~failed_ARR & ~(np.nan_to_num (utilization_ARR, nan=0.0) > 1.0).any (axis=(1, 2)),
+        'Utilization': np.where (failed_ARR, np.nan, utilization_ARR [beams_ARR, combo_ARR, span_ARR]),
+        'Governing': np.array (combo_names_LIST, dtype=object) [combo_ARR],
+        'Span': span_ARR,
+        'Cantilever': checked_DICT ['Cantilever'][beams_ARR, span_ARR],
+        'Length': checked_DICT ['Length'][beams_ARR, span_ARR],
+        'Deflection': checked_DICT ['Deflection'][beams_ARR, combo_ARR, span_ARR],
+        'Allowable': checked_DICT ['Allowable'][beams_ARR, combo_ARR, span_ARR],
+    }
+    with np.errstate (invalid='ignore'):
+        for j, combo_name in enumerate (combo_names_LIST):
+            ret_DICT [f"{combo_name} Utilization"] = np.where (failed_ARR, np.nan, np.nan_to_num (utilization_ARR [:, j], nan=0.0).max (axis=1))
+    return ret_DICT
+
+
+def check_deflections (
+    beams:Iterable [dict | Beam],
+    combos_DICT:dict=SERVICE_COMBOS,
+    limits_DICT:dict=DEFLECTION_LIMITS,
+    n_stations:int=101,
+    backend:str='pynite',
+    cantilever_factor:float=CANTILEVER_FACTOR
+) -> dict [str, np.ndarray]:
+    '''
+    Checks the span / deflection limits in 'limits_DICT' (one per combination in 'combos_DICT') for every span of every beam
+    in 'beams', and returns the pass/fail table of get_table with the beams' 'Name' and 'Error' columns added first.
+    Only the analysis is done beam by beam (see sample_service_deflections); the checks are vectorized across the batch.
+    '''
+    missing_LIST = [combo_name for combo_name in combos_DICT if combo_name not in limits_DICT]
+    if missing_LIST:
+        raise ValueError (f"No deflection limit for the combinations {missing_LIST}")
+    samples_DICT = sample_service_deflections (beams, combos_DICT, n_stations, backend=backend)
+    checked_DICT = check_span_deflections (
+        samples_DICT ['x'], samples_DICT ['Deflection'], samples_DICT ['Supports'],
+        [limits_DICT [combo_name] for combo_name in combos_DICT], cantilever_factor)
+
+    ret_DICT = {
+        'Name': np.array (samples_DICT ['Names'], dtype=object),
+        'Error': np.array (samples_DICT ['Error'], dtype=object),
+    }
+    ret_DICT.update (get_table (checked_DICT, list (combos_DICT)))
+    return ret_DICT
@@ -0,0 +1,98 @@
+import math
+import numpy as np
+
+# Singularity (Macaulay) functions: a load term (coefficient, location, power) stands for coefficient * <x - location>^power,
+# which is 0 for x < location.
+
+# n! / (n + order)! is needed when integrating a singularity term <x-a>^n 'order' times
+FACTORIALS = np.array ([math.factorial (n) for n in range (12)], dtype=float)
+
+
+def get_load_terms (loads_LIST:list [dict]) -> list [tuple [float, float, int]]:
+    '''
+    Converts a list of load dicts (as returned by beams.parse_loads) into singularity function terms
+    (coefficient, location, power), such that the shear from the loads is V(x) = sum (coefficient * <x - location>^power).
+    Upward loads are positive.
+    Distributed loads may vary linearly from 'Start Magnitude' to 'End Magnitude'.
+    '''
+    ret_LIST = []
+    for load_DICT in loads_LIST:
+        if load_DICT ['Type'] == 'Point':
+            ret_LIST.append ((load_DICT ['Magnitude'], load_DICT ['Location'], 0))
+        elif load_DICT ['Type'] == 'Dist':
+            w1 = load_DICT ['Start Magnitude']
+            w2 = load_DICT ['End Magnitude']
+            x1 = load_DICT ['Start Location']
+            x2 = load_DICT ['End Location']
+            slope = (w2 - w1) / (x2 - x1)
+            ret_LIST.append ((w1, x1, 1))
+            ret_LIST.append ((-w2, x2, 1))
+            if slope != 0:
+                ret_LIST.append ((slope / 2, x1, 2))
+                ret_LIST.append ((-slope / 2, x2, 2))
+    return ret_LIST
+
+
+def integrate_terms (
+    x:np.ndarray,
+    coefs:np.ndarray,
+    locations:np.ndarray,
+    powers:np.ndarray,
+    order:int,
+    left_limit:bool=False
+) -> np.ndarray:
+    '''
+    Returns the sum of the singularity terms integrated 'order' times, evaluated at the stations 'x'.
+    'x' has shape (n_beams, n_stations); the term arrays have shape (n_beams, n_terms).
+    With 'left_limit' set, a step at a station is not yet counted, i.e. the value just to the left is returned.
+    '''
+    d = x [:, :, None] - locations [:, None, :]
+    new_powers = powers [:, None, :] + order
+    factor = FACTORIALS [powers] / FACTORIALS [powers + order]
+    if left_limit:
+        mask = d > 0
+    else:
+        mask = d >= 0
+    values = np.where (mask, np.power (np.where (mask, d, 0.0), new_powers), 0.0)
+    return np.einsum ('nmt,nt->nm', values, coefs * factor)
+
+
+def sample_diagrams (
+    x:np.ndarray,
+    start:float | np.ndarray,
+    force_coefs:np.ndarray,
+    force_locations:np.ndarray,
+    force_powers:np.ndarray,
+    couple_coefs:np.ndarray,
+    couple_locations:np.ndarray,
+    y0:np.ndarray,
+    rotation0:np.ndarray,
+    EI:float | np.ndarray,
+    left_limit:bool=False
+) -> dict:
+    '''
+    Returns the shear, moment and deflection diagrams of beams in equilibrium, evaluated at the stations 'x' (shape (n_beams, n_stations)),
+    with the same sign conventions as PyNite ('Fy', 'Mz' and 'dy' for a beam along the X axis).
+    Returns: ret_DICT - ie {'Shear': array, 'Moment': array, 'Deflection': array}, each of the same shape as 'x'
+    Params:
+    'start' - the start of each beam, where the deflection is 'y0' and the slope is 'rotation0' (arrays of shape (n_beams,))
+    'force_coefs', 'force_locations', 'force_powers' - every load and reaction as shear terms (see get_load_terms), shape (n_beams, n_terms)
+    'couple_coefs', 'couple_locations' - every applied and reaction moment (counterclockwise is positive), shape (n_beams, n_couples)
+    'left_limit' - see integrate_terms
+    '''
+    couple_powers = np.zeros (couple_coefs.shape, dtype=int)
+    # a counterclockwise couple on the left of a section is a hogging step in the moment
+    shear = integrate_terms (x, force_coefs, force_locations, force_powers, 0, left_limit)
+    sagging_moment = (
+        integrate_terms (x, force_coefs, force_locations, force_powers, 1, left_limit)
+        - integrate_terms (x, couple_coefs, couple_locations, couple_powers, 0, left_limit))
+    deflection = y0 [:, None] + rotation0 [:, None] * (x - np.reshape (start, (-1, 1))) + (
+        integrate_terms (x, force_coefs, force_locations, force_powers, 3)
+        - integrate_terms (x, couple_coefs, couple_locations, couple_powers, 2)) / np.reshape (EI, (-1, 1))
+
+    ret_DICT = {
+        'Shear': shear,
+        'Moment': -sagging_moment, # PyNite's 'Mz' is negative for sagging
+        'Deflection': deflection,
+    }
+    return ret_DICT
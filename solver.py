@@ -0,0 +1,106 @@
+import functools
+import inspect
+from numpy import subtract
+from scipy.sparse.linalg import splu
+from PyNite import Analysis, FEModel3D
+from eng_module import profiling
+
+# The private parts of PyNite (tested with PyNiteFEA 0.0.94, pinned in requirements.txt) that factor_stiffness and
+# solve_load_combos use, and the parameters each must take (see check_pynite_internals)
+PYNITE_INTERNALS = {
+    (Analysis, '_prepare_model'): ('model',),
+    (Analysis, '_partition_D'): ('model',),
+    (Analysis, '_partition'): ('model', 'unp_matrix', 'D1_indices', 'D2_indices'),
+    (Analysis, '_renumber'): ('model',),
+    (Analysis, '_store_displacements'): ('model', 'D1', 'D2', 'D1_indices', 'D2_indices', 'combo'),
+    (Analysis, '_calc_reactions'): ('model', 'log', 'combo_tags'),
+    (FEModel3D, 'K'): ('self', 'combo_name', 'log', 'check_stability', 'sparse'),
+    (FEModel3D, 'FER'): ('self', 'combo_name'),
+    (FEModel3D, 'P'): ('self', 'combo_name'),
+}
+
+
+@functools.cache
+def check_pynite_internals () -> None:
+    '''
+    Raises a RuntimeError naming every function in PYNITE_INTERNALS that the installed PyNite doesn't have,
+    or whose parameters have changed, so that a PyNite upgrade fails here rather than part way through a solve
+    '''
+    problems_LIST = []
+    for (owner, name), params_TUPLE in PYNITE_INTERNALS.items ():
+        function = getattr (owner, name, None)
+        if function is None:
+            problems_LIST.append (f"{owner.__name__}.{name} is missing")
+        elif tuple (inspect.signature (function).parameters) != params_TUPLE:
+            problems_LIST.append (f"{owner.__name__}.{name} takes {tuple (inspect.signature (function).parameters)}, expected {params_TUPLE}")
+    if problems_LIST:
+        raise RuntimeError (f"This PyNite isn't compatible with eng_module.solver (see requirements.txt): {'; '.join (problems_LIST)}")
+
+
+@profiling.timed (profiling.SOLVE)
+def factor_stiffness (the_model:FEModel3D) -> dict:
+    '''
+    Prepares 'the_model' for a linear analysis, assembles its global stiffness matrix once and returns its sparse LU factorization:
+    {
+        'D1 indices': <the unknown degrees of freedom>,
+        'D2 indices': <the supported degrees of freedom>,
+        'D2': <the enforced displacements>,
+        'K12': <the coupling block of the partitioned stiffness matrix>,
+        'LU': <the scipy.sparse.linalg.splu factorization of the free block, K11>
+    }
+    The model must already have every load combination it will be solved for.
+    This follows FEModel3D.analyze_linear, except that K11 is factored rather than solved, so any number of load vectors
+    can then be solved with a back-substitution each (see 'solve_load_combos').
+    Raises a RuntimeError if the installed PyNite isn't compatible (see check_pynite_internals).
+    '''
+    check_pynite_internals ()
+    Analysis._prepare_model (the_model)
+    D1_indices, D2_indices, D2 = Analysis._partition_D (the_model)
+
+    # for a linear analysis the stiffness matrix is the same for every load combination
+    combo_name = next (iter (the_model.LoadCombos))
+    K = the_model.K (combo_name, log=False, check_stability=False, sparse=True).tolil ()
+    K11, K12, K21, K22 = Analysis._partition (the_model, K, D1_indices, D2_indices)
+    try:
+        LU = splu (K11.tocsc ())
+    except RuntimeError:
+        raise Exception ('The stiffness matrix is singular, which implies rigid body motion. The structure is unstable. Aborting analysis.')
+
+    ret_DICT = {
+        'D1 indices': D1_indices,
+        'D2 indices': D2_indices,
+        'D2': D2,
+        'K12': K12.tocsr (),
+        'LU': LU,
+    }
+    return ret_DICT
+
+
+@profiling.timed (profiling.SOLVE)
+def solve_load_combos (the_model:FEModel3D, factored_DICT:dict) -> FEModel3D:
+    '''
+    Solves every load combination of 'the_model' with the factorization from 'factor_stiffness',
+    then stores the displacements and reactions on the model just like FEModel3D.analyze_linear.
+    Loads may be changed between calls (as long as the combination names don't) without re-factoring.
+    Returns the solved model.
+    '''
+    D1_indices = factored_DICT ['D1 indices']
+    D2_indices = factored_DICT ['D2 indices']
+    D2 = factored_DICT ['D2']
+    K12_D2 = factored_DICT ['K12'] @ D2
+
+    # the sub-members hold their own copies of the member loads, made when the model was prepared
+    Analysis._renumber (the_model)
+
+    for combo in the_model.LoadCombos.values ():
+        FER1, FER2 = Analysis._partition (the_model, the_model.FER (combo.name), D1_indices, D2_indices)
+        P1, P2 = Analysis._partition (the_model, the_model.P (combo.name), D1_indices, D2_indices)
+        if len (D1_indices) == 0:
+            D1 = []
+        else:
+            D1 = factored_DICT ['LU'].solve (subtract (subtract (P1, FER1), K12_D2))
+        Analysis._store_displacements (the_model, D1, D2, D1_indices, D2_indices, combo)
+
+    Analysis._calc_reactions (the_model)
+    the_model.solution = 'Linear'
+    return the_model
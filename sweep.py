@@ -0,0 +1,213 @@
+import collections
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+import numpy as np
+from eng_module.beams import build_beam, get_model_results
+from eng_module.model_cache import ModelTemplateCache
+from eng_module.records import Beam, to_beam_dict
+
+# The parameters that can be swept (see apply_parameters):
+#   'L', 'E', 'I', 'Iz', 'Iy', 'A', 'J', 'nu', 'rho' - the beam attributes
+#   'Support <i>' - the location of the i'th support along the beam (0-based)
+#   'Load <i>' - the magnitude of the i'th load (0-based); for a distributed load, the magnitude of its larger end,
+#                the other end scaled to keep its shape
+#   'Load factor' - multiplies every load
+ATTRIBUTE_PARAMETERS = ('L', 'E', 'I', 'Iz', 'Iy', 'A', 'J', 'nu', 'rho')
+RESULT_NAMES = ('Max Moment', 'Min Moment', 'Max Shear', 'Min Shear', 'Max Deflection', 'Min Deflection')
+
+# each worker process keeps its own templates between chunks
+_worker_cache = None
+
+
+def is_load_parameter (name:str) -> bool:
+    return name.startswith ('Load')
+
+
+def apply_parameters (base_beam_DICT:dict, parameters_DICT:dict [str, float]) -> dict:
+    '''
+    Returns a copy of 'base_beam_DICT' (as returned by beams.get_structured_beam_data) with 'parameters_DICT' applied
+    (see ATTRIBUTE_PARAMETERS and the comments above it). 'base_beam_DICT' isn't changed.
+    'Support <i>' and 'Load <i>' always refer to the supports and loads of 'base_beam_DICT', as 'L' is applied last:
+    a support or load location at the end of the beam stays at the end when 'L' changes, and the part of a load
+    that ends up off a shorter beam is cut off (see _move_load_ends).
+    Raises a ValueError for an unknown parameter, for a support off the beam, or for a 'Load <i>' that is cut off entirely.
+    '''
+    ret_DICT = dict (base_beam_DICT)
+    supports_LIST = sorted (base_beam_DICT ['Supports'].items ())
+    loads_LIST = [dict (load_DICT) for load_DICT in base_beam_DICT ['Loads']]
+    moved_supports_SET = set ()
+    swept_loads_SET = set ()
+
+    for name, value in parameters_DICT.items ():
+        if name in ATTRIBUTE_PARAMETERS:
+            ret_DICT [name] = value
+        elif name.startswith ('Support '):
+            i = int (name.split () [1])
+            supports_LIST [i] = (value, supports_LIST [i][1])
+            moved_supports_SET.add (i)
+        elif name == 'Load factor':
+            for load_DICT in loads_LIST:
+                for key in ('Magnitude', 'Start Magnitude', 'End Magnitude'):
+                    if key in load_DICT:
+                        load_DICT [key] *= value
+        elif name.startswith ('Load '):
+            i = int (name.split () [1])
+            load_DICT = loads_LIST [i]
+            swept_loads_SET.add (i)
+            if load_DICT ['Type'] == 'Point':
+                load_DICT ['Magnitude'] = value
+            else:
+                peak = max (load_DICT ['Start Magnitude'], load_DICT ['End Magnitude'], key=abs)
+                if peak:
+                    load_DICT ['Start Magnitude'] *= value / peak
+                    load_DICT ['End Magnitude'] *= value / peak
+                else:
+                    load_DICT ['Start Magnitude'] = load_DICT ['End Magnitude'] = value
+        else:
+            raise ValueError (f"Unknown sweep parameter '{name}'")
+
+    L = ret_DICT ['L']
+    if L != base_beam_DICT ['L']:
+        supports_LIST = [
+            (L if location == base_beam_DICT ['L'] and i not in moved_supports_SET else location, support_type)
+            for i, (location, support_type) in enumerate (supports_LIST)]
+        loads_LIST = _move_load_ends (loads_LIST, base_beam_DICT ['L'], L)
+        cut_off_LIST = [i for i in sorted (swept_loads_SET) if loads_LIST [i] is None]
+        if cut_off_LIST:
+            raise ValueError (f"Loads {cut_off_LIST} are off the beam once L is {L:g}")
+        loads_LIST = [load_DICT for load_DICT in loads_LIST if load_DICT is not None]
+    off_beam_LIST = [location for location, _ in supports_LIST if not 0 <= location <= L]
+    if off_beam_LIST:
+        raise ValueError (f"The supports at {off_beam_LIST} are off the beam, which is 0 to {L:g} long")
+
+    ret_DICT ['Supports'] = dict (sorted (supports_LIST))
+    ret_DICT ['Loads'] = loads_LIST
+    return ret_DICT
+
+
+def _move_load_ends (loads_LIST:list [dict], old_L:float, new_L:float) -> list [dict | None]:
+    '''
+    Returns 'loads_LIST' for a beam whose length changes from 'old_L' to 'new_L', load for load,
+    with None in place of each load that is entirely off a shorter beam
+    '''
+    ret_LIST = []
+    for load_DICT in loads_LIST:
+        if load_DICT ['Type'] == 'Point':
+            location = new_L if load_DICT ['Location'] == old_L else load_DICT ['Location']
+            ret_LIST.append (load_DICT | {'Location': location} if location <= new_L else None)
+            continue
+        x1 = load_DICT ['Start Location']
+        x2 = new_L if load_DICT ['End Location'] == old_L else load_DICT ['End Location']
+        if x1 >= new_L:
+            ret_LIST.append (None)
+            continue
+        w1 = load_DICT ['Start Magnitude']
+        w2 = load_DICT ['End Magnitude']
+        if x2 > new_L: # keep the load's linear variation up to where the beam now ends
+            w2 = w1 + (w2 - w1) * (new_L - x1) / (x2 - x1)
+            x2 = new_L
+        ret_LIST.append (load_DICT | {'End Location': x2, 'End Magnitude': w2})
+    return ret_LIST
+
+
+def iter_variants (
+    ranges_DICT:dict [str, Iterable [float]] | None=None,
+    samples:Iterable [dict [str, float]] | None=None
+) -> Iterator [dict [str, float]]:
+    '''
+    Lazily yields the parameters of each variant: every combination of the values in 'ranges_DICT' (a Cartesian product),
+    then each of the sample points in 'samples' (ie from a Latin hypercube), as they are.
+    In the product the load parameters change fastest, so that variants with the same geometry come one after another.
+    '''
+    if ranges_DICT:
+        names_LIST = sorted (ranges_DICT, key=is_load_parameter) # a stable sort: the geometry first, in the given order
+        for values_TUPLE in itertools.product (*(list (ranges_DICT [name]) for name in names_LIST)):
+            yield dict (zip (names_LIST, values_TUPLE))
+    if samples is not None:
+        for parameters_DICT in samples:
+            yield dict (parameters_DICT)
+
+
+def solve_variants (base_beam_DICT:dict, variants_LIST:list [dict], backend:str='pynite', max_templates:int=128) -> list [dict]:
+    '''
+    Solves each variant of 'base_beam_DICT' in 'variants_LIST' and returns a row for it: its parameters, then
+    beams.get_model_results and an 'Error' item, which is None unless that variant failed.
+    With the 'pynite' backend, variants with the same geometry share one factored stiffness matrix (see model_cache.ModelTemplateCache).
+    This is the unit of work sent to each worker process.
+    '''
+    global _worker_cache
+    if _worker_cache is None or _worker_cache.max_entries != max_templates:
+        _worker_cache = ModelTemplateCache (max_templates)
+
+    ret_LIST = []
+    for parameters_DICT in variants_LIST:
+        row_DICT = dict (parameters_DICT)
+        row_DICT ['Error'] = None
+        try:
+            beam_DICT = apply_parameters (base_beam_DICT, parameters_DICT)
+            if backend == 'pynite':
+                row_DICT.update (_worker_cache.analyze (beam_DICT))
+            else:
+                the_model = build_beam (beam_DICT, backend=backend)
+                the_model.analyze ()
+                row_DICT.update (get_model_results (the_model))
+        except Exception as err:
+            row_DICT ['Error'] = f"{type (err).__name__}: {err}"
+        ret_LIST.append (row_DICT)
+    return ret_LIST
+
+
+def run_sweep (
+    base_beam_DICT:dict | Beam,
+    ranges_DICT:dict [str, Iterable [float]] | None=None,
+    samples:Iterable [dict [str, float]] | None=None,
+    max_workers:int | None=None,
+    chunk_size:int=64,
+    backend:str='pynite'
+) -> list [dict]:
+    '''
+    Solves every variant of 'base_beam_DICT' (see iter_variants and apply_parameters) without writing any files,
+    across a pool of worker processes, and returns one row per variant, in the order of iter_variants (see solve_variants).
+    Params:
+    'max_workers' - the number of worker processes; None uses every CPU, 1 runs in this process
+    'chunk_size' - the number of variants sent to a worker at a time; consecutive variants with the same geometry
+        in one chunk share their stiffness matrix
+    'backend' - 'pynite', or 'planar' for beams with many spans (see beams.build_beam)
+    Example:
+        run_sweep (beam_DICT, {'L': [4000, 5000, 6000], 'Iz': [50e6, 80e6], 'Load 0': np.linspace (-5000, -20000, 4)})
+    '''
+    base_beam_DICT = to_beam_dict (base_beam_DICT)
+    if chunk_size < 1:
+        raise ValueError (f"chunk_size must be at least 1, got {chunk_size}")
+    variants_ITER = iter_variants (ranges_DICT, samples)
+    chunks_ITER = iter (lambda: list (itertools.islice (variants_ITER, chunk_size)), [])
+
+    if max_workers == 1:
+        return [row_DICT for chunk_LIST in chunks_ITER for row_DICT in solve_variants (base_beam_DICT, chunk_LIST, backend)]
+
+    # only a bounded window of chunks is in flight at a time, so the variants are still generated lazily;
+    # the oldest chunk is waited on first, to keep the rows in order
+    max_chunks = 2 * (max_workers or os.cpu_count () or 1)
+    ret_LIST = []
+    with ProcessPoolExecutor (max_workers=max_workers) as pool:
+        futures_DEQUE = collections.deque (pool.submit (solve_variants, base_beam_DICT, chunk_LIST, backend) for chunk_LIST in itertools.islice (chunks_ITER, max_chunks))
+        while futures_DEQUE:
+            ret_LIST.extend (futures_DEQUE.popleft ().result ())
+            for chunk_LIST in itertools.islice (chunks_ITER, 1):
+                futures_DEQUE.append (pool.submit (solve_variants, base_beam_DICT, chunk_LIST, backend))
+    return ret_LIST
+
+
+def to_columns (rows_LIST:list [dict]) -> dict [str, np.ndarray]:
+    '''
+    Returns the rows from 'run_sweep' as columns: a float array for each parameter and result (NaN where a variant failed),
+    plus the 'Error' column as an object array
+    '''
+    names_LIST = list (dict.fromkeys (name for row_DICT in rows_LIST for name in row_DICT if name not in ('Reactions', 'Error') and name not in RESULT_NAMES))
+    ret_DICT = {}
+    for name in names_LIST + list (RESULT_NAMES):
+        ret_DICT [name] = np.array ([row_DICT.get (name, np.nan) for row_DICT in rows_LIST], dtype=float)
+    ret_DICT ['Error'] = np.array ([row_DICT ['Error'] for row_DICT in rows_LIST], dtype=object)
+    return ret_DICT
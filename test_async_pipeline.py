@@ -0,0 +1,52 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import eng_module.async_pipeline as async_pipeline
+import eng_module.batch as batch
+
+
+def write_beam_file (the_path, the_name:str, span:float) -> str:
+    the_path.write_text (
+        f"{the_name}\n"
+        f"{span}, 200000, 437000000, 1, 1\n"
+        f"0:P, {span}:R\n"
+        f"POINT:Fy, -10000, {span / 2}, case:Live\n"
+    )
+    return str (the_path)
+
+
+def test_pipeline_matches_batch_and_overlaps_reads (tmp_path):
+    filenames_LIST = [write_beam_file (tmp_path / f"beam_{i}.txt", f"B{i}", 3000 + i * 100) for i in range (24)]
+    (tmp_path / "broken.txt").write_text ("Broken beam\n")
+    filenames_LIST += [str (tmp_path / "broken.txt"), str (tmp_path / "missing.txt")]
+    source = async_pipeline.LatencyFileSource (latency=0.1)
+
+    start = time.perf_counter ()
+    results_LIST = async_pipeline.analyze_files (filenames_LIST, source=source, max_reads=8, max_workers=1, queue_size=4)
+    elapsed = time.perf_counter () - start
+    assert elapsed < 0.5 * len (filenames_LIST) * source.latency # the reads were not one after another
+    assert source.reads == len (filenames_LIST) and source.peak_reads == 8
+
+    results_DICT = {result_DICT ['File']: result_DICT for result_DICT in results_LIST}
+    assert len (results_LIST) == len (results_DICT) == len (filenames_LIST)
+    assert results_DICT [str (tmp_path / "broken.txt")]['Error'].startswith ('BeamFileError')
+    assert results_DICT [str (tmp_path / "missing.txt")]['Error'].startswith ('FileNotFoundError')
+    for result_DICT in batch.analyze_beam_files (filenames_LIST [:24]):
+        assert results_DICT [result_DICT ['File']] == result_DICT
+
+
+def test_slow_analysis_holds_the_reads_back (tmp_path):
+    filenames_LIST = [write_beam_file (tmp_path / f"beam_{i}.txt", f"B{i}", 4000) for i in range (60)]
+    source = async_pipeline.LatencyFileSource (latency=0.0)
+
+    async def consume () -> int:
+        n_results = 0
+        async for result_DICT in async_pipeline.run_pipeline (
+                filenames_LIST, source=source, max_reads=2, max_workers=1, queue_size=2, executor=ThreadPoolExecutor (1)):
+            n_results += 1
+            if n_results == 5:
+                await asyncio.sleep (0.2)
+                # the consumer stalled, so the queues filled up and the reads stopped well short of the end
+                assert source.reads < 30
+        return n_results
+    assert asyncio.run (consume ()) == 60
@@ -0,0 +1,56 @@
+import eng_module.batch as batch
+
+
+def write_beam_file (the_path, the_name:str, span:float) -> str:
+    the_path.write_text (
+        f"{the_name}\n"
+        f"{span}, 200000, 437000000, 1, 1\n"
+        f"0:P, {span}:R\n"
+        f"POINT:Fy, -10000, {span / 2}, case:Live\n"
+    )
+    return str (the_path)
+
+
+def test_find_beam_files (tmp_path):
+    write_beam_file (tmp_path / "b.txt", "B", 4000)
+    write_beam_file (tmp_path / "a.txt", "A", 4000)
+    (tmp_path / "notes.md").write_text ("not a beam")
+    assert batch.find_beam_files (str (tmp_path)) == [str (tmp_path / "a.txt"), str (tmp_path / "b.txt")]
+    assert batch.find_beam_files (str (tmp_path / "a*")) == [str (tmp_path / "a.txt")]
+
+
+def test_analyze_beam_file (tmp_path):
+    result_DICT = batch.analyze_beam_file (write_beam_file (tmp_path / "a.txt", "Floor beam", 4000))
+    assert result_DICT ['Error'] is None
+    assert result_DICT ['Name'] == 'Floor beam'
+    assert round (result_DICT ['Reactions'][0.0], 6) == 5000.0
+    assert round (result_DICT ['Reactions'][4000.0], 6) == 5000.0
+    assert round (result_DICT ['Min Moment']) == -10000 * 4000 / 4
+
+
+def test_run_batch_isolates_errors (tmp_path):
+    filenames_LIST = [write_beam_file (tmp_path / f"beam_{i}.txt", f"B{i}", 3000 + i * 500) for i in range (5)]
+    (tmp_path / "broken.txt").write_text ("Broken beam\n")
+    results_LIST = list (batch.run_batch (str (tmp_path), max_workers=2, chunk_size=2))
+    assert len (results_LIST) == 6
+    errors_LIST = [result for result in results_LIST if result ['Error']]
+    assert [result ['File'] for result in errors_LIST] == [str (tmp_path / "broken.txt")]
+    assert sorted (result ['File'] for result in results_LIST if not result ['Error']) == filenames_LIST
+
+
+def test_run_batch_in_process (tmp_path):
+    filenames_LIST = [write_beam_file (tmp_path / f"beam_{i}.txt", f"B{i}", 4000) for i in range (3)]
+    results_LIST = list (batch.run_batch (filenames_LIST, max_workers=1))
+    assert [result ['File'] for result in results_LIST] == filenames_LIST
+
+
+def test_cache_is_opened_once_per_process (tmp_path, monkeypatch):
+    filenames_LIST = [write_beam_file (tmp_path / f"beam_{i}.txt", f"B{i}", 4000) for i in range (4)]
+    cache_dir = str (tmp_path / "cache")
+    scans_LIST = []
+    scandir = batch.os.scandir
+    monkeypatch.setattr (batch.os, 'scandir', lambda path: scans_LIST.append (path) or scandir (path))
+    results_LIST = list (batch.run_batch (filenames_LIST, max_workers=1, chunk_size=1, cache_dir=cache_dir))
+    assert all (result ['Error'] is None for result in results_LIST)
+    assert batch._worker_caches [cache_dir]._n_entries == 4
+    assert len (scans_LIST) == 1 # the entries were counted once, not once per chunk
@@ -160,4 +160,64 @@ def test_get_structured_beam_data ():
     'End Magnitude': 30.0,
     'Start Location': 0.0,
     'End Location': 4800.0,
-    'Case': 'Dead'}]}
\ No newline at end of file
+    'Case': 'Dead'}]}
+
+
+def test_iter_beam_file (tmp_path):
+    the_file = tmp_path / "beams.txt"
+    the_file.write_text (
+        "Balcony transfer\n4800, 24500, 1200000000, 1, 1\n1000:P, 3800:R\nPOINT:Fy, -10000, 4800, case:Live\n"
+        "---\n"
+        "Roof beam\n6000, 200000, 80000000\n0:P, 6000:R\nDIST:Fy, -5, -5, 0, 6000, case:Dead\n"
+    )
+    beams_LIST = list (beams.iter_beam_file (str (the_file)))
+    assert [beam_DICT ['Name'] for beam_DICT in beams_LIST] == ['Balcony transfer', 'Roof beam']
+    assert beams_LIST [0]['Supports'] == {1000.0: 'P', 3800.0: 'R'}
+    assert beams_LIST [1]['Loads'] == [{'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -5.0, 'Start Location': 0.0, 'End Location': 6000.0, 'Case': 'Dead'}]
+
+
+def test_get_mesh_locations ():
+    supports_DICT = {1000.0: 'P', 3800.0: 'R'}
+    loads_LIST = [
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'},
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': 30.0, 'End Magnitude': 30.0, 'Start Location': 0.0, 'End Location': 3800.0, 'Case': 'Dead'},
+    ]
+    assert beams.get_mesh_locations (4800.0, supports_DICT) == [0.0, 1000.0, 3800.0, 4800.0]
+    assert beams.get_mesh_locations (4800.0, supports_DICT, loads_LIST) == [0.0, 1000.0, 2000.0, 3800.0, 4800.0]
+    assert beams.get_mesh_locations (4800.0, supports_DICT, n_segments=4) == [0.0, 1000.0, 1200.0, 2400.0, 3600.0, 3800.0, 4800.0]
+
+
+def test_build_beam_member_spans_the_full_length ():
+    beam_DICT = {
+        'Name': 'Cantilever', 'L': 3000.0, 'E': 200000.0, 'Iz': 50e6, 'Iy': 1, 'A': 1, 'J': 1, 'nu': 0.3, 'rho': 1,
+        'Supports': {0.0: 'F'},
+        'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -1000.0, 'Location': 3000.0, 'Case': 'Live'}]}
+    the_model = beams.build_beam (beam_DICT, nodes_at_loads=True, n_segments=3)
+    assert the_model.Members ['M0'].L () == 3000.0
+    assert len (the_model.Nodes) == 4
+    the_model.analyze_linear (check_stability=False)
+    assert math.isclose (the_model.Nodes ['N0'].RxnMZ ['Combo 1'], 3000000.0)
+    assert math.isclose (min (beams.sample_model_results (the_model) ['Deflection']), -1000.0 * 3000.0**3 / (3 * 200000.0 * 50e6))
+
+
+def test_sample_model_results_matches_pynite ():
+    beam_DICT = {
+        'Name': 'Floor beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+        'Supports': {1000.0: 'P', 4000.0: 'R', 6000.0: 'R'},
+        'Loads': [
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -12.0, 'Start Location': 500.0, 'End Location': 5500.0, 'Case': 'Dead'},
+            {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2100.0, 'Case': 'Live'},
+        ]}
+    the_model = beams.build_beam (beam_DICT, load_cases=True, n_segments=5)
+    the_model.add_load_combo ('Dead', {'Dead': 1.0})
+    the_model.add_load_combo ('1.25D+1.5L', {'Dead': 1.25, 'Live': 1.5})
+    the_model.analyze_linear (check_stability=False)
+    samples_DICT = beams.sample_model_results (the_model, 41, ['Dead', '1.25D+1.5L'])
+    assert samples_DICT ['Moment'].shape == (2, 41)
+
+    member = the_model.Members ['M0']
+    for i, combo_name in enumerate (['Dead', '1.25D+1.5L']):
+        for j, x in enumerate (samples_DICT ['x']):
+            assert math.isclose (samples_DICT ['Moment'][i, j], member.moment ('Mz', x, combo_name), rel_tol=1e-6, abs_tol=1e-3)
+            assert math.isclose (samples_DICT ['Shear'][i, j], member.shear ('Fy', x, combo_name), rel_tol=1e-6, abs_tol=1e-6)
+            assert math.isclose (samples_DICT ['Deflection'][i, j], member.deflection ('dy', x, combo_name), rel_tol=1e-6, abs_tol=1e-9)
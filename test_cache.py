@@ -0,0 +1,45 @@
+import os
+import eng_module.cache as cache
+
+
+BEAM_TEXT = "Roof beam\n6000, 200000, 80000000\n0:P, 6000:R\nDIST:Fy, -5, -5, 0, 6000, case:Dead\n"
+
+
+def test_read_beams_hits_after_first_read (tmp_path):
+    the_file = tmp_path / "beam.txt"
+    the_file.write_text (BEAM_TEXT)
+    the_cache = cache.BeamFileCache (str (tmp_path / "cache"))
+    cold_LIST = the_cache.read_beam_dicts (str (the_file))
+    warm_LIST = the_cache.read_beam_dicts (str (the_file))
+    assert warm_LIST == cold_LIST
+    assert warm_LIST [0]['Supports'] == {0.0: 'P', 6000.0: 'R'}
+    assert (the_cache.hits, the_cache.misses) == (1, 1)
+
+
+def test_changed_file_is_reparsed (tmp_path):
+    the_file = tmp_path / "beam.txt"
+    the_file.write_text (BEAM_TEXT)
+    the_cache = cache.BeamFileCache (str (tmp_path / "cache"))
+    the_cache.read_beams (str (the_file))
+
+    os.utime (the_file, ns=(1, 1)) # touched, same contents
+    assert the_cache.read_beams (str (the_file)).names == ['Roof beam']
+    assert (the_cache.hits, the_cache.misses) == (1, 1)
+
+    the_file.write_text (BEAM_TEXT.replace ("Roof beam", "Floor beam"))
+    assert the_cache.read_beams (str (the_file)).names == ['Floor beam']
+    assert (the_cache.hits, the_cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entries_are_evicted (tmp_path):
+    the_cache = cache.BeamFileCache (str (tmp_path / "cache"), max_entries=2)
+    filenames_LIST = []
+    for i in range (3):
+        the_file = tmp_path / f"beam_{i}.txt"
+        the_file.write_text (BEAM_TEXT)
+        filenames_LIST.append (str (the_file))
+        the_cache.read_beams (str (the_file))
+        os.utime (the_cache.entry_path (str (the_file)), ns=(i, i)) # make the use order unambiguous
+    assert the_cache.evictions >= 1
+    assert not os.path.exists (the_cache.entry_path (filenames_LIST [0]))
+    assert os.path.exists (the_cache.entry_path (filenames_LIST [2]))
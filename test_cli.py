@@ -0,0 +1,42 @@
+import csv
+import eng_module.cli as cli
+
+
+def write_beam_file (the_path, the_name:str, span:float) -> str:
+    the_path.write_text (
+        f"{the_name}\n"
+        f"{span}, 200000, 437000000, 1, 1\n"
+        f"0:P, {span}:R\n"
+        f"POINT:Fy, -10000, {span / 2}, case:Live\n"
+    )
+    return str (the_path)
+
+
+def test_shards_split_the_files_without_overlap ():
+    filenames_LIST = [f"project/level_{i // 10}/beam_{i}.txt" for i in range (200)]
+    shards_LIST = [cli.select_shard (filenames_LIST, i, 4) for i in range (4)]
+    assert sorted (sum (shards_LIST, [])) == sorted (filenames_LIST)
+    assert all (20 < len (shard_LIST) < 80 for shard_LIST in shards_LIST)
+    assert cli.get_shard ("project/./level_0/beam_1.txt", 4) == cli.get_shard ("project/level_0/beam_1.txt", 4)
+    assert cli.parse_shard ('2/4') == (2, 4)
+
+
+def test_run_resumes_from_the_checkpoint_and_merges (tmp_path):
+    filenames_LIST = [write_beam_file (tmp_path / f"beam_{i}.txt", f"B{i}", 3000 + 100 * i) for i in range (12)]
+    outputs_LIST = [str (tmp_path / f"shard_{i}.jsonl") for i in range (2)]
+    assert cli.main (['run', str (tmp_path), '--shard', '0/2', '--output', outputs_LIST [0]]) == 0
+
+    # shard 1 was killed after its first result, part way through writing the second
+    first_DICT = cli.run_files (cli.select_shard (filenames_LIST, 1, 2) [:1], outputs_LIST [1], (1, 2))
+    assert first_DICT ['Done'] == 1
+    with open (outputs_LIST [1], "a") as output_file:
+        output_file.write ('{"File": "half a li')
+    summary_DICT = cli.run_files (filenames_LIST, outputs_LIST [1], (1, 2), jobs=2)
+    assert summary_DICT ['Skipped'] == 1 and summary_DICT ['Done'] == summary_DICT ['Files'] - 1 and summary_DICT ['Failed'] == 0
+
+    assert cli.main (['merge', *outputs_LIST, '--output', str (tmp_path / "results.csv")]) == 0
+    with open (tmp_path / "results.csv", newline='') as csv_file:
+        rows_LIST = list (csv.DictReader (csv_file))
+    assert [row_DICT ['File'] for row_DICT in rows_LIST] == sorted (filenames_LIST)
+    row_DICT = next (row_DICT for row_DICT in rows_LIST if row_DICT ['Name'] == 'B0')
+    assert row_DICT ['Error'] == '' and row_DICT ['Reactions'].split () [0].startswith ('0.0:5000.0')
@@ -0,0 +1,81 @@
+import math
+import eng_module.beams as beams
+import eng_module.closed_form as closed_form
+
+
+def make_beam (supports_DICT:dict, loads_LIST:list [dict], L:float=6000.0) -> dict:
+    return {
+        'Name': 'Test beam', 'L': L, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+        'Supports': supports_DICT,
+        'Loads': loads_LIST}
+
+
+POINT_LOAD = {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'}
+VARYING_LOAD = {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -15.0, 'Start Location': 1000.0, 'End Location': 5500.0, 'Case': 'Dead'}
+
+
+def test_classify_beam ():
+    assert closed_form.classify_beam (make_beam ({0.0: 'P', 6000.0: 'R'}, [POINT_LOAD])) == closed_form.SIMPLE
+    assert closed_form.classify_beam (make_beam ({1000.0: 'P', 3800.0: 'R'}, [POINT_LOAD])) == closed_form.SIMPLE
+    assert closed_form.classify_beam (make_beam ({0.0: 'F'}, [POINT_LOAD])) == closed_form.CANTILEVER_LEFT
+    assert closed_form.classify_beam (make_beam ({6000.0: 'F'}, [POINT_LOAD])) == closed_form.CANTILEVER_RIGHT
+    assert closed_form.classify_beam (make_beam ({0.0: 'P', 3000.0: 'R', 6000.0: 'R'}, [POINT_LOAD])) is None
+    assert closed_form.classify_beam (make_beam ({0.0: 'F', 6000.0: 'R'}, [POINT_LOAD])) is None
+    assert closed_form.classify_beam (make_beam ({0.0: 'P', 6000.0: 'R'}, [POINT_LOAD | {'Direction': 'Fx'}])) is None
+
+
+def test_simple_span_point_load ():
+    results_DICT = closed_form.analyze_beams ([make_beam ({0.0: 'P', 6000.0: 'R'}, [POINT_LOAD | {'Location': 3000.0}])]) [0]
+    assert results_DICT ['Method'] == 'Closed form'
+    assert results_DICT ['Reactions'] == {0.0: 5000.0, 6000.0: 5000.0}
+    assert math.isclose (results_DICT ['Min Moment'], -10000 * 6000 / 4)
+    assert math.isclose (results_DICT ['Min Deflection'], -10000 * 6000**3 / (48 * 200000 * 80e6))
+
+    # the moment of inertia is picked like beams.build_beam picks it, whichever of 'I', 'Iz', 'Ix' and 'Iy' comes first
+    ix_only_DICT = make_beam ({0.0: 'P', 6000.0: 'R'}, [POINT_LOAD | {'Location': 3000.0}])
+    del ix_only_DICT ['Iz'], ix_only_DICT ['Iy']
+    ix_only_DICT ['Ix'] = 80e6
+    assert closed_form.pack_beams ([ix_only_DICT], [closed_form.SIMPLE])['I'].tolist () == [80e6]
+
+
+def test_backspan_and_cantilever_udl ():
+    # matches beam_reactions_ss_cant for a UDL over the backspan and the cantilever
+    b, a = beams.get_spans (6850, 4500)
+    udl = {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -50.0, 'End Magnitude': -50.0, 'Start Location': 0.0, 'End Location': 6850.0, 'Case': 'Dead'}
+    results_DICT = closed_form.analyze_beams ([make_beam ({0.0: 'P', b: 'R'}, [udl], L=6850.0)]) [0]
+    R1, R2 = beams.beam_reactions_ss_cant (50, b, a)
+    assert math.isclose (results_DICT ['Reactions'][b], -R1)
+    assert math.isclose (results_DICT ['Reactions'][0.0], -R2)
+
+
+def test_left_cantilever ():
+    results_DICT = closed_form.analyze_beams ([make_beam ({0.0: 'F'}, [POINT_LOAD | {'Location': 6000.0}])]) [0]
+    assert results_DICT ['Reactions'] == {0.0: 10000.0}
+    assert math.isclose (results_DICT ['Max Moment'], 10000 * 6000)
+    assert math.isclose (results_DICT ['Min Deflection'], -10000 * 6000**3 / (3 * 200000 * 80e6))
+
+
+def test_matches_fe_model ():
+    beam_DICTS_LIST = [
+        make_beam ({0.0: 'P', 6000.0: 'R'}, [POINT_LOAD, VARYING_LOAD]),
+        make_beam ({1500.0: 'P', 6000.0: 'R'}, [POINT_LOAD, VARYING_LOAD]),
+        make_beam ({6000.0: 'F'}, [POINT_LOAD, VARYING_LOAD]),
+    ]
+    for beam_DICT, results_DICT in zip (beam_DICTS_LIST, closed_form.analyze_beams (beam_DICTS_LIST)):
+        the_model = beams.build_beam (beam_DICT)
+        the_model.analyze ()
+        fe_results_DICT = beams.get_model_results (the_model)
+        for support_location, reaction in fe_results_DICT ['Reactions'].items ():
+            assert math.isclose (results_DICT ['Reactions'][support_location], reaction, rel_tol=1e-9)
+        for quantity in ('Moment', 'Shear', 'Deflection'):
+            scale = max (abs (fe_results_DICT [f"Max {quantity}"]), abs (fe_results_DICT [f"Min {quantity}"]))
+            for key in (f"Max {quantity}", f"Min {quantity}"):
+                assert math.isclose (results_DICT [key], fe_results_DICT [key], abs_tol=1e-3 * scale)
+
+
+def test_dispatches_continuous_beam_to_fe ():
+    continuous_DICT = make_beam ({0.0: 'P', 3000.0: 'R', 6000.0: 'R'}, [VARYING_LOAD])
+    simple_DICT = make_beam ({0.0: 'P', 6000.0: 'R'}, [VARYING_LOAD])
+    results_LIST = closed_form.analyze_beams ([continuous_DICT, simple_DICT])
+    assert [results_DICT ['Method'] for results_DICT in results_LIST] == ['FE', 'Closed form']
+    assert len (results_LIST [0]['Reactions']) == 3
@@ -1 +1,56 @@
-import eng_module.columns as columns
\ No newline at end of file
+import io
+import numpy as np
+import pytest
+import eng_module.beams as beams
+import eng_module.columns as columns
+import eng_module.parsing as parsing
+
+COLUMN_FILE = '''C1
+3600, 1.0, 350W, W250x49
+AXIAL, 400e3, case:Dead
+AXIAL, 300e3, case:Live
+---
+C2
+7000, 0.8, 200000, 20e6, 5000, 300
+AXIAL, 100e3, case:Dead
+'''
+
+
+def test_iter_column_records ():
+    columns_LIST = list (columns.iter_column_records (io.StringIO (COLUMN_FILE)))
+    assert [column.name for column in columns_LIST] == ['C1', 'C2']
+    assert columns_LIST [0].Fy == 350.0 and columns_LIST [0].I == 15.23e6
+    assert columns_LIST [0].loads == [columns.AxialLoad (400e3, 'Dead'), columns.AxialLoad (300e3, 'Live')]
+    assert columns_LIST [1] == columns.Column ('C2', 7000.0, 200000.0, 20e6, 5000.0, 0.8, 300.0, [columns.AxialLoad (100e3, 'Dead')])
+
+    with pytest.raises (parsing.BeamFileError) as err:
+        list (columns.iter_column_records (io.StringIO ('C1\n3600, 1.0, 350W, W250x49\nAXIAL, heavy, case:Dead\n')))
+    assert (err.value.line, err.value.column) == (3, 2)
+    with pytest.raises (parsing.BeamFileError) as err:
+        list (columns.iter_column_records (io.StringIO (COLUMN_FILE + '---\nTimber post\n3000, 1.0, D.Fir-L No.1/No.2, 140x140\nAXIAL, 10e3, case:Snow\n')))
+    assert (err.value.line, err.value.column) == (11, 3)
+    with pytest.raises (parsing.BeamFileError, match='needs an A'):
+        list (columns.iter_column_records (io.StringIO ('C3\n3600, 1.0, 200000, 20e6\n')))
+    with pytest.raises (parsing.BeamFileError, match='needs an Fy'):
+        list (columns.iter_column_records (io.StringIO ('C3\n3600, 1.0, 200000, 20e6, 5000\n')))
+
+
+def test_vectorized_capacities_match_scalar_formulas ():
+    rng = np.random.default_rng (0)
+    l, E, I, k = rng.uniform (2000, 9000, 50), rng.uniform (1e4, 2e5, 50), rng.uniform (1e6, 1e8, 50), rng.uniform (0.5, 2.0, 50)
+    euler_ARR = columns.euler_buckling_loads (l, E, I, k)
+    assert np.allclose (euler_ARR, [beams.euler_buckling_mode (*values) for values in zip (l, E, I, k)], rtol=1e-14)
+
+    resistance_ARR = columns.compressive_resistances (l, E, I, k, 5000.0, 350.0)
+    slenderness_ARR = np.sqrt (5000.0 * 350.0 / euler_ARR)
+    assert np.allclose (resistance_ARR, 0.9 * 5000.0 * 350.0 / (1 + slenderness_ARR**2.68)**(1 / 1.34))
+    assert np.all (resistance_ARR < np.minimum (0.9 * 5000.0 * 350.0, euler_ARR))
+
+
+def test_check_columns_reports_most_critical_first ():
+    report_LIST = columns.check_columns (columns.iter_column_records (io.StringIO (COLUMN_FILE)))
+    assert [row_DICT ['Name'] for row_DICT in report_LIST] == ['C1', 'C2']
+    assert report_LIST [0]['Pf'] == 1.25 * 400e3 + 1.5 * 300e3 and report_LIST [0]['Governing'] == 'LC2a'
+    assert report_LIST [0]['Utilization'] > report_LIST [1]['Utilization']
+    with pytest.raises (ValueError):
+        columns.check_columns ([columns.Column ('Post', 3000.0, 11000.0, 32e6, 19600.0, loads=[columns.AxialLoad (10e3, 'Snow')])])
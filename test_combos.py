@@ -0,0 +1,69 @@
+import math
+import subprocess
+import sys
+import pytest
+import eng_module.beams as beams
+import eng_module.combos as combos
+import eng_module.load_factors as load_factors
+
+
+BEAM_DICT = {
+    'Name': 'Roof beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 4000.0: 'R', 6000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -5.0, 'Start Location': 0.0, 'End Location': 6000.0, 'Case': 'Dead'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': 4000.0, 'Location': 5000.0, 'Case': 'Wind'},
+    ]}
+
+
+def test_get_case_symbol ():
+    assert load_factors.get_case_symbol ('Live') == 'L'
+    assert load_factors.get_case_symbol ('dead') == 'D'
+    assert load_factors.get_case_symbol ('S') == 'S'
+    with pytest.raises (ValueError):
+        load_factors.get_case_symbol ('Earthquake')
+
+
+def test_get_factor_matrix ():
+    factors_ARR = combos.get_factor_matrix (['Dead', 'Live'], {'LC1': {'D': 1.4}, 'LC2a': {'D': 1.25, 'L': 1.5}})
+    assert factors_ARR.tolist () == [[1.4, 0.0], [1.25, 1.5]]
+
+
+def test_combinations_match_factored_models ():
+    results_DICT = combos.analyze_load_combinations (BEAM_DICT)
+    assert results_DICT ['Cases'] == ['Dead', 'Live', 'Wind']
+    assert list (results_DICT ['Combos']) == list (load_factors.NBCC_2020_COMBOS)
+
+    for combo_name in ('LC2a', 'LC4d'):
+        factors_DICT = load_factors.NBCC_2020_COMBOS [combo_name]
+        factored_DICT = BEAM_DICT | {'Loads': []}
+        for load_DICT in BEAM_DICT ['Loads']:
+            factor = factors_DICT.get (load_factors.get_case_symbol (load_DICT ['Case']), 0.0)
+            factored_DICT ['Loads'].append (load_DICT | {
+                key: factor * value for key, value in load_DICT.items () if key in ('Magnitude', 'Start Magnitude', 'End Magnitude')})
+        the_model = beams.build_beam (factored_DICT)
+        the_model.analyze ()
+        expected_DICT = beams.get_model_results (the_model)
+        combo_DICT = results_DICT ['Combos'][combo_name]
+        for support_location, reaction in expected_DICT ['Reactions'].items ():
+            assert math.isclose (combo_DICT ['Reactions'][support_location], reaction, rel_tol=1e-9)
+        assert math.isclose (combo_DICT ['Min Moment'], expected_DICT ['Min Moment'], rel_tol=1e-2)
+
+
+def test_envelope_and_governing_combos ():
+    results_DICT = combos.analyze_load_combinations (BEAM_DICT)
+    for key, combo_name in results_DICT ['Governing'].items ():
+        if key.endswith ('Reactions'):
+            for support_location, this_combo_name in combo_name.items ():
+                assert results_DICT ['Envelope'][key][support_location] == results_DICT ['Combos'][this_combo_name]['Reactions'][support_location]
+        else:
+            assert results_DICT ['Envelope'][key] == results_DICT ['Combos'][combo_name][key]
+    assert results_DICT ['Envelope']['Min Moment'] == min (combo_DICT ['Min Moment'] for combo_DICT in results_DICT ['Combos'].values ())
+    assert results_DICT ['Governing']['Max Reactions'][4000.0] in ('LC2a', 'LC2c', 'LC2b', 'LC2d')
+
+
+def test_combination_helpers_import_without_the_solver ():
+    check = "import sys, eng_module.combos, eng_module.columns; print (sorted (m for m in ('scipy', 'PyNite') if m in sys.modules))"
+    completed = subprocess.run ([sys.executable, '-c', check], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip () == '[]'
@@ -0,0 +1,53 @@
+import math
+import numpy as np
+import eng_module.beams as beams
+import eng_module.influence as influence
+
+
+BEAM_DICT = {
+    'Name': 'Bridge girder', 'L': 16000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 7000.0: 'R', 16000.0: 'R'},
+    'Loads': []}
+TRUCK_LIST = [(0.0, -35000.0), (-4300.0, -145000.0), (-8600.0, -145000.0)]
+
+
+def place_train (axles_LIST, position, L):
+    return [
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': magnitude, 'Location': position + offset, 'Case': 'Live'}
+        for offset, magnitude in axles_LIST if 0 <= position + offset <= L]
+
+
+def test_single_axle_on_a_simple_span ():
+    beam_DICT = dict (BEAM_DICT, L=10000.0, Supports={0.0: 'P', 10000.0: 'R'})
+    envelope_DICT = influence.moving_load_envelope (beam_DICT, [(0.0, -100000.0)])
+    i = envelope_DICT ['Stations'].tolist ().index (5000.0)
+    assert math.isclose (envelope_DICT ['Min Moment'][i], -100000.0 * 10000.0 / 4) # sagging is negative, as in PyNite
+    assert envelope_DICT ['Min Moment At'][i] == 5000.0
+    assert math.isclose (envelope_DICT ['Max Shear'][i], 50000.0)
+    assert math.isclose (envelope_DICT ['Min Shear'][i], -50000.0)
+    assert envelope_DICT ['Max Reactions'] == {0.0: 100000.0, 10000.0: 100000.0}
+
+
+def test_envelope_matches_a_solve_per_position ():
+    lines = influence.InfluenceLines (BEAM_DICT)
+    envelope_DICT = lines.envelope (TRUCK_LIST)
+    max_moment_ARR = np.full (len (lines.stations), -np.inf)
+    min_moment_ARR = np.full (len (lines.stations), np.inf)
+    for position in np.linspace (0.0, 16000.0 + 8600.0, 247):
+        the_model = beams.build_beam (dict (BEAM_DICT, Loads=place_train (TRUCK_LIST, position, 16000.0)), backend='planar')
+        the_model.analyze ()
+        moment_ARR = the_model.sample (lines.stations, ['Combo 1']) ['Moment'][0]
+        max_moment_ARR = np.maximum (max_moment_ARR, moment_ARR)
+        min_moment_ARR = np.minimum (min_moment_ARR, moment_ARR)
+    scale = abs (min_moment_ARR).max ()
+    assert abs (envelope_DICT ['Max Moment'] - max_moment_ARR).max () < 1e-3 * scale
+    assert abs (envelope_DICT ['Min Moment'] - min_moment_ARR).max () < 1e-3 * scale
+    assert (envelope_DICT ['Min Moment'] <= min_moment_ARR + 1e-9 * scale).all ()
+
+    # the train where the envelope says gives that moment in PyNite
+    i = int (np.argmin (envelope_DICT ['Min Moment']))
+    the_model = beams.build_beam (dict (BEAM_DICT, Loads=place_train (TRUCK_LIST, envelope_DICT ['Min Moment At'][i], 16000.0)))
+    the_model.analyze ()
+    assert math.isclose (the_model.Members ['M0'].moment ('Mz', lines.stations [i]), envelope_DICT ['Min Moment'][i], rel_tol=1e-6)
+    lines_DICT = lines.get_lines ([-1.0, 7000.0, 16001.0])
+    assert np.allclose (lines_DICT ['Reactions'], [[0.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, 0.0]]) # a unit upward load on a support is all taken by it
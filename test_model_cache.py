@@ -0,0 +1,52 @@
+import math
+import eng_module.beams as beams
+import eng_module.model_cache as model_cache
+
+
+BEAM_DICT = {
+    'Name': 'Floor beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 4000.0: 'R', 6000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -5.0, 'Start Location': 0.0, 'End Location': 6000.0, 'Case': 'Dead'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'},
+    ]}
+
+
+def fresh_results (beam_DICT:dict) -> dict:
+    the_model = beams.build_beam (beam_DICT)
+    the_model.analyze_linear (check_stability=False)
+    return beams.get_model_results (the_model)
+
+
+def assert_results_match (results_DICT:dict, expected_DICT:dict) -> None:
+    for support_location, reaction in expected_DICT ['Reactions'].items ():
+        assert math.isclose (results_DICT ['Reactions'][support_location], reaction, rel_tol=1e-9)
+    for key in ('Max Moment', 'Min Moment', 'Max Shear', 'Min Shear', 'Max Deflection', 'Min Deflection'):
+        assert math.isclose (results_DICT [key], expected_DICT [key], rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_changed_loads_reuse_the_template ():
+    the_cache = model_cache.ModelTemplateCache ()
+    assert_results_match (the_cache.analyze (BEAM_DICT), fresh_results (BEAM_DICT))
+
+    other_loads_DICT = dict (BEAM_DICT, Loads=[
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -25000.0, 'Location': 5000.0, 'Case': 'Live'},
+    ])
+    assert_results_match (the_cache.analyze (other_loads_DICT), fresh_results (other_loads_DICT))
+    assert (the_cache.hits, the_cache.misses, len (the_cache)) == (1, 1, 1)
+
+
+def test_load_cases_become_combos ():
+    the_cache = model_cache.ModelTemplateCache ()
+    the_model = the_cache.solve (BEAM_DICT, load_cases=True)
+    assert set (the_model.LoadCombos) == {'Dead', 'Live'}
+    assert math.isclose (sum (the_model.Nodes [name].RxnFY ['Live'] for name in the_model.Nodes), 10000.0)
+
+
+def test_least_recently_used_template_is_evicted ():
+    the_cache = model_cache.ModelTemplateCache (max_entries=2)
+    for L in (6000.0, 7000.0, 6000.0, 8000.0):
+        the_cache.analyze (dict (BEAM_DICT, L=L))
+    assert (the_cache.hits, the_cache.misses, the_cache.evictions) == (1, 3, 1)
+    the_cache.analyze (dict (BEAM_DICT, L=6000.0))
+    assert the_cache.hits == 2
@@ -0,0 +1,60 @@
+import math
+import pytest
+import eng_module.beams as beams
+import eng_module.optimizer as optimizer
+import eng_module.sections as sections
+
+
+SIMPLE_BEAM_DICT = {
+    'Name': 'Floor beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 6000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -10.0, 'End Magnitude': -10.0, 'Start Location': 0.0, 'End Location': 6000.0, 'Case': 'Dead'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -20000.0, 'Location': 2000.0, 'Case': 'Live'},
+    ]}
+CONTINUOUS_BEAM_DICT = dict (SIMPLE_BEAM_DICT, Name='Continuous beam', L=14000.0, Supports={0.0: 'P', 6000.0: 'R', 14000.0: 'F'})
+
+
+def brute_force (beam_DICT:dict, deflection_limit:float) -> str | None:
+    '''
+    Analyzes the beam with every section in the steel table and returns the lightest that passes
+    '''
+    steel = sections.get_catalogue ().tables_DICT ['steel']
+    material_DICT = sections.get_material ('350W')
+    passing_LIST = []
+    for name in steel.names_LIST:
+        section_DICT = steel.get (name)
+        the_model = beams.build_beam (dict (beam_DICT, Iz=section_DICT ['Iz'], A=section_DICT ['A']))
+        the_model.analyze ()
+        results_DICT = beams.get_model_results (the_model)
+        moment = max (abs (results_DICT ['Max Moment']), abs (results_DICT ['Min Moment']))
+        deflection = max (abs (results_DICT ['Max Deflection']), abs (results_DICT ['Min Deflection']))
+        if moment <= 0.9 * material_DICT ['Fy'] * 2 * section_DICT ['Iz'] / section_DICT ['d'] and deflection <= beam_DICT ['L'] / deflection_limit:
+            passing_LIST.append (section_DICT)
+    return min (passing_LIST, key=lambda section_DICT: section_DICT ['mass'])['Name'] if passing_LIST else None
+
+
+@pytest.mark.parametrize ('beam_DICT', [SIMPLE_BEAM_DICT, CONTINUOUS_BEAM_DICT])
+@pytest.mark.parametrize ('deflection_limit', [180, 360, 1000])
+def test_optimize_beam_matches_brute_force (beam_DICT, deflection_limit):
+    result_DICT = optimizer.optimize_beam (beam_DICT, deflection_limit=deflection_limit)
+    assert result_DICT ['Section'] == brute_force (beam_DICT, deflection_limit)
+    assert result_DICT ['Solves'] == 2
+    assert result_DICT ['Moment Utilization'] <= 1.0
+    assert result_DICT ['Deflection Utilization'] <= 1.0 + 1e-9
+
+
+def test_optimize_beams_reports_what_cannot_be_sized ():
+    heavy_DICT = dict (SIMPLE_BEAM_DICT, Name='Heavy beam', Loads=[dict (SIMPLE_BEAM_DICT ['Loads'][1], Magnitude=-5e6)])
+    rows_LIST = optimizer.optimize_beams ([SIMPLE_BEAM_DICT, heavy_DICT], table='timber', material='24f-E', family='Glulam')
+    assert rows_LIST [0]['Section'].endswith ('GL') and rows_LIST [0]['Error'] is None
+    assert rows_LIST [1]['Section'] is None and math.isnan (rows_LIST [1]['Mass'])
+    assert optimizer.optimize_beams ([SIMPLE_BEAM_DICT], material='Unobtainium') [0]['Error'].startswith ('KeyError')
+
+
+def test_factored_combinations_govern_the_strength_check ():
+    unfactored_DICT = optimizer.optimize_beam (SIMPLE_BEAM_DICT, deflection_limit=100)
+    factored_DICT = optimizer.optimize_beam (SIMPLE_BEAM_DICT, deflection_limit=100, combos_DICT={'LC2a': {'D': 1.25, 'L': 1.5}})
+    assert factored_DICT ['Solves'] == 3
+    assert factored_DICT ['Mass'] >= unfactored_DICT ['Mass']
+    assert factored_DICT ['Moment Utilization'] <= 1.0
@@ -0,0 +1,40 @@
+import io
+import pytest
+import eng_module.beams as beams
+import eng_module.parsing as parsing
+
+
+ROWS_LIST = [
+    ['Balcony transfer'],
+    ['4800', '24500', '1200000000', '1', '1'],
+    ['1000:P', ' 3800:R'],
+    ['POINT:Fy', ' -10000', ' 4800', ' case:Live'],
+    ['DIST:Fy', '30', '30', '0', '4800', 'case:Dead']
+]
+
+
+def test_parse_beam_rows_matches_get_structured_beam_data ():
+    expected_DICT = beams.get_structured_beam_data ([list (row_LIST) for row_LIST in ROWS_LIST])
+    assert parsing.parse_beam_rows (ROWS_LIST) == expected_DICT
+
+
+def test_errors_give_line_and_column ():
+    bad_ROWS_LIST = ROWS_LIST [:3] + [['POINT:Fy', '-10000', '48OO', 'case:Live']]
+    with pytest.raises (parsing.BeamFileError) as err:
+        parsing.parse_beam_rows (bad_ROWS_LIST, 'beam.txt')
+    assert (err.value.filename, err.value.line, err.value.column) == ('beam.txt', 4, 3)
+    assert str (err.value) == "beam.txt:4, column 3: expected a number, got '48OO'"
+
+    with pytest.raises (parsing.BeamFileError, match="a DIST load needs 6 columns"):
+        parsing.parse_beam_rows (ROWS_LIST [:3] + [['DIST:Fy', '30', '0', 'case:Dead']])
+    with pytest.raises (parsing.BeamFileError, match="column 2: expected 'location:type'"):
+        parsing.parse_beam_rows ([ROWS_LIST [0], ROWS_LIST [1], ['0:P', '4800']])
+
+
+def test_iter_beam_records_counts_lines_across_the_file ():
+    text = "Beam A\n4800,24500,1200000000\n0:P,4800:R\n---\nBeam B\n4800,24500\n0:P,4800:R\n"
+    records_ITER = parsing.iter_beam_records (io.StringIO (text))
+    assert next (records_ITER) ['Name'] == 'Beam A'
+    with pytest.raises (parsing.BeamFileError) as err:
+        next (records_ITER)
+    assert err.value.line == 6
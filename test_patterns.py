@@ -0,0 +1,53 @@
+import itertools
+import math
+import pytest
+import eng_module.combos as combos
+import eng_module.patterns as patterns
+
+
+BEAM_DICT = {
+    'Name': 'Floor beam', 'L': 10000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 4000.0: 'R', 9000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -5.0, 'Start Location': 0.0, 'End Location': 10000.0, 'Case': 'Dead'},
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -4.0, 'End Magnitude': -13.0, 'Start Location': 1000.0, 'End Location': 10000.0, 'Case': 'Live'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -8000.0, 'Location': 6000.0, 'Case': 'Live'},
+    ]}
+
+
+def test_split_load ():
+    spans_LIST = patterns.get_spans (BEAM_DICT)
+    assert spans_LIST == [(0.0, 4000.0), (4000.0, 9000.0), (9000.0, 10000.0)]
+    pieces_LIST = patterns.split_load (BEAM_DICT ['Loads'][1], spans_LIST)
+    assert [i for i, _ in pieces_LIST] == [0, 1, 2]
+    assert [(piece_DICT ['Start Location'], piece_DICT ['End Magnitude']) for _, piece_DICT in pieces_LIST] == [(1000.0, -7.0), (4000.0, -12.0), (9000.0, -13.0)]
+    assert patterns.split_load (BEAM_DICT ['Loads'][2], spans_LIST) == [(1, BEAM_DICT ['Loads'][2])]
+
+
+@pytest.mark.parametrize ('backend', ['pynite', 'planar'])
+def test_pattern_envelope_matches_every_pattern (backend):
+    results_DICT = patterns.analyze_pattern_loading (BEAM_DICT, backend=backend)
+    spans_LIST = results_DICT ['Spans']
+
+    # the brute force way: every on/off pattern of the live load spans as a beam of its own
+    expected_DICT = {}
+    for pattern_TUPLE in itertools.product ((False, True), repeat=len (spans_LIST)):
+        loads_LIST = [load_DICT for load_DICT in BEAM_DICT ['Loads'] if load_DICT ['Case'] == 'Dead']
+        for load_DICT in BEAM_DICT ['Loads'][1:]:
+            loads_LIST.extend (piece_DICT for i, piece_DICT in patterns.split_load (load_DICT, spans_LIST) if pattern_TUPLE [i])
+        envelope_DICT = combos.analyze_load_combinations (BEAM_DICT | {'Loads': loads_LIST}) ['Envelope']
+        for key, value in envelope_DICT.items ():
+            if key.endswith ('Reactions'):
+                pick = max if key.startswith ('Max') else min
+                expected_DICT [key] = {loc: pick (R, expected_DICT.get (key, {}).get (loc, R)) for loc, R in value.items ()}
+            else:
+                expected_DICT [key] = (max if key.startswith ('Max') else min) (value, expected_DICT.get (key, value))
+
+    for key, value in expected_DICT.items ():
+        if key.endswith ('Reactions'):
+            for loc, R in value.items ():
+                assert math.isclose (results_DICT ['Envelope'][key][loc], R, rel_tol=1e-9)
+        else:
+            assert math.isclose (results_DICT ['Envelope'][key], value, rel_tol=1e-6, abs_tol=1e-9 * abs (value) + 1e-6)
+    assert results_DICT ['Governing']['Min Moment'] in ('LC2a', 'LC2b')
+    assert results_DICT ['Diagrams']['Min Moment'].min () == results_DICT ['Envelope']['Min Moment']
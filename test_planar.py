@@ -0,0 +1,59 @@
+import math
+import pytest
+import eng_module.beams as beams
+import eng_module.planar as planar
+
+
+BEAM_DICT = {
+    'Name': 'Floor beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {1000.0: 'P', 4000.0: 'R', 6000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -12.0, 'Start Location': 500.0, 'End Location': 5500.0, 'Case': 'Dead'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2100.0, 'Case': 'Live'},
+    ]}
+
+
+@pytest.mark.parametrize ('supports_DICT', [
+    {1000.0: 'P', 4000.0: 'R', 6000.0: 'R'},
+    {0.0: 'F', 6000.0: 'R'},
+    {6000.0: 'F'},
+])
+def test_planar_results_match_pynite (supports_DICT):
+    beam_DICT = dict (BEAM_DICT, Supports=supports_DICT)
+    pynite_model = beams.build_beam (beam_DICT)
+    pynite_model.analyze ()
+    planar_model = beams.build_beam (beam_DICT, backend='planar')
+    planar_model.analyze ()
+    assert isinstance (planar_model, planar.PlanarBeam)
+
+    expected_DICT = beams.get_model_results (pynite_model)
+    results_DICT = beams.get_model_results (planar_model)
+    assert list (results_DICT ['Reactions']) == list (expected_DICT ['Reactions'])
+    for support_location, reaction in expected_DICT ['Reactions'].items ():
+        assert math.isclose (results_DICT ['Reactions'][support_location], reaction, rel_tol=1e-9)
+    for result_name in ('Moment', 'Shear', 'Deflection'): # the planar extremes are sampled, so they may be a little low
+        scale = max (abs (expected_DICT [f"Max {result_name}"]), abs (expected_DICT [f"Min {result_name}"]))
+        for key in (f"Max {result_name}", f"Min {result_name}"):
+            assert math.isclose (results_DICT [key], expected_DICT [key], abs_tol=1e-4 * scale)
+
+    expected_DICT = beams.sample_model_results (pynite_model, 51)
+    results_DICT = beams.sample_model_results (planar_model, 51)
+    for key in ('Moment', 'Shear', 'Deflection'):
+        scale = abs (expected_DICT [key]).max ()
+        assert abs (results_DICT [key] - expected_DICT [key]).max () < 1e-9 * scale
+
+
+def test_load_cases_and_combos ():
+    planar_model = beams.build_beam (BEAM_DICT, load_cases=True, backend='planar')
+    planar_model.add_load_combo ('Dead', {'Dead': 1.0})
+    planar_model.add_load_combo ('1.25D+1.5L', {'Dead': 1.25, 'Live': 1.5})
+    planar_model.analyze ()
+    assert math.isclose (planar_model.RxnFY ['Dead'].sum (), 5000 * 8.5)
+    assert math.isclose (planar_model.RxnFY ['1.25D+1.5L'].sum (), 1.25 * 5000 * 8.5 + 1.5 * 10000)
+
+
+def test_unstable_beam_and_unsupported_loads ():
+    with pytest.raises (Exception, match='unstable'):
+        beams.build_beam (dict (BEAM_DICT, Supports={1000.0: 'R'}), backend='planar').analyze ()
+    with pytest.raises (ValueError):
+        beams.build_beam (dict (BEAM_DICT, Loads=[dict (BEAM_DICT ['Loads'][1], Direction='Fx')]), backend='planar')
@@ -0,0 +1,45 @@
+import json
+import logging
+import eng_module.beams as beams
+import eng_module.profiling as profiling
+
+
+BEAM_DICT = {
+    'Name': 'Roof beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 6000.0: 'R'},
+    'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'}]}
+
+
+def test_build_beam_logs_instead_of_printing (capsys, caplog):
+    with caplog.at_level (logging.DEBUG, logger='eng_module.beams'):
+        beams.build_beam (BEAM_DICT)
+    assert capsys.readouterr ().out == ''
+    assert 'build_beam Roof beam' in caplog.text
+
+
+def test_profiler_times_stages_and_counts (tmp_path):
+    assert profiling.get_active_profiler () is None
+    with profiling.Profiler () as the_profiler:
+        beams.get_structured_beam_data ([['Roof beam'], ['6000', '200000', '80000000'], ['0:P', '6000:R'], ['POINT:Fy', '-10000', '2000', 'case:Live']])
+        the_model = beams.build_beam (BEAM_DICT, n_segments=4)
+        with profiling.timer (profiling.SOLVE):
+            the_model.analyze ()
+        beams.get_model_results (the_model)
+    assert profiling.get_active_profiler () is None
+    beams.build_beam (BEAM_DICT) # not recorded
+
+    profile_DICT = the_profiler.to_dict ()
+    assert {stage: stage_DICT ['calls'] for stage, stage_DICT in profile_DICT ['stages'].items ()} == {'parse': 1, 'build': 1, 'solve': 1, 'extract': 1}
+    assert profile_DICT ['counters'] == {'nodes': 5}
+
+    the_profiler.dump_chrome_trace (str (tmp_path / "trace.json"))
+    with open (tmp_path / "trace.json") as json_file:
+        trace_DICT = json.load (json_file)
+    assert [event_DICT ['name'] for event_DICT in trace_DICT ['traceEvents'] if event_DICT ['ph'] == 'X'] == ['parse', 'build', 'solve', 'extract']
+
+
+def test_disabled_timer_does_nothing ():
+    with profiling.timer (profiling.BUILD):
+        pass
+    profiling.count ('nodes')
+    assert profiling.get_active_profiler () is None
@@ -0,0 +1,53 @@
+import eng_module.beams as beams
+import eng_module.records as records
+
+
+BEAM_DICT = {
+    'Name': 'Balcony transfer', 'L': 4800.0, 'E': 24500.0, 'Iz': 1200000000.0, 'Iy': 1.0, 'A': 1.0, 'J': 1, 'nu': 1, 'rho': 1,
+    'Supports': {1000.0: 'P', 3800.0: 'R'},
+    'Loads': [
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 4800.0, 'Case': 'Live'},
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': 30.0, 'End Magnitude': 30.0, 'Start Location': 0.0, 'End Location': 4800.0, 'Case': 'Dead'}]}
+
+
+def test_beam_round_trip ():
+    beam = records.Beam.from_dict (BEAM_DICT)
+    assert beam.supports == [records.Support (1000.0, 'P'), records.Support (3800.0, 'R')]
+    assert beam.loads [0] == records.PointLoad ('Fy', -10000.0, 4800.0, 'Live')
+    assert beam.to_dict () == BEAM_DICT
+    assert not hasattr (beam, '__dict__')
+
+    both_DICT = BEAM_DICT | {'I': 900000000.0}
+    assert records.Beam.from_dict (both_DICT).Iz == beams.get_moment_of_inertia (both_DICT) == 900000000.0
+
+
+def test_parsers_produce_records ():
+    beam = beams.get_structured_beam_data (
+        [
+            ['Balcony transfer'],
+            ['4800', '24500', '1200000000', '1', '1'],
+            ['1000:P', '3800:R'],
+            ['POINT:Fy', '-10000', '4800', 'case:Live'],
+            ['DIST:Fy', '30', '30', '0', '4800', 'case:Dead']
+        ], as_record=True)
+    assert beam == records.Beam.from_dict (BEAM_DICT)
+    assert beams.parse_supports (['1000:P', '3800:R'], as_records=True) == beam.supports
+    assert beams.parse_loads ([['POINT:Fy', -10000.0, 4800.0, 'case:Live']], as_records=True) == beam.loads [:1]
+
+
+def test_beam_set ():
+    other_DICT = BEAM_DICT | {'Name': 'Roof beam', 'L': 6000.0, 'Supports': {0.0: 'F'}, 'Loads': BEAM_DICT ['Loads'][1:]}
+    beam_set = records.BeamSet ([BEAM_DICT, records.Beam.from_dict (other_DICT)])
+    assert len (beam_set) == 2
+    assert beam_set.L.tolist () == [4800.0, 6000.0]
+    assert beam_set.support_offsets.tolist () == [0, 2, 3]
+    assert beam_set.load_offsets.tolist () == [0, 2, 3]
+    assert beam_set.case_names == ['Live', 'Dead']
+    assert beam_set.to_dicts () == [BEAM_DICT, other_DICT]
+    assert beam_set [-1].name == 'Roof beam'
+    assert len (records.BeamSet ()) == 0
+
+
+def test_build_beam_accepts_record ():
+    the_model = beams.build_beam (records.Beam.from_dict (BEAM_DICT))
+    assert list (the_model.Members) == ['M0']
@@ -0,0 +1,47 @@
+import pytest
+import eng_module.profiling as profiling
+import eng_module.result_store as result_store
+
+
+def make_beam (the_name:str, span:float, magnitude:float=-10000.0) -> dict:
+    return {
+        'Name': the_name, 'L': span, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+        'Supports': {0.0: 'P', span: 'R'},
+        'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': magnitude, 'Location': span / 2, 'Case': 'Live'}]}
+
+
+def test_fingerprint_ignores_the_name_only ():
+    beam_DICT = make_beam ('B1', 4000.0)
+    assert result_store.get_fingerprint (beam_DICT) == result_store.get_fingerprint (dict (beam_DICT, Name='Renamed'))
+    assert result_store.get_fingerprint (beam_DICT) != result_store.get_fingerprint (make_beam ('B1', 4000.0, -10000.0000001))
+    assert result_store.get_fingerprint (beam_DICT) != result_store.get_fingerprint (beam_DICT, {'LC1': {'D': 1.4}})
+
+
+def test_run_project_only_solves_what_changed (tmp_path):
+    beams_LIST = [make_beam (f"B{i}", 3000.0 + 100 * i) for i in range (10)]
+    with result_store.ResultStore (str (tmp_path / "results.sqlite")) as store:
+        first_DICT = result_store.run_project (beams_LIST, store)
+        assert (first_DICT ['Reused'], first_DICT ['Recomputed'], len (store)) == (0, 10, 10)
+
+    beams_LIST [3] = make_beam ('B3', 3300.0, -20000.0)
+    beams_LIST [9] = dict (beams_LIST [9], Supports={0.0: 'F', 3900.0: 'R'}) # a support changed
+    beams_LIST.append (dict (beams_LIST [0], Name='Broken', Loads=[{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -1.0, 'Case': 'Live'}]))
+    del beams_LIST [5]
+    with result_store.ResultStore (str (tmp_path / "results.sqlite")) as store, profiling.Profiler () as the_profiler:
+        second_DICT = result_store.run_project (beams_LIST, store, prune=True)
+        assert (second_DICT ['Reused'], second_DICT ['Recomputed'], second_DICT ['Failed'], second_DICT ['Removed']) == (7, 2, 1, 1)
+        assert len (store) == 9
+    counters_DICT = the_profiler.to_dict () ['counters']
+    assert (counters_DICT ['reused'], counters_DICT ['recomputed']) == (7, 2)
+
+    rows_DICT = {row_DICT ['Key']: row_DICT for row_DICT in second_DICT ['Results']}
+    assert [row_DICT ['Key'] for row_DICT in second_DICT ['Results']] == [beam_DICT ['Name'] for beam_DICT in beams_LIST]
+    assert rows_DICT ['B0'] == dict (first_DICT ['Results'][0], Reused=True)
+    assert not rows_DICT ['B3']['Reused'] and rows_DICT ['B3']['Reactions'][0.0] == pytest.approx (10000.0)
+    assert rows_DICT ['Broken']['Error'] is not None
+
+
+def test_run_project_rejects_repeated_keys (tmp_path):
+    with result_store.ResultStore (str (tmp_path / "results.sqlite")) as store:
+        with pytest.raises (ValueError):
+            result_store.run_project ([make_beam ('B1', 3000.0), make_beam ('B1', 4000.0)], store)
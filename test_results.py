@@ -0,0 +1,48 @@
+import math
+import numpy as np
+import eng_module.beams as beams
+import eng_module.results as results
+
+
+def make_beam (name:str, span:float) -> dict:
+    return {
+        'Name': name, 'L': span, 'E': 200000.0, 'Iz': 437e6, 'Iy': 1, 'A': 1, 'J': 1, 'nu': 0.3, 'rho': 1,
+        'Supports': {0.0: 'P', span * 0.6: 'R', span: 'R'},
+        'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': span / 3, 'Case': 'Live'}]}
+
+
+def test_workers_write_into_shared_memory (tmp_path):
+    beams_LIST = [make_beam (f"B{i}", 3000.0 + 500 * i) for i in range (5)]
+    (tmp_path / "broken.txt").write_text ("Broken beam\n")
+    beams_LIST.insert (2, str (tmp_path / "broken.txt"))
+    with results.analyze_to_arrays (beams_LIST, n_stations=51, max_supports=4, max_workers=2, chunk_size=2) as arrays:
+        assert arrays ['Status'].tolist () == [results.DONE, results.DONE, results.FAILED, results.DONE, results.DONE, results.DONE]
+        assert list (arrays.errors_DICT) == [2]
+        assert arrays.names == ['B0', 'B1', None, 'B2', 'B3', 'B4']
+
+        the_model = beams.build_beam (beams_LIST [4])
+        the_model.analyze ()
+        result_DICT = arrays.get_result (4)
+        expected_DICT = beams.get_model_results (the_model)
+        assert result_DICT ['Reactions'] == expected_DICT ['Reactions']
+        for name in results.EXTREME_NAMES:
+            assert result_DICT [name] == expected_DICT [name]
+        samples_DICT = beams.sample_model_results (the_model, 51)
+        for name in results.DIAGRAM_NAMES:
+            assert np.array_equal (arrays [name][4], samples_DICT [name])
+        assert np.isnan (arrays ['Supports'][4, 3]) # three supports, padded to four
+
+
+def test_memory_mapped_file_outlives_the_run (tmp_path):
+    path = str (tmp_path / "results.bin")
+    arrays = results.analyze_to_arrays ([make_beam ('B0', 4000.0), make_beam ('B1', 12000.0)], max_supports=2, max_workers=1, path=path)
+    assert arrays ['Status'].tolist () == [results.FAILED, results.FAILED] # three supports don't fit in two
+    assert arrays.errors_DICT [0].startswith ('ValueError')
+    arrays.close ()
+
+    arrays = results.analyze_to_arrays ([make_beam ('B0', 4000.0)], max_workers=1, path=path)
+    spec = arrays.spec
+    arrays.close ()
+    with results.ResultArrays.attach (spec) as arrays:
+        assert arrays ['Status'].tolist () == [results.DONE]
+        assert math.isclose (np.nansum (arrays ['Reactions'][0]), 10000.0)
@@ -0,0 +1,60 @@
+import math
+import numpy as np
+import pytest
+import eng_module.beams as beams
+import eng_module.parsing as parsing
+import eng_module.sections as sections
+
+
+def test_catalogue_lookups (tmp_path):
+    the_catalogue = sections.Catalogue.load (store_dir=str (tmp_path))
+    assert isinstance (the_catalogue.tables_DICT ['steel'].values_ARR, np.memmap)
+    W310x39_DICT = the_catalogue.get_section ('W310x39')
+    assert W310x39_DICT ['Family'] == 'W'
+    assert math.isclose (W310x39_DICT ['Iz'], 84.91e6, rel_tol=1e-3)
+    assert the_catalogue.get_section ('89x235')['Family'] == 'Sawn'
+    assert the_catalogue.get_material ('350W')['E'] == 200000.0
+    with pytest.raises (KeyError):
+        the_catalogue.get_section ('W999x1')
+
+    reopened = sections.Catalogue.load (store_dir=str (tmp_path))
+    assert reopened.get_section ('W310x39') == W310x39_DICT
+    in_memory = sections.Catalogue.load (store_dir=None)
+    assert in_memory.get_section ('W310x39') == W310x39_DICT
+
+    # saving again, as another process would after a csv edit, leaves the open memory map alone and no temporary files
+    steel_table = reopened.tables_DICT ['steel']
+    sections.SectionTable (steel_table.names_LIST, steel_table.families_LIST, steel_table.columns_TUPLE, np.array (steel_table.values_ARR) * 2).save (str (tmp_path / "steel"))
+    assert reopened.get_section ('W310x39') == W310x39_DICT
+    assert not [path for path in tmp_path.iterdir () if path.suffix == '.tmp']
+
+
+def test_lightest_and_select_match_a_linear_scan ():
+    steel = sections.get_catalogue ().tables_DICT ['steel']
+    rows_LIST = [steel.get (name) for name in steel.names_LIST]
+    for minimum in (0.0, 50e6, 84.91e6, 300e6, 1e9, 2e9):
+        candidates_LIST = [row_DICT for row_DICT in rows_LIST if row_DICT ['Iz'] >= minimum]
+        expected = min (candidates_LIST, key=lambda row_DICT: row_DICT ['mass'], default=None)
+        assert steel.lightest ('Iz', minimum) == expected
+    assert steel.select ('Iz', 100e6, 200e6) == sorted (
+        [row_DICT ['Name'] for row_DICT in rows_LIST if 100e6 <= row_DICT ['Iz'] <= 200e6], key=lambda name: steel.get (name)['Iz'])
+    timber = sections.get_catalogue ().tables_DICT ['timber']
+    assert timber.lightest ('Iz', 1e9, family='Glulam')['Family'] == 'Glulam'
+
+
+def test_beam_files_may_name_sections_and_materials ():
+    assert parsing.NAMED_ATTRIBUTES == tuple (sections.NAMED_ATTRIBUTES)
+    row_DICT = parsing.parse_attribute_row (['6000', '350W', 'W310x39'])
+    section_DICT = sections.get_section ('W310x39')
+    assert (row_DICT ['Iz'], row_DICT ['Iy'], row_DICT ['A'], row_DICT ['J']) == (section_DICT ['Iz'], section_DICT ['Iy'], section_DICT ['A'], section_DICT ['J'])
+    assert (row_DICT ['E'], row_DICT ['nu']) == (200000.0, 0.3)
+    assert parsing.parse_attribute_row (['6000', '350W', 'W310x39', '5e6'])['Iy'] == 5e6
+    assert beams.parse_beam_attributes ([6000.0, '350W', 'W310x39']) == row_DICT
+
+    with pytest.raises (parsing.BeamFileError) as err:
+        parsing.parse_attribute_row (['6000', '350W', 'W999x1'], 'beam.txt', 2)
+    assert err.value.column == 3
+    with pytest.raises (parsing.BeamFileError):
+        parsing.parse_attribute_row (['six', '350W', 'W310x39'])
+    with pytest.raises (ValueError):
+        beams.parse_beam_attributes ([6000.0, 'Unobtainium', 80e6])
@@ -0,0 +1,48 @@
+import math
+import numpy as np
+import pytest
+from scipy.sparse.linalg import MatrixRankWarning
+import eng_module.beams as beams
+import eng_module.serviceability as serviceability
+
+
+BEAM_DICT = {
+    'Name': 'Floor beam', 'L': 10000.0, 'E': 200000.0, 'Iz': 4e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 4000.0: 'R', 8500.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -5.0, 'Start Location': 0.0, 'End Location': 10000.0, 'Case': 'Dead'},
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -8.0, 'End Magnitude': -8.0, 'Start Location': 0.0, 'End Location': 10000.0, 'Case': 'Live'},
+    ]}
+
+
+def test_get_span_bounds ():
+    supports_ARR = np.array ([[0.0, 4000.0, 8500.0], [1000.0, 6000.0, np.nan]])
+    starts_ARR, ends_ARR, cantilevers_ARR = serviceability.get_span_bounds (supports_ARR, [0.0, 0.0], [10000.0, 6000.0])
+    assert (ends_ARR - starts_ARR).tolist () == [[0.0, 4000.0, 4500.0, 1500.0], [1000.0, 5000.0, 0.0, 0.0]]
+    assert cantilevers_ARR [0].tolist () == [True, False, False, True] # the first span is the zero length one before the pin
+    assert cantilevers_ARR [1, :2].tolist () == [True, False]
+
+
+def test_check_deflections_matches_the_sampled_spans ():
+    beams_LIST = [BEAM_DICT, dict (BEAM_DICT, Name='Stiff beam', Iz=3000e6), dict (BEAM_DICT, Name='Unstable', Supports={0.0: 'R'})]
+    with pytest.warns (MatrixRankWarning): # PyNite gives NaN deflections for a mechanism, with only a warning
+        table_DICT = serviceability.check_deflections (beams_LIST)
+    assert table_DICT ['Name'].tolist () == ['Floor beam', 'Stiff beam', 'Unstable']
+    assert table_DICT ['Pass'].tolist () == [False, True, False]
+    assert table_DICT ['Error'][1] is None and 'unstable' in table_DICT ['Error'][2]
+    assert math.isnan (table_DICT ['Utilization'][2])
+
+    # the governing span, worked out the slow way from the 'D+L' diagram of the first beam
+    the_model = beams.build_beam (BEAM_DICT)
+    the_model.analyze ()
+    samples_DICT = beams.sample_model_results (the_model, 101)
+    governing_span = table_DICT ['Span'][0]
+    assert table_DICT ['Governing'][0] == 'D+L'
+    bounds_LIST = [(0.0, 4000.0), (4000.0, 8500.0), (8500.0, 10000.0)]
+    start, end = bounds_LIST [governing_span - 1]
+    in_span = (samples_DICT ['x'] > start) & (samples_DICT ['x'] <= end)
+    deflection = abs (samples_DICT ['Deflection'][in_span]).max ()
+    assert math.isclose (table_DICT ['Deflection'][0], deflection, rel_tol=1e-9)
+    length = (end - start) * (serviceability.CANTILEVER_FACTOR if table_DICT ['Cantilever'][0] else 1.0)
+    assert math.isclose (table_DICT ['Utilization'][0], deflection / (length / serviceability.DEFLECTION_LIMITS ['D+L']))
+    assert table_DICT ['S Utilization'][0] == 0.0
@@ -0,0 +1,33 @@
+import math
+import pytest
+from PyNite import Analysis
+import eng_module.beams as beams
+import eng_module.solver as solver
+
+BEAM_DICT = {
+    'Name': 'Two span', 'L': 8000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 5000.0: 'R', 8000.0: 'R'},
+    'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'}],
+}
+
+
+def test_pynite_internals_are_checked (monkeypatch):
+    solver.check_pynite_internals.cache_clear ()
+    solver.check_pynite_internals ()
+
+    solver.check_pynite_internals.cache_clear ()
+    monkeypatch.delattr (Analysis, '_renumber')
+    with pytest.raises (RuntimeError, match='_renumber is missing'):
+        solver.check_pynite_internals ()
+    monkeypatch.undo ()
+    solver.check_pynite_internals.cache_clear ()
+
+
+def test_factored_solve_matches_analyze_linear ():
+    expected_model = beams.build_beam (BEAM_DICT)
+    expected_model.analyze_linear (check_statics=False)
+    the_model = beams.build_beam (BEAM_DICT)
+    solver.solve_load_combos (the_model, solver.factor_stiffness (the_model))
+    expected_DICT = beams.get_model_results (expected_model)
+    for location, reaction in beams.get_model_results (the_model)['Reactions'].items ():
+        assert math.isclose (reaction, expected_DICT ['Reactions'][location], rel_tol=1e-9)
@@ -0,0 +1,95 @@
+import math
+import eng_module.beams as beams
+import eng_module.sweep as sweep
+
+
+BEAM_DICT = {
+    'Name': 'Floor beam', 'L': 6000.0, 'E': 200000.0, 'Iz': 80e6, 'Iy': 1, 'A': 5000, 'J': 1, 'nu': 0.3, 'rho': 1,
+    'Supports': {0.0: 'P', 6000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -10.0, 'Start Location': 0.0, 'End Location': 6000.0, 'Case': 'Dead'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 'Location': 2000.0, 'Case': 'Live'},
+    ]}
+
+
+def test_apply_parameters ():
+    beam_DICT = sweep.apply_parameters (BEAM_DICT, {'L': 7000.0, 'Support 0': 500.0, 'Load 0': -2.0, 'Load 1': -1.0})
+    assert beam_DICT ['Supports'] == {500.0: 'P', 7000.0: 'R'}
+    assert (beam_DICT ['Loads'][0]['Start Magnitude'], beam_DICT ['Loads'][0]['End Magnitude']) == (-1.0, -2.0)
+    assert beam_DICT ['Loads'][1]['Magnitude'] == -1.0
+    assert BEAM_DICT ['Loads'][1]['Magnitude'] == -10000.0
+
+    triangle_DICT = BEAM_DICT | {'Loads': [BEAM_DICT ['Loads'][0] | {'Start Magnitude': 0.0, 'End Magnitude': -10.0}]}
+    beam_DICT = sweep.apply_parameters (triangle_DICT, {'Load 0': -5.0})
+    assert (beam_DICT ['Loads'][0]['Start Magnitude'], beam_DICT ['Loads'][0]['End Magnitude']) == (0.0, -5.0)
+
+
+def test_loads_follow_the_end_of_the_beam ():
+    beam_DICT = sweep.apply_parameters (BEAM_DICT | {'Loads': BEAM_DICT ['Loads'] + [BEAM_DICT ['Loads'][1] | {'Location': 5000.0}]}, {'L': 4000.0})
+    assert beam_DICT ['Supports'] == {0.0: 'P', 4000.0: 'R'}
+    assert beam_DICT ['Loads'][0]['End Location'] == 4000.0 and beam_DICT ['Loads'][0]['End Magnitude'] == -10.0
+    assert len (beam_DICT ['Loads']) == 2
+    the_model = beams.build_beam (beam_DICT)
+    the_model.analyze ()
+    reactions_DICT = beams.get_model_results (the_model)['Reactions']
+    assert math.isclose (sum (reactions_DICT.values ()), 7.5 * 4000 + 10000, rel_tol=1e-9)
+
+    partial_DICT = BEAM_DICT | {'Loads': [BEAM_DICT ['Loads'][0] | {'End Location': 5000.0}]}
+    beam_DICT = sweep.apply_parameters (partial_DICT, {'L': 4000.0})
+    assert beam_DICT ['Loads'][0]['End Location'] == 4000.0 and math.isclose (beam_DICT ['Loads'][0]['End Magnitude'], -9.0)
+
+
+def test_load_and_support_parameters_refer_to_the_base_beam ():
+    base_DICT = BEAM_DICT | {'Supports': {0.0: 'P', 5000.0: 'R', 6000.0: 'R'}, 'Loads': [
+        BEAM_DICT ['Loads'][1] | {'Location': 5000.0}, BEAM_DICT ['Loads'][1], BEAM_DICT ['Loads'][1] | {'Location': 3000.0}]}
+    two_span_DICT = base_DICT | {'Supports': {0.0: 'P', 3000.0: 'R', 6000.0: 'R'}}
+    beam_DICT = sweep.apply_parameters (two_span_DICT, {'L': 4000.0, 'Load 2': -99.0})
+    assert [load_DICT ['Magnitude'] for load_DICT in beam_DICT ['Loads']] == [-10000.0, -99.0]
+    assert beam_DICT ['Supports'] == {0.0: 'P', 3000.0: 'R', 4000.0: 'R'}
+
+    rows_LIST = sweep.run_sweep (two_span_DICT, {'L': [6000.0, 4000.0], 'Load 0': [-7.0]}, max_workers=1)
+    assert rows_LIST [0]['Error'] is None
+    assert 'off the beam' in rows_LIST [1]['Error']
+
+    # an interior support past the new end isn't quietly kept
+    rows_LIST = sweep.run_sweep (base_DICT, {'L': [6000.0, 4000.0]}, max_workers=1)
+    assert rows_LIST [0]['Error'] is None
+    assert 'The supports at [5000.0] are off the beam' in rows_LIST [1]['Error']
+
+
+def test_iter_variants_changes_loads_fastest ():
+    variants_LIST = list (sweep.iter_variants ({'Load factor': [1, 2], 'L': [5000, 6000]}, samples=[{'Iz': 1e8}]))
+    assert variants_LIST == [
+        {'L': 5000, 'Load factor': 1}, {'L': 5000, 'Load factor': 2},
+        {'L': 6000, 'Load factor': 1}, {'L': 6000, 'Load factor': 2},
+        {'Iz': 1e8}]
+
+
+def test_run_sweep_matches_single_analyses ():
+    ranges_DICT = {'Iz': [60e6, 80e6], 'Load 1': [-5000.0, -10000.0, -15000.0]}
+    sweep._worker_cache = None
+    rows_LIST = sweep.run_sweep (BEAM_DICT, ranges_DICT, max_workers=1)
+    assert len (rows_LIST) == 6
+    assert (sweep._worker_cache.misses, sweep._worker_cache.hits) == (2, 4)
+
+    for row_DICT in rows_LIST:
+        the_model = beams.build_beam (sweep.apply_parameters (BEAM_DICT, {'Iz': row_DICT ['Iz'], 'Load 1': row_DICT ['Load 1']}))
+        the_model.analyze ()
+        expected_DICT = beams.get_model_results (the_model)
+        assert row_DICT ['Error'] is None
+        assert math.isclose (row_DICT ['Min Deflection'], expected_DICT ['Min Deflection'], rel_tol=1e-9)
+        assert math.isclose (row_DICT ['Reactions'][0.0], expected_DICT ['Reactions'][0.0], rel_tol=1e-9)
+
+    parallel_LIST = sweep.run_sweep (BEAM_DICT, ranges_DICT, max_workers=2, chunk_size=2, backend='planar')
+    assert [row_DICT ['Load 1'] for row_DICT in parallel_LIST] == [row_DICT ['Load 1'] for row_DICT in rows_LIST]
+    for row_DICT, parallel_DICT in zip (rows_LIST, parallel_LIST):
+        assert math.isclose (parallel_DICT ['Reactions'][6000.0], row_DICT ['Reactions'][6000.0], rel_tol=1e-9)
+
+
+def test_failed_variants_are_recorded ():
+    rows_LIST = sweep.run_sweep (BEAM_DICT, {'Support 1': [6000.0, 0.0]}, max_workers=1)
+    assert rows_LIST [0]['Error'] is None
+    assert rows_LIST [1]['Error'] is not None
+    columns_DICT = sweep.to_columns (rows_LIST)
+    assert columns_DICT ['Support 1'].tolist () == [6000.0, 0.0]
+    assert math.isnan (columns_DICT ['Max Moment'][1])
@@ -1,3 +1,4 @@
+import io
 import eng_module.utils as utils
 
 def test_str_to_float ():
@@ -15,4 +16,10 @@ def test_str_to_int ():
     string_2 = "2000"
     assert utils.str_to_int (string_1) == 43
     assert utils.str_to_int (string_2) == 2000
-   
+
+
+def test_iter_csv_records ():
+    text = "Beam A\n4800,24500,1200000000\n---\n\n---\nBeam B\n3000,200000,80000000\n0:P,3000:R\n"
+    records_ITER = utils.iter_csv_records (io.StringIO (text))
+    assert next (records_ITER) == [['Beam A'], ['4800', '24500', '1200000000']]
+    assert list (records_ITER) == [[['Beam B'], ['3000', '200000', '80000000'], ['0:P', '3000:R']]]
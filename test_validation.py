@@ -0,0 +1,41 @@
+import eng_module.batch as batch
+import eng_module.validation as validation
+
+
+def test_every_problem_is_reported_with_its_line_and_column (tmp_path):
+    the_path = tmp_path / "beams.txt"
+    the_path.write_text (
+        "Good beam\n"
+        "4000, 200000, 437000000, 1, 1\n"
+        "0:P, 4000:R\n"
+        "POINT:Fy, -10000, 2000, case:Live\n"
+        "---\n"
+        "Bad beam\n"
+        "5000, -200000, 437000000, 1, 1\n"
+        "0:P, 6000:X\n"
+        "POINT:Fq, -10000, 2500, case:Dead\n"
+        "DIST:Fy, -5, -5, 3000, 1000, case:Live\n"
+        "POINT:Fy, -10000, 5500, case:Mystery\n"
+    )
+    problems_LIST = validation.validate_beam_file (str (the_path))
+    found_SET = {(problem.line, problem.column) for problem in problems_LIST}
+    assert found_SET == {(7, 2), (8, 2), (9, 1), (10, 4), (11, 3), (11, 4)}
+    assert all (problem.filename == str (the_path) for problem in problems_LIST)
+    assert validation.validate_beam_rows ([['Beam'], ['4000', '200000', '437000000'], ['0:P', '4000:R']]) == []
+    rollers_LIST = validation.validate_beam_rows ([['Beam'], ['5000', '200000', '437000000'], ['0:R', '5000:R']], 'rollers.txt')
+    assert [(problem.line, 'unstable' in problem.message) for problem in rollers_LIST] == [(3, True)]
+
+
+def test_run_batch_rejects_bad_files_before_solving (tmp_path):
+    good_path = tmp_path / "good.txt"
+    good_path.write_text ("Good\n4000, 200000, 437000000, 1, 1\n0:P, 4000:R\nPOINT:Fy, -10000, 2000, case:Live\n")
+    bad_path = tmp_path / "bad.txt"
+    bad_path.write_text ("Bad\n4000, 200000, 437000000, 1, 1\n0:P\nPOINT:Fy, -10000, 5000, case:Live\n")
+    problems_DICT = validation.validate_files ([str (good_path), str (bad_path), str (tmp_path / "missing.txt")])
+    assert problems_DICT [str (good_path)] == []
+    assert len (problems_DICT [str (bad_path)]) == 2
+    assert len (problems_DICT [str (tmp_path / "missing.txt")]) == 1
+
+    results_DICT = {result_DICT ['File']: result_DICT for result_DICT in batch.run_batch ([str (good_path), str (bad_path)], max_workers=1, validate=True)}
+    assert results_DICT [str (good_path)]['Error'] is None
+    assert 'unstable' in results_DICT [str (bad_path)]['Error'] and 'off the beam' in results_DICT [str (bad_path)]['Error']
@@ -1,4 +1,57 @@
 import csv #btw, you DO include import statements here as opposed to whatever python file imports this current file ...
+import sys
+from typing import IO, Iterator
+
+RECORD_DELIMITER = '---'
+
+
+def iter_csv_records (source:str | IO [str], delimiter:str=RECORD_DELIMITER) -> Iterator [list [list[str]]]:
+    '''
+    Lazily reads 'source' and yields one record at a time, where a record is the list of csv rows between delimiter lines.
+    Only one record is held in memory at a time, so 'source' can be far bigger than memory.
+    Params:
+    'source' - a filename, '-' for stdin, or an open text file
+    'delimiter' - a line containing only this text separates one record from the next
+    Blank lines are skipped, and an empty record (ie two delimiters in a row) is never yielded.
+    '''
+    if source == '-':
+        yield from _iter_csv_records (sys.stdin, delimiter)
+    elif isinstance (source, str):
+        with open (source, "r", newline='') as csv_file:
+            yield from _iter_csv_records (csv_file, delimiter)
+    else:
+        yield from _iter_csv_records (source, delimiter)
+
+
+def _iter_csv_records (csv_file:IO [str], delimiter:str) -> Iterator [list [list[str]]]:
+    for rows_LIST, _ in iter_record_rows (csv_file, delimiter):
+        yield rows_LIST
+
+
+def iter_record_rows (csv_file:IO [str], delimiter:str=RECORD_DELIMITER) -> Iterator [tuple [list [list [str]], list [int]]]:
+    '''
+    Reads the csv rows of 'csv_file' and yields the (rows, line numbers) of each record, a record being the rows between
+    delimiter lines (a file without any is one record). Blank lines are skipped; line numbers count from the start of the file.
+    Every multi-record reader splits its files with this: iter_csv_records, parsing.iter_beam_records (which re-exports it),
+    columns.iter_column_records and validation.validate_beam_file.
+    '''
+    rows_LIST = []
+    line_numbers_LIST = []
+    csv_reader = csv.reader (csv_file)
+    for row_LIST in csv_reader:
+        if not row_LIST:
+            continue
+        if len (row_LIST) == 1 and row_LIST [0].strip () == delimiter:
+            if rows_LIST:
+                yield rows_LIST, line_numbers_LIST
+            rows_LIST = []
+            line_numbers_LIST = []
+        else:
+            rows_LIST.append (row_LIST)
+            line_numbers_LIST.append (csv_reader.line_num)
+    if rows_LIST:
+        yield rows_LIST, line_numbers_LIST
+
 
 def read_csv_file (the_filename:str) -> list[list[str]]:
     '''
@@ -29,9 +82,8 @@ def str_to_float (s:str) -> float | str:
     's' - string to convert
     '''
     try:
-        x = float (s)
         return float (s)
-    except:
+    except (ValueError, TypeError):
         return s
     
 
@@ -43,8 +95,7 @@ def str_to_int (s:str) -> int | str:
     's' - string to convert
     '''
     try:
-        x = int (s)
         return int (s)
-    except:
+    except (ValueError, TypeError):
         return s
 
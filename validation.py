@@ -0,0 +1,148 @@
+import math
+from typing import Iterable
+from eng_module.load_factors import NBCC_2020_COMBOS, get_case_symbol
+from eng_module.parsing import BeamFileError, iter_record_rows, parse_attribute_row, parse_load_row, parse_support_row
+from eng_module.records import LOAD_DIRECTIONS, SUPPORT_TYPES
+from eng_module.utils import RECORD_DELIMITER
+
+# The checks made before a beam is built (see validate_beam_rows), on top of the syntax that parsing.py checks:
+#   attributes - finite; L, E, Iz, Iy, A and J greater than 0; nu from 0 to 0.5 and rho not negative, where given
+#   supports   - a type in records.SUPPORT_TYPES, a location from 0 to L, no location given twice, and enough of them
+#                to be stable (a pinned or fixed support, since a roller only holds DY, and a fixed support or at least two)
+#   loads      - a direction in records.LOAD_DIRECTIONS, locations from 0 to L (a distributed load's start before its end),
+#                finite magnitudes, and a case that the load combinations use
+POSITIVE_ATTRIBUTES = ('L', 'E', 'Iz', 'Iy', 'A', 'J')
+LOCATION_COLUMNS = {'Location': 3, 'Start Location': 4, 'End Location': 5} # the csv column of each load location
+
+
+def get_combo_symbols (combos_DICT:dict=NBCC_2020_COMBOS) -> set [str]:
+    '''
+    Returns the load symbols (ie 'D', 'L') that any of the load combinations in 'combos_DICT' use
+    '''
+    return {symbol for factors_DICT in combos_DICT.values () for symbol in factors_DICT}
+
+
+def validate_beam_rows (
+    rows_LIST:list [list [str]],
+    filename:str | None=None,
+    line_numbers_LIST:list [int] | None=None,
+    combos_DICT:dict=NBCC_2020_COMBOS
+) -> list [BeamFileError]:
+    '''
+    Checks the rows of one beam (see parsing.parse_beam_rows) against the schema and the checks above, and returns
+    every problem found as a parsing.BeamFileError (not raised) with its file, line and column; an empty list if there are none.
+    Unlike parse_beam_rows it carries on after a bad row, so that one pass finds everything that's wrong.
+    '''
+    if line_numbers_LIST is None:
+        line_numbers_LIST = list (range (1, len (rows_LIST) + 1))
+    if len (rows_LIST) < 3:
+        return [BeamFileError (f"a beam needs a name, attribute and support line, got {len (rows_LIST)} lines", filename, line_numbers_LIST [0] if line_numbers_LIST else None)]
+    ret_LIST = []
+
+    line = line_numbers_LIST [1]
+    L = None
+    try:
+        attributes_DICT = parse_attribute_row (rows_LIST [1], filename, line)
+    except BeamFileError as err:
+        ret_LIST.append (err)
+    else:
+        n_given = len (rows_LIST [1])
+        for i, (attribute, value) in enumerate (attributes_DICT.items ()):
+            if i >= n_given: # not given, so the default, or from a named material or section
+                continue
+            column = i + 1
+            if not math.isfinite (value):
+                ret_LIST.append (BeamFileError (f"{attribute} must be finite, got {value}", filename, line, column))
+            elif attribute in POSITIVE_ATTRIBUTES and value <= 0:
+                ret_LIST.append (BeamFileError (f"{attribute} must be greater than 0, got {value:g}", filename, line, column))
+            elif attribute == 'nu' and not 0 <= value <= 0.5:
+                ret_LIST.append (BeamFileError (f"nu must be from 0 to 0.5, got {value:g}", filename, line, column))
+            elif attribute == 'rho' and value < 0:
+                ret_LIST.append (BeamFileError (f"rho must not be negative, got {value:g}", filename, line, column))
+        if math.isfinite (attributes_DICT ['L']) and attributes_DICT ['L'] > 0:
+            L = attributes_DICT ['L']
+
+    line = line_numbers_LIST [2]
+    supports_DICT = {}
+    for i, token in enumerate (rows_LIST [2]):
+        try:
+            ((location, support_type),) = parse_support_row ([token], filename, line).items ()
+        except BeamFileError as err:
+            ret_LIST.append (BeamFileError (err.message, filename, line, i + 1))
+            continue
+        if support_type not in SUPPORT_TYPES:
+            ret_LIST.append (BeamFileError (f"expected a support type of {'/'.join (SUPPORT_TYPES)}, got '{support_type}'", filename, line, i + 1))
+        if location in supports_DICT:
+            ret_LIST.append (BeamFileError (f"there's already a support at {location:g}", filename, line, i + 1))
+        elif L is not None and not 0 <= location <= L:
+            ret_LIST.append (BeamFileError (f"the support at {location:g} is off the beam, which is 0 to {L:g} long", filename, line, i + 1))
+        supports_DICT [location] = support_type
+    support_types_SET = set (supports_DICT.values ())
+    if len (supports_DICT) < 2 and 'F' not in support_types_SET:
+        ret_LIST.append (BeamFileError (f"the beam is unstable: it needs a fixed support or at least two supports, got {len (supports_DICT)}", filename, line))
+    elif not support_types_SET & {'P', 'F'}:
+        ret_LIST.append (BeamFileError ("the beam is unstable: a roller only holds it up, so it needs a pinned or fixed support too", filename, line))
+
+    symbols_SET = get_combo_symbols (combos_DICT)
+    for row_LIST, line in zip (rows_LIST [3:], line_numbers_LIST [3:]):
+        try:
+            load_DICT = parse_load_row (row_LIST, filename, line)
+        except BeamFileError as err:
+            ret_LIST.append (err)
+            continue
+        if load_DICT ['Direction'] not in LOAD_DIRECTIONS:
+            ret_LIST.append (BeamFileError (f"expected a direction of {'/'.join (LOAD_DIRECTIONS [:6])}, got '{load_DICT ['Direction']}'", filename, line, 1))
+        magnitude_names_LIST = [name for name in load_DICT if name.endswith ('Magnitude')]
+        for j, name in enumerate (magnitude_names_LIST):
+            if not math.isfinite (load_DICT [name]):
+                ret_LIST.append (BeamFileError (f"the {name.lower ()} must be finite, got {load_DICT [name]}", filename, line, 2 + j))
+        for name, column in LOCATION_COLUMNS.items ():
+            if name not in load_DICT:
+                continue
+            location = load_DICT [name]
+            if not math.isfinite (location) or (L is not None and not 0 <= location <= L):
+                where = f", which is 0 to {L:g} long" if L is not None else ''
+                ret_LIST.append (BeamFileError (f"the load's {name.lower ()} {location:g} is off the beam{where}", filename, line, column))
+        if load_DICT ['Type'] == 'Dist' and not load_DICT ['Start Location'] < load_DICT ['End Location']:
+            ret_LIST.append (BeamFileError (
+                f"the start location ({load_DICT ['Start Location']:g}) must be before the end location ({load_DICT ['End Location']:g})",
+                filename, line, LOCATION_COLUMNS ['Start Location']))
+        try:
+            symbol = get_case_symbol (load_DICT ['Case'])
+        except ValueError as err:
+            ret_LIST.append (BeamFileError (err.args [0], filename, line, len (row_LIST)))
+            continue
+        if symbol not in symbols_SET:
+            ret_LIST.append (BeamFileError (f"the load case '{load_DICT ['Case']}' isn't in any load combination", filename, line, len (row_LIST)))
+    return ret_LIST
+
+
+def validate_beam_file (the_filename:str, delimiter:str=RECORD_DELIMITER, combos_DICT:dict=NBCC_2020_COMBOS) -> list [BeamFileError]:
+    '''
+    Checks every beam in a single or multi-beam file (see validate_beam_rows) and returns all the problems found,
+    with line numbers counted from the start of the file. A file that can't be read is one problem.
+    '''
+    ret_LIST = []
+    n_beams = 0
+    try:
+        with open (the_filename, "r", newline='') as csv_file:
+            for rows_LIST, line_numbers_LIST in iter_record_rows (csv_file, delimiter):
+                ret_LIST.extend (validate_beam_rows (rows_LIST, the_filename, line_numbers_LIST, combos_DICT))
+                n_beams += 1
+    except (OSError, UnicodeDecodeError) as err:
+        return [BeamFileError (f"can't read the file: {type (err).__name__}: {err}", the_filename)]
+    if n_beams == 0:
+        ret_LIST.append (BeamFileError ('the file has no beams in it', the_filename))
+    return ret_LIST
+
+
+def validate_files (
+    filenames:Iterable [str],
+    delimiter:str=RECORD_DELIMITER,
+    combos_DICT:dict=NBCC_2020_COMBOS
+) -> dict [str, list [BeamFileError]]:
+    '''
+    Checks every file in 'filenames' (see validate_beam_file) before any of them is built or solved,
+    and returns the problems in each one, by file (an empty list for a good file), in the order given
+    '''
+    return {the_filename: validate_beam_file (the_filename, delimiter, combos_DICT) for the_filename in filenames}